@@ -0,0 +1,454 @@
+"""
+Fixture Server untuk Benchmark
+HTTP server lokal yang meniru halaman Google Maps, Tokopedia, Google Search dan
+quotes.toscrape.com dari data rekaman di benchmark/fixtures/, lengkap dengan
+infinite scroll (card dimuat lewat fetch) dan latency yang bisa diatur. API
+GraphQL Tokopedia (POST /tokopedia/graphql: search, info toko, katalog toko)
+juga di-mock dari produk rekaman format API.
+
+Jalankan sendiri untuk dicoba di browser:
+    python3 benchmark/fixture_server.py --port 8765 --latency-ms 100
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote_plus, unquote
+from html import escape
+import os
+import re
+import json
+import time
+import argparse
+import threading
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Jumlah item per "halaman" infinite scroll
+MAPS_PAGE_SIZE = 20
+TOKOPEDIA_PAGE_SIZE = 20
+TOKOPEDIA_SEARCH_PAGE_SIZE = 40  # produk per halaman /tokopedia/search?page=N
+QUOTES_PAGE_SIZE = 10
+QUOTES_SCROLL_PAGES = 5
+QUOTES_PAGES = 10  # /quotes/page/N/ dengan link Next (crawler)
+
+def load_fixture(name):
+    """Baca file JSON di benchmark/fixtures/"""
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _page(title, body, head=""):
+    return (f"<!DOCTYPE html><html lang='id'><head><meta charset='utf-8'><title>{escape(title)}</title>"
+            f"{head}</head><body>{body}</body></html>")
+
+# Load item berikutnya saat container di-scroll mendekati bawah (dipakai Maps, Tokopedia, quotes)
+INFINITE_SCROLL_JS = """
+<script>
+function infiniteScroll(container, target, apiUrl, total, pageSize, onEnd) {
+    let loaded = target.children.length, loading = false;
+    const scroller = container === window ? document.scrollingElement : container;
+    const check = () => {
+        if (loading || loaded >= total) return;
+        if (scroller.scrollTop + scroller.clientHeight < scroller.scrollHeight - 200) return;
+        loading = true;
+        fetch(apiUrl + (apiUrl.includes('?') ? '&' : '?') + 'offset=' + loaded)
+            .then(r => r.text())
+            .then(html => {
+                target.insertAdjacentHTML('beforeend', html);
+                loaded += pageSize;
+                if (loaded >= total && onEnd) onEnd();
+                loading = false;
+            });
+    };
+    container.addEventListener('scroll', check);
+}
+</script>
+"""
+
+# ==================== GOOGLE MAPS ====================
+
+def place_href(index, place):
+    """URL tempat dengan format yang sama seperti href a.hfpxzc di Maps"""
+    lat, lng = place["lat"], place["lng"]
+    return (f"/maps/place/{quote_plus(place['name'])}/@{lat},{lng},17z/data=!4m7!3m6"
+            f"!1s{place['feature_id']}!8m2!3d{lat}!4d{lng}!16s%2Fg%2F{index}!19s{place['place_id']}")
+
+def maps_cards(places, offset, count):
+    """HTML card feed hasil pencarian"""
+    cards = []
+    for i, place in enumerate(places[offset:offset + count], offset):
+        reviews = f"({place['total_reviews']})" if place["total_reviews"] != "N/A" else ""
+        cards.append(
+            f"<div class='Nv2PK' role='article' style='position:relative;height:96px;border-bottom:1px solid #ddd'>"
+            f"<a class='hfpxzc' data-index='{i}' aria-label='{escape(place['name'])}' href='{place_href(i, place)}'"
+            f" style='position:absolute;inset:0'></a>"
+            f"<div class='qBF1Pd'>{escape(place['name'])}</div>"
+            f"<span class='MW4etd'>{escape(place['rating'])}</span> <span class='UY7F9'>{reviews}</span>"
+            f"<div>{escape(place['category'])}</div></div>"
+        )
+    return "".join(cards)
+
+def maps_panel(place):
+    """HTML panel detail tempat"""
+    parts = [
+        f"<h1 class='DUwDvf'>{escape(place['name'])}</h1>",
+        f"<button class='DkEaL'>{escape(place['category'])}</button>",
+        f"<div class='F7nice'><span aria-hidden='true'>{escape(place['rating'])}</span>"
+        f"<span aria-label='{escape(place['total_reviews'])} reviews'>({escape(place['total_reviews'])})</span></div>",
+        f"<button data-item-id='address'><div class='fontBodyMedium'>{escape(place['address'])}</div></button>",
+    ]
+    if place["phone"] != "N/A":
+        parts.append(f"<button data-item-id='phone:tel:{escape(place['phone'])}'>"
+                     f"<div class='fontBodyMedium'>{escape(place['phone'])}</div></button>")
+    if place["website"] != "N/A":
+        parts.append(f"<a data-item-id='authority' href='{escape(place['website'])}'>"
+                     f"{escape(place['website'])}</a>")
+    parts.append(f"<button aria-label='Hours: {escape(place['hours'])}'>{escape(place['hours'])}</button>")
+    return "".join(parts)
+
+MAPS_SEARCH_JS = """
+<script>
+const feed = document.querySelector("div[role='feed']");
+infiniteScroll(feed, feed, '/maps/api/cards', %(total)d, %(page_size)d, () => {
+    feed.insertAdjacentHTML('beforeend',
+        "<div><span class='HlvSq'>Anda telah mencapai akhir daftar.</span></div>");
+});
+// Klik card: panel detail dimuat lewat fetch lalu URL diganti (tanpa reload), seperti Maps
+document.addEventListener('click', (event) => {
+    const card = event.target.closest('a.hfpxzc');
+    if (!card) return;
+    event.preventDefault();
+    fetch('/maps/api/place?index=' + card.dataset.index)
+        .then(r => r.text())
+        .then(html => {
+            document.getElementById('panel').innerHTML = html;
+            history.pushState({}, '', card.getAttribute('href'));
+        });
+});
+</script>
+"""
+
+def maps_search_page(places):
+    layout = ("<div style='display:flex'>"
+              "<div role='feed' aria-label='Results' style='width:400px;height:700px;overflow-y:auto'>"
+              f"{maps_cards(places, 0, MAPS_PAGE_SIZE)}</div>"
+              "<div id='panel' class='m6QErb' style='flex:1;padding:16px'></div></div>")
+    script = MAPS_SEARCH_JS % {"total": len(places), "page_size": MAPS_PAGE_SIZE}
+    return _page("Google Maps", layout + INFINITE_SCROLL_JS + script)
+
+# ==================== TOKOPEDIA ====================
+
+def tokopedia_cards(products, offset, count, query=""):
+    """HTML product card hasil pencarian (query: parameter tracking di link, mis. iklan)"""
+    cards = []
+    for product in products[offset:offset + count]:
+        cards.append(
+            f"<div data-testid='master-product-card' style='height:320px;border:1px solid #eee'>"
+            f"<a href='/tokopedia/{product['shop'].lower().replace(' ', '-')}/{product['slug']}{query}'>"
+            f"<div class='prd_link-product-name' data-testid='spnSRPProdName'>{escape(product['name'])}</div>"
+            f"<div class='prd_link-product-price' data-testid='spnSRPProdPrice'>{escape(product['price'])}</div>"
+            f"<span class='prd_rating-average-text'>{escape(product['rating'])}</span>"
+            f"<span class='prd_link-shop-name'>{escape(product['shop'])}</span>"
+            f"<span class='prd_link-shop-loc'>{escape(product['location'])}</span>"
+            f"</a></div>"
+        )
+    return "".join(cards)
+
+def tokopedia_home_page():
+    form = ("<form action='/tokopedia/search' method='get'>"
+            "<input type='search' data-unify='Search' name='q' placeholder='Cari di Tokopedia'>"
+            "<input type='hidden' name='st' value='product'></form>")
+    return _page("Tokopedia", form)
+
+def tokopedia_search_page(products, keyword, page=None):
+    """Tanpa page: satu halaman infinite scroll. Dengan page: potongan TOKOPEDIA_SEARCH_PAGE_SIZE
+    produk (20 pertama langsung, sisanya lewat infinite scroll) + satu card iklan yang
+    sama di setiap halaman (untuk dedup)"""
+    if page is not None:
+        start = (page - 1) * TOKOPEDIA_SEARCH_PAGE_SIZE
+        page_products = products[start:start + TOKOPEDIA_SEARCH_PAGE_SIZE]
+        if not page_products:
+            return _page(f"Jual {keyword} | Tokopedia", "<div data-testid='divSRPNoResult'>Oops, produk tidak ditemukan</div>")
+        ads = f"<div data-testid='divSRPTopAds'>{tokopedia_cards(products, 0, 1, '?extParam=src%3Dtopads')}</div>"
+        grid = (ads + f"<div data-testid='divSRPContentProducts'>{tokopedia_cards(page_products, 0, TOKOPEDIA_PAGE_SIZE)}</div>"
+                + INFINITE_SCROLL_JS +
+                "<script>const grid = document.querySelector(\"div[data-testid='divSRPContentProducts']\");"
+                f"infiniteScroll(window, grid, '/tokopedia/api/products?start={start}', {len(page_products)}, {TOKOPEDIA_PAGE_SIZE});</script>")
+        return _page(f"Jual {keyword} - Halaman {page} | Tokopedia", grid)
+    grid = (f"<div data-testid='divSRPContentProducts'>{tokopedia_cards(products, 0, TOKOPEDIA_PAGE_SIZE)}</div>"
+            + INFINITE_SCROLL_JS +
+            "<script>const grid = document.querySelector(\"div[data-testid='divSRPContentProducts']\");"
+            f"infiniteScroll(window, grid, '/tokopedia/api/products', {len(products)}, {TOKOPEDIA_PAGE_SIZE});</script>")
+    return _page(f"Jual {keyword} | Tokopedia", grid)
+
+def _gql_search(products, variables):
+    """SearchProductQueryV4: potongan produk rekaman sesuai rows/start di params"""
+    params = parse_qs(variables.get("params", ""))
+    rows = int(params.get("rows", ["60"])[0])
+    start = int(params.get("start", ["0"])[0])
+    return {"ace_search_product_v4": {
+        "header": {"totalData": len(products), "totalDataText": str(len(products)),
+                   "responseCode": 0, "keywordProcess": "0"},
+        "data": {"products": products[start:start + rows]},
+    }}
+
+def _gql_shop_info(products, variables):
+    """ShopInfoCore: toko dari domain (diambil dari data toko produk rekaman)"""
+    for product in products:
+        shop = product["shop"]
+        if shop["url"].rstrip('/').rsplit('/', 1)[-1] == variables.get("domain"):
+            return {"shopInfoByID": {"result": [{
+                "shopCore": {"shopID": str(shop["id"]), "domain": variables["domain"], "name": shop["name"],
+                             "url": shop["url"]},
+                "location": shop["city"],
+            }], "error": {"message": ""}}}
+    return {"shopInfoByID": {"result": [], "error": {"message": "shop not found"}}}
+
+def _gql_shop_products(products, variables):
+    """ShopProducts: katalog satu toko, produk terbaru (id terbesar) dulu"""
+    catalog = sorted((product for product in products if str(product["shop"]["id"]) == variables.get("sid")),
+                     key=lambda product: -product["id"])
+    page, per_page = variables.get("page", 1), variables.get("perPage", 80)
+    items = catalog[(page - 1) * per_page:page * per_page]
+    has_next = page * per_page < len(catalog)
+    return {"GetShopProduct": {
+        "status": "REQUEST_OK", "errors": "",
+        "links": {"next": f"page/{page + 1}" if has_next else ""},
+        "data": [{
+            "product_id": str(product["id"]), "name": product["name"],
+            "product_url": product["url"].split('?')[0], "stock": product.get("stock", 10),
+            "price": {"text_idr": product["price"]},
+            "stats": {"averageRating": product["ratingAverage"], "reviewCount": product["countReview"]},
+        } for product in items],
+    }}
+
+GQL_OPERATIONS = {
+    "SearchProductQueryV4": _gql_search,
+    "ShopInfoCore": _gql_shop_info,
+    "ShopProducts": _gql_shop_products,
+}
+
+def tokopedia_gql_response(products, body):
+    """Response mock GraphQL Tokopedia (batch), dijawab dari produk rekaman format API"""
+    requests = body if isinstance(body, list) else [body]
+    responses = []
+    for request in requests:
+        handler = GQL_OPERATIONS.get(request.get("operationName"))
+        if handler is None:
+            responses.append({"errors": [{"message": f"unknown operation {request.get('operationName')}"}]})
+            continue
+        responses.append({"data": handler(products, request.get("variables") or {})})
+    return responses
+
+# ==================== GOOGLE SEARCH ====================
+
+def google_home_page():
+    return _page("Google", "<form action='/google/search' method='get'><input name='q' type='text'></form>")
+
+def google_search_page(results, query):
+    items = []
+    for result in results:
+        items.append(
+            f"<div class='g'><a href='{escape(result['link'])}'><h3>{escape(result['title'])}</h3></a>"
+            f"<div data-sncf='1'>{escape(result['description'])}</div></div>"
+        )
+    return _page(f"{query} - Google Search", f"<div id='search'>{''.join(items)}</div>")
+
+# ==================== QUOTES ====================
+
+def quote_items(quotes, offset, count):
+    """HTML quote dengan markup quotes.toscrape.com (data diulang jika kurang)"""
+    items = []
+    for i in range(offset, offset + count):
+        quote = quotes[i % len(quotes)]
+        tags = "".join(f"<a class='tag' href='/quotes/tag/{escape(tag)}/'>{escape(tag)}</a>" for tag in quote["tags"])
+        items.append(
+            f"<div class='quote' style='height:180px'><span class='text'>{escape(quote['quote'])}</span>"
+            f"<span>by <small class='author'>{escape(quote['author'])}</small></span>"
+            f"<div class='tags'>Tags: {tags}</div></div>"
+        )
+    return "".join(items)
+
+def quotes_page(quotes, page=1):
+    """Halaman quote ke-N dengan pager Next seperti quotes.toscrape.com"""
+    pager = (f"<nav><ul class='pager'><li class='next'><a href='/quotes/page/{page + 1}/'>Next</a></li></ul></nav>"
+             if page < QUOTES_PAGES else "")
+    items = quote_items(quotes, (page - 1) * QUOTES_PAGE_SIZE, QUOTES_PAGE_SIZE)
+    return _page("Quotes to Scrape", f"<div class='col-md-8'>{items}{pager}</div>")
+
+def quotes_sitemap(base_url):
+    urls = "".join(f"<url><loc>{base_url}/quotes/page/{page}/</loc></url>" for page in range(1, QUOTES_PAGES + 1))
+    return ("<?xml version='1.0' encoding='UTF-8'?>"
+            f"<urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>{urls}</urlset>")
+
+def quotes_scroll_page(quotes):
+    total = QUOTES_PAGE_SIZE * QUOTES_SCROLL_PAGES
+    body = (f"<div class='quotes'>{quote_items(quotes, 0, QUOTES_PAGE_SIZE)}</div>" + INFINITE_SCROLL_JS +
+            "<script>infiniteScroll(window, document.querySelector('.quotes'), '/quotes/api/quotes', "
+            f"{total}, {QUOTES_PAGE_SIZE});</script>")
+    return _page("Quotes to Scrape", body)
+
+# ==================== SERVER ====================
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Routing semua halaman fixture"""
+
+    def log_message(self, format, *args):
+        # Jangan banjiri output benchmark dengan access log
+        pass
+
+    def _send(self, body, status=200, content_type="text/html; charset=utf-8"):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        path = urlparse(self.path).path
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+        if server.api_latency_ms:
+            time.sleep(server.api_latency_ms / 1000)
+        with server.stats_lock:
+            server.request_count += 1
+
+        if path == "/tokopedia/graphql":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return self._send('{"errors": [{"message": "invalid JSON"}]}', status=400,
+                                  content_type="application/json")
+            response = tokopedia_gql_response(self.server.fixtures["tokopedia_gql"], payload)
+            return self._send(json.dumps(response, ensure_ascii=False), content_type="application/json")
+
+        self._send("Not found", status=404, content_type="text/plain")
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        path = url.path
+        params = parse_qs(url.query)
+        offset = int(params.get("offset", ["0"])[0])
+
+        # Latency simulasi: API (infinite scroll / panel) dan halaman penuh diatur terpisah
+        is_api = "/api/" in path
+        delay = server.api_latency_ms if is_api else server.latency_ms
+        if delay:
+            time.sleep(delay / 1000)
+        with server.stats_lock:
+            server.request_count += 1
+
+        fixtures = server.fixtures
+        if path.startswith("/maps/search/"):
+            return self._send(maps_search_page(fixtures["maps"]))
+        if path == "/maps/api/cards":
+            return self._send(maps_cards(fixtures["maps"], offset, MAPS_PAGE_SIZE))
+        if path == "/maps/api/place":
+            index = int(params.get("index", ["0"])[0])
+            return self._send(maps_panel(fixtures["maps"][index]))
+        if path.startswith("/maps/place/"):
+            match = re.search(r'!19s(ChIJ[\w-]+)', unquote(path))
+            place = server.places_by_id.get(match.group(1)) if match else None
+            if place:
+                return self._send(_page(f"{place['name']} - Google Maps",
+                                        f"<div class='m6QErb' role='main'>{maps_panel(place)}</div>"))
+            return self._send(_page("Not found", "Tempat tidak ditemukan"), status=404)
+
+        if path in ("/tokopedia", "/tokopedia/"):
+            return self._send(tokopedia_home_page())
+        if path == "/tokopedia/search":
+            page = int(params["page"][0]) if params.get("page") else None
+            return self._send(tokopedia_search_page(fixtures["tokopedia"], params.get("q", [""])[0], page))
+        if path == "/tokopedia/api/products":
+            start = int(params.get("start", ["0"])[0])
+            return self._send(tokopedia_cards(fixtures["tokopedia"], start + offset, TOKOPEDIA_PAGE_SIZE))
+
+        if path in ("/google", "/google/"):
+            return self._send(google_home_page())
+        if path == "/google/search":
+            return self._send(google_search_page(fixtures["google"], params.get("q", [""])[0]))
+
+        if path in ("/quotes", "/quotes/"):
+            return self._send(quotes_page(fixtures["quotes"]))
+        match = re.match(r"^/quotes/page/(\d+)/?$", path)
+        if match and 1 <= int(match.group(1)) <= QUOTES_PAGES:
+            return self._send(quotes_page(fixtures["quotes"], int(match.group(1))))
+        if path == "/quotes/scroll":
+            return self._send(quotes_scroll_page(fixtures["quotes"]))
+        if path == "/quotes/api/quotes":
+            return self._send(quote_items(fixtures["quotes"], offset, QUOTES_PAGE_SIZE))
+
+        base_url = f"http://{self.headers.get('Host', '')}"
+        if path == "/robots.txt":
+            return self._send(f"User-agent: *\nDisallow: /private/\nSitemap: {base_url}/sitemap.xml\n",
+                              content_type="text/plain")
+        if path == "/sitemap.xml":
+            return self._send(quotes_sitemap(base_url), content_type="application/xml")
+
+        self._send("Not found", status=404, content_type="text/plain")
+
+class FixtureServer:
+    """Fixture server di background thread
+
+    latency_ms: delay setiap halaman penuh
+    api_latency_ms: delay setiap request infinite scroll / panel (fetch)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0, api_latency_ms=0):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency_ms = latency_ms
+        self.httpd.api_latency_ms = api_latency_ms
+        self.httpd.request_count = 0
+        self.httpd.stats_lock = threading.Lock()
+        self.httpd.fixtures = {
+            "maps": load_fixture("maps_places.json"),
+            "tokopedia": load_fixture("tokopedia_products.json"),
+            "tokopedia_gql": load_fixture("tokopedia_gql_products.json"),
+            "google": load_fixture("google_results.json"),
+            "quotes": load_fixture("quotes.json"),
+        }
+        self.httpd.places_by_id = {place["place_id"]: place for place in self.httpd.fixtures["maps"]}
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self):
+        return self.httpd.request_count
+
+    def url(self, path):
+        return self.base_url + path
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixture server lokal untuk benchmark scraper")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0, help="delay setiap halaman")
+    parser.add_argument("--api-latency-ms", type=int, default=0, help="delay setiap request infinite scroll")
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, latency_ms=args.latency_ms, api_latency_ms=args.api_latency_ms)
+    print(f"🧪 Fixture server jalan di {server.base_url}")
+    for path in ("/maps/search/cafe+cirebon", "/tokopedia/", "/google/", "/quotes/", "/quotes/scroll"):
+        print(f"   {server.url(path)}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server dihentikan")
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
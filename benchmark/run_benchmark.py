@@ -0,0 +1,289 @@
+"""
+Benchmark End-to-End Scraper
+Jalankan GoogleMapsScraper, TokopediaScraper, GoogleScraper dan UniversalScraper
+terhadap fixture server lokal, lalu ukur records/detik, WebDriver command per
+record dan latency per record (p50/p95). Hasil disimpan sebagai JSON di
+benchmark/results/ dan dibandingkan dengan hasil sebelumnya.
+
+Pemakaian:
+    python3 benchmark/run_benchmark.py
+    python3 benchmark/run_benchmark.py --scenarios maps_click,tokopedia --max-results 40 --api-latency-ms 150
+"""
+
+from fixture_server import FixtureServer
+from datetime import datetime
+import os
+import sys
+import json
+import time
+import glob
+import argparse
+import platform
+import tempfile
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmark", "results")
+sys.path.insert(0, os.path.join(ROOT_DIR, "scrapers"))
+
+from scraper_google_maps import GoogleMapsScraper
+from scraper_tokopedia import TokopediaScraper
+from scraper_google import GoogleScraper
+from scraper_universal import UniversalScraper
+from selector_chain import SELECTOR_STATS
+
+# Statistik selector dari fixture tidak ikut disimpan ke file milik run sungguhan
+SELECTOR_STATS.path = None
+
+class RecordTimer:
+    """Catat waktu selesai setiap record dengan membungkus method extract milik scraper
+
+    Method yang mengembalikan list (extract per halaman) dihitung satu record per item.
+    """
+
+    def __init__(self):
+        self.started = None
+        self.finished = []
+
+    def wrap(self, obj, method_name):
+        original = getattr(obj, method_name)
+
+        def timed(*args, **kwargs):
+            result = original(*args, **kwargs)
+            if result:
+                now = time.perf_counter()
+                self.finished.extend([now] * (len(result) if isinstance(result, list) else 1))
+            return result
+
+        setattr(obj, method_name, timed)
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def latencies_ms(self):
+        """Latency per record = jarak dari record sebelumnya (record pertama dari awal scenario)"""
+        previous = self.started
+        latencies = []
+        for finished in self.finished:
+            latencies.append((finished - previous) * 1000)
+            previous = finished
+        return latencies
+
+def percentile(values, pct):
+    """Percentile nearest-rank"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+# ==================== SCENARIO ====================
+# Setiap scenario: (buat scraper, nama method extract per record, jalankan scraping)
+
+def _maps_scenario(navigation):
+    def create(server, headless):
+        return GoogleMapsScraper(headless=headless, base_url=server.url("/maps"))
+
+    def run(scraper, max_results):
+        return scraper.search_businesses("cafe", "Kota Cirebon", max_results=max_results, navigation=navigation)
+
+    method = "_scrape_place_url" if navigation == "direct" else "_extract_business_data"
+    return create, method, run
+
+def _tokopedia_scenario(workers=None, extraction="snapshot", engine="browser"):
+    def create(server, headless):
+        return TokopediaScraper(headless=headless, base_url=server.url("/tokopedia/"), extraction=extraction,
+                                engine=engine, api_url=server.url("/tokopedia/graphql"))
+
+    def run(scraper, max_results):
+        if workers:
+            return scraper.search_products_paged("laptop", max_results, workers=workers)
+        return scraper.search_products("laptop", max_results)
+
+    method = "_search_api_page" if engine == "api" else "_extract_product_data"
+    return create, method, run
+
+def _google_scenario():
+    def create(server, headless):
+        return GoogleScraper(headless=headless, base_url=server.url("/google/"))
+
+    def run(scraper, max_results):
+        return scraper.search("python web scraping", max_results)
+
+    return create, "_extract_result_data", run
+
+def _universal_scenario(mode="browser"):
+    def create(server, headless):
+        scraper = UniversalScraper(headless=headless, mode=mode)
+        scraper.quotes_url = server.url("/quotes/")
+        return scraper
+
+    def run(scraper, max_results):
+        scraper.open_url(scraper.quotes_url)
+        return scraper.scrape_quotes()[:max_results]
+
+    return create, "extract_list", run
+
+SCENARIOS = {
+    "maps_click": _maps_scenario("click"),
+    "maps_direct": _maps_scenario("direct"),
+    "tokopedia": _tokopedia_scenario(),
+    "tokopedia_dom": _tokopedia_scenario(extraction="dom"),
+    "tokopedia_paged": _tokopedia_scenario(workers=2),
+    "tokopedia_api": _tokopedia_scenario(engine="api"),
+    "google": _google_scenario(),
+    "universal": _universal_scenario(),
+    "universal_http": _universal_scenario("http"),
+}
+
+def command_count(scraper):
+    """Jumlah WebDriver command scraper (UniversalScraper mode HTTP / Tokopedia API tidak start browser)"""
+    if isinstance(scraper, UniversalScraper):
+        return scraper.command_count
+    return scraper.session.command_count if scraper.session else 0
+
+def run_scenario(name, server, headless, max_results):
+    """Jalankan satu scenario dan kembalikan dict metrik"""
+    create, method_name, run = SCENARIOS[name]
+    print(f"\n{'=' * 60}\n🏁 Scenario: {name}\n{'=' * 60}")
+
+    started = time.perf_counter()
+    scraper = create(server, headless)
+    startup = time.perf_counter() - started
+
+    timer = RecordTimer()
+    timer.wrap(scraper, method_name)
+    commands_before = command_count(scraper)
+    requests_before = server.request_count
+
+    try:
+        timer.start()
+        records = run(scraper, max_results) or []
+        elapsed = time.perf_counter() - timer.started
+    finally:
+        commands = command_count(scraper) - commands_before
+        scraper.close()
+
+    latencies = timer.latencies_ms()
+    count = len(records)
+    return {
+        "records": count,
+        "startup_seconds": round(startup, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_sec": round(count / elapsed, 3) if elapsed else None,
+        "webdriver_commands": commands,
+        "commands_per_record": round(commands / count, 2) if count else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1) if latencies else None,
+            "p95": round(percentile(latencies, 95), 1) if latencies else None,
+            "max": round(max(latencies), 1) if latencies else None,
+        },
+        "http_requests": server.request_count - requests_before,
+    }
+
+# ==================== REPORT ====================
+
+def git_commit():
+    """Hash commit saat ini (kosong jika bukan repo git)"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def latest_report(exclude=None):
+    """File hasil benchmark terakhir sebelum run ini"""
+    reports = sorted(path for path in glob.glob(os.path.join(RESULTS_DIR, "benchmark_*.json")) if path != exclude)
+    return reports[-1] if reports else None
+
+def print_report(report, previous=None):
+    """Tabel ringkasan + selisih records/detik dan p95 terhadap run sebelumnya"""
+    # Kolom scenario selebar nama terpanjang (universal_http, tokopedia_api, ...)
+    width = max([len("scenario")] + [len(name) for name in report["scenarios"]]) + 2
+    print(f"\n{'=' * (width + 65)}\n📊 HASIL BENCHMARK ({report['git_commit'] or 'no-git'})\n{'=' * (width + 65)}")
+    print(f"{'scenario':<{width}}{'records':>8}{'rec/s':>9}{'cmd/rec':>9}{'p50 ms':>10}{'p95 ms':>10}  vs sebelumnya")
+    old_scenarios = previous["scenarios"] if previous else {}
+    for name, result in report["scenarios"].items():
+        if "error" in result:
+            print(f"{name:<{width}}❌ {result['error']}")
+            continue
+        delta = ""
+        old = old_scenarios.get(name)
+        if old and old.get("records_per_sec") and result["records_per_sec"]:
+            change = (result["records_per_sec"] - old["records_per_sec"]) / old["records_per_sec"]
+            delta = f"rec/s {change:+.0%}"
+            if old["latency_ms"].get("p95") and result["latency_ms"]["p95"]:
+                p95_change = (result["latency_ms"]["p95"] - old["latency_ms"]["p95"]) / old["latency_ms"]["p95"]
+                delta += f", p95 {p95_change:+.0%}"
+        cmd = result["commands_per_record"]
+        print(f"{name:<{width}}{result['records']:>8}{result['records_per_sec'] or 0:>9.2f}"
+              f"{cmd if cmd is not None else '-':>9}"
+              f"{result['latency_ms']['p50'] or 0:>10.0f}{result['latency_ms']['p95'] or 0:>10.0f}  {delta}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper terhadap fixture server lokal")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"daftar scenario dipisah koma ({', '.join(SCENARIOS)})")
+    parser.add_argument("--max-results", type=int, default=30, help="target record per scenario")
+    parser.add_argument("--latency-ms", type=int, default=0, help="delay setiap halaman penuh")
+    parser.add_argument("--api-latency-ms", type=int, default=0, help="delay setiap request infinite scroll / panel")
+    parser.add_argument("--headed", action="store_true", help="tampilkan browser (default headless)")
+    parser.add_argument("--output", help="path file JSON hasil (default: benchmark/results/benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"⚠️  Scenario tidak dikenal: {', '.join(unknown)}")
+        return
+
+    server = FixtureServer(latency_ms=args.latency_ms, api_latency_ms=args.api_latency_ms).start()
+    print(f"🧪 Fixture server: {server.base_url}")
+
+    report = {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "max_results": args.max_results,
+            "latency_ms": args.latency_ms,
+            "api_latency_ms": args.api_latency_ms,
+            "headless": not args.headed,
+        },
+        "scenarios": {},
+    }
+
+    # Screenshot / file debug yang dibuat scraper ditaruh di folder sementara
+    original_cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="scraper_benchmark_"))
+    try:
+        for name in names:
+            try:
+                report["scenarios"][name] = run_scenario(name, server, not args.headed, args.max_results)
+            except Exception as e:
+                print(f"❌ Scenario {name} gagal: {str(e)}")
+                report["scenarios"][name] = {"error": str(e)}
+    except KeyboardInterrupt:
+        print("\n⏸️  Benchmark dibatalkan, menyimpan hasil yang sudah ada")
+    finally:
+        os.chdir(original_cwd)
+        server.stop()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    previous_path = latest_report(exclude=os.path.abspath(output))
+    previous = None
+    if previous_path:
+        with open(previous_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_report(report, previous)
+    if previous_path:
+        print(f"\n↔️  Dibandingkan dengan {os.path.relpath(previous_path, ROOT_DIR)}")
+    print(f"💾 Hasil disimpan ke {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Batch Runner (asyncio)
+Jalankan banyak job scraping tanpa input() interaktif, dari file job JSON.
+Scheduler asyncio membagi pekerjaan driver (blocking) ke thread worker yang
+meminjam browser dari BrowserPool, dengan batas concurrency per domain,
+prioritas, retry dan ringkasan per job di akhir.
+
+Pemakaian:
+    python3 scrapers/batch_runner.py docs/batch_jobs.example.json --workers 3
+
+Format file job:
+    {
+      "defaults": {"scraper": "google_maps", "max_results": 50, "priority": 0, "retries": 2},
+      "jobs": [
+        {"query": "cafe", "location": "Kecamatan Sumber, Kabupaten Cirebon"},
+        {"scraper": "tokopedia", "query": "laptop", "max_results": 20, "priority": 5},
+        {"queries": ["bengkel", "salon"], "locations": ["Kecamatan Weru", "Kecamatan Plered"]}
+      ]
+    }
+"queries" x "locations" di-expand menjadi satu job per kombinasi (sweep).
+Priority lebih besar dijalankan lebih dulu.
+"""
+
+from browser_session import BrowserPool, default_block_profile
+from rate_limiter import RATE_LIMITER
+from output_writers import FORMATS, check_writer, parse_format, write_records
+from scraper_google_maps import GoogleMapsScraper
+from scraper_tokopedia import TokopediaScraper
+from scraper_google import GoogleScraper
+from datetime import datetime
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Batas job bersamaan per domain (override dengan --domain-limit domain=N)
+DEFAULT_DOMAIN_LIMITS = {
+    "google.com": 2,
+    "tokopedia.com": 1,
+}
+
+def _run_google_maps(job, pool):
+    scraper = GoogleMapsScraper(headless=True, pool=pool)
+    try:
+        return scraper.search_businesses(job["query"], job["location"], job["max_results"],
+                                         navigation=job.get("navigation", "click"))
+    finally:
+        scraper.close()
+
+def _run_tokopedia(job, pool):
+    scraper = TokopediaScraper(headless=True, pool=pool, engine=job.get("engine", "browser"))
+    try:
+        return scraper.search_products(job["query"], job["max_results"], workers=job.get("workers", 1))
+    finally:
+        scraper.close()
+
+def _run_google(job, pool):
+    scraper = GoogleScraper(headless=True, pool=pool)
+    try:
+        query = f"{job['query']} {job['location']}".strip()
+        return scraper.search(query, job["max_results"])
+    finally:
+        scraper.close()
+
+# scraper -> domain, opsi BrowserPool, fungsi blocking yang menjalankan satu job dan kolom output
+SCRAPERS = {
+    "google_maps": {
+        "domain": "google.com",
+        "pool_options": dict(GoogleMapsScraper.SESSION_OPTIONS,
+                             block_profile=default_block_profile("maps", True, None)),
+        "run": _run_google_maps,
+        "fieldnames": GoogleMapsScraper.FIELDNAMES,
+    },
+    "tokopedia": {
+        "domain": "tokopedia.com",
+        "pool_options": {"block_profile": default_block_profile("tokopedia", True, None)},
+        "run": _run_tokopedia,
+        "fieldnames": TokopediaScraper.FIELDNAMES,
+    },
+    "google": {
+        "domain": "google.com",
+        "pool_options": dict(GoogleScraper.SESSION_OPTIONS,
+                             block_profile=default_block_profile("google", True, None)),
+        "run": _run_google,
+        "fieldnames": GoogleScraper.FIELDNAMES,
+    },
+}
+
+def _slug(text):
+    return re.sub(r'[^\w]+', '_', text.lower()).strip('_')[:60]
+
+def load_jobs(path):
+    """Baca file job, terapkan defaults dan expand sweep queries x locations"""
+    with open(path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    if isinstance(spec, list):
+        spec = {"jobs": spec}
+
+    defaults = {"scraper": "google_maps", "location": "", "max_results": 50, "priority": 0, "retries": 2}
+    defaults.update(spec.get("defaults", {}))
+
+    jobs = []
+    for entry in spec.get("jobs", []):
+        entry = dict(defaults, **entry)
+        queries = entry.pop("queries", None) or [entry.get("query")]
+        locations = entry.pop("locations", None) or [entry.get("location", "")]
+        for query in queries:
+            for location in locations:
+                if not query:
+                    continue
+                job = dict(entry, query=query, location=location)
+                if job["scraper"] not in SCRAPERS:
+                    raise ValueError(f"Scraper tidak dikenal: {job['scraper']} ({', '.join(SCRAPERS)})")
+                job["id"] = len(jobs) + 1
+                jobs.append(job)
+    return jobs
+
+class BatchScheduler:
+    """Scheduler asyncio untuk job scraping
+
+    workers: jumlah maksimal job yang berjalan bersamaan (= thread worker)
+    domain_limits: batas job bersamaan per domain
+    output_format: ekstensi file hasil per job, mis. json, csv, jsonl.gz, parquet
+    """
+
+    def __init__(self, jobs, workers=2, domain_limits=None, output_dir=None, retry_backoff=30,
+                 output_format="json"):
+        self.jobs = jobs
+        self.workers = workers
+        self.domain_limits = dict(DEFAULT_DOMAIN_LIMITS, **(domain_limits or {}))
+        self.output_dir = output_dir
+        self.retry_backoff = retry_backoff
+        self.output_format = output_format
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-worker")
+        self.pools = {}
+        self._pools_lock = threading.Lock()
+        self.domain_active = {}
+        self.results = {}
+
+    def _limit(self, domain):
+        return min(self.workers, self.domain_limits.get(domain, self.workers))
+
+    def _pool_for(self, scraper_name):
+        """BrowserPool per jenis scraper (opsi Chrome berbeda), dibuat saat pertama dipakai"""
+        with self._pools_lock:
+            if scraper_name not in self.pools:
+                config = SCRAPERS[scraper_name]
+                self.pools[scraper_name] = BrowserPool(
+                    size=self._limit(config["domain"]), headless=True, **config["pool_options"]
+                ).start()
+            return self.pools[scraper_name]
+
+    def _execute(self, job):
+        """Dijalankan di thread worker: scraping satu job lalu simpan hasilnya"""
+        pool = self._pool_for(job["scraper"])
+        records = SCRAPERS[job["scraper"]]["run"](job, pool) or []
+        if records and self.output_dir:
+            filename = os.path.join(self.output_dir, f"{job['id']:03d}_{job['scraper']}_{_slug(job['query'])}"
+                                    + (f"_{_slug(job['location'])}" if job["location"] else "")
+                                    + "." + self.output_format)
+            write_records(records, filename, fieldnames=SCRAPERS[job["scraper"]]["fieldnames"])
+            return len(records), filename
+        return len(records), None
+
+    def _next_job(self, pending, running_count):
+        """Job dengan prioritas tertinggi yang domainnya masih punya slot dan tidak sedang backoff"""
+        if running_count >= self.workers:
+            return None
+        now = time.monotonic()
+        for job in pending:
+            domain = SCRAPERS[job["scraper"]]["domain"]
+            if self.domain_active.get(domain, 0) >= self._limit(domain):
+                continue
+            # Domain sedang diblokir: tunda job sampai cooldown rate limiter selesai
+            limiter = RATE_LIMITER.domains.get(domain)
+            if limiter and limiter.blocked_until > now:
+                job["not_before"] = max(job.get("not_before", 0), limiter.blocked_until)
+                continue
+            if job.get("not_before", 0) > now:
+                continue
+            return job
+        return None
+
+    def _start(self, loop, job):
+        domain = SCRAPERS[job["scraper"]]["domain"]
+        self.domain_active[domain] = self.domain_active.get(domain, 0) + 1
+        job["attempts"] = job.get("attempts", 0) + 1
+        job["started_at"] = time.monotonic()
+        print(f"▶️  Job {job['id']} [{job['scraper']}] {job['query']} {job['location']} "
+              f"(percobaan {job['attempts']}/{job['retries'] + 1})")
+        future = loop.run_in_executor(self.executor, self._execute, job)
+        future.job = job
+        return future
+
+    def _finish(self, future, pending):
+        """Catat hasil job, atau jadwalkan ulang dengan backoff jika gagal"""
+        job = future.job
+        domain = SCRAPERS[job["scraper"]]["domain"]
+        self.domain_active[domain] -= 1
+        seconds = time.monotonic() - job["started_at"]
+        job["seconds"] = job.get("seconds", 0) + seconds
+
+        try:
+            count, filename = future.result()
+            error = None if count else "0 record"
+        except Exception as e:
+            count, filename, error = 0, None, str(e)
+
+        if error and job["attempts"] <= job["retries"]:
+            delay = self.retry_backoff * 2 ** (job["attempts"] - 1)
+            print(f"🔁 Job {job['id']} gagal ({error}), retry dalam {delay}s")
+            job["not_before"] = time.monotonic() + delay
+            pending.append(job)
+            pending.sort(key=lambda j: (-j["priority"], j["id"]))
+            return
+
+        status = "ok" if not error else "gagal"
+        print(f"{'✅' if not error else '❌'} Job {job['id']} selesai: {count} record ({seconds:.0f}s)")
+        self.results[job["id"]] = {
+            "id": job["id"], "scraper": job["scraper"], "query": job["query"], "location": job["location"],
+            "priority": job["priority"], "status": status, "records": count, "attempts": job["attempts"],
+            "seconds": round(job["seconds"], 1), "output": filename, "error": error,
+        }
+
+    async def run(self):
+        """Loop scheduler: isi slot worker, tunggu job selesai, ulangi sampai semua selesai"""
+        loop = asyncio.get_running_loop()
+        pending = sorted(self.jobs, key=lambda j: (-j["priority"], j["id"]))
+        running = set()
+
+        while pending or running:
+            job = self._next_job(pending, len(running))
+            while job:
+                pending.remove(job)
+                running.add(self._start(loop, job))
+                job = self._next_job(pending, len(running))
+
+            if running:
+                # Bangun lagi saat ada job selesai, atau saat backoff job berikutnya habis
+                waits = [j["not_before"] - time.monotonic() for j in pending if j.get("not_before")]
+                timeout = max(0.1, min(waits)) if waits else None
+                done, running = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    self._finish(future, pending)
+            elif pending:
+                waits = [j.get("not_before", 0) - time.monotonic() for j in pending]
+                await asyncio.sleep(max(0.1, min(waits)))
+
+        return [self.results[job_id] for job_id in sorted(self.results)]
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for pool in self.pools.values():
+            pool.close()
+
+def print_summary(results, elapsed):
+    """Ringkasan per job"""
+    print("\n" + "=" * 90)
+    print("📊 RINGKASAN BATCH")
+    print("=" * 90)
+    print(f"{'#':>3}  {'scraper':<12}{'query':<20}{'lokasi':<28}{'status':<7}{'record':>7}{'coba':>5}{'detik':>7}")
+    for result in results:
+        print(f"{result['id']:>3}  {result['scraper']:<12}{result['query'][:19]:<20}{result['location'][:27]:<28}"
+              f"{result['status']:<7}{result['records']:>7}{result['attempts']:>5}{result['seconds']:>7.0f}")
+    ok = sum(1 for r in results if r["status"] == "ok")
+    total_records = sum(r["records"] for r in results)
+    print(f"\n✨ {ok}/{len(results)} job berhasil, {total_records} record dalam {elapsed / 60:.1f} menit")
+    RATE_LIMITER.print_stats()
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch runner scraper (non-interaktif)")
+    parser.add_argument("job_file", help="file JSON berisi daftar job")
+    parser.add_argument("--workers", type=int, default=2, help="jumlah browser / job bersamaan")
+    parser.add_argument("--domain-limit", action="append", default=[], metavar="DOMAIN=N",
+                        help="batas job bersamaan per domain, mis. google.com=1")
+    parser.add_argument("--retry-backoff", type=int, default=30, help="detik backoff retry pertama (lalu x2)")
+    parser.add_argument("--output-dir", help="folder hasil (default: output/batch_<timestamp>)")
+    parser.add_argument("--format", default="json",
+                        help=f"format file hasil per job ({', '.join(FORMATS)}), tambah .gz / .zst untuk kompresi")
+    args = parser.parse_args()
+    try:
+        check_writer("hasil", *parse_format(args.format))
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+
+    try:
+        jobs = load_jobs(args.job_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ File job tidak valid: {str(e)}")
+        sys.exit(1)
+    if not jobs:
+        print("⚠️  Tidak ada job")
+        return
+
+    domain_limits = {}
+    for item in args.domain_limit:
+        domain, _, limit = item.partition("=")
+        if limit.isdigit():
+            domain_limits[domain] = int(limit)
+
+    output_dir = args.output_dir or os.path.join("output", f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"🗂️  {len(jobs)} job, {args.workers} worker, hasil ke {output_dir}")
+    scheduler = BatchScheduler(jobs, workers=args.workers, domain_limits=domain_limits,
+                               output_dir=output_dir, retry_backoff=args.retry_backoff,
+                               output_format=args.format.lstrip("."))
+    start = time.time()
+    try:
+        results = asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        print("\n\n⏸️  Batch dibatalkan, menunggu job yang sedang berjalan...")
+        results = [scheduler.results[job_id] for job_id in sorted(scheduler.results)]
+    finally:
+        scheduler.close()
+
+    print_summary(results, time.time() - start)
+    summary_file = os.path.join(output_dir, "summary.json")
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"💾 Ringkasan disimpan ke {summary_file}")
+
+if __name__ == "__main__":
+    main()
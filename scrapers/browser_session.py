@@ -0,0 +1,547 @@
+"""
+Browser Session Factory
+Setup Chrome bersama untuk semua scraper: cache lokasi chromedriver (bisa
+offline) dan pool browser yang sudah di-warm untuk dipakai ulang antar query
+"""
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.remote.command import Command
+from webdriver_manager.chrome import ChromeDriverManager
+from rate_limiter import RATE_LIMITER, BlockedError, detect_block
+from contextlib import contextmanager
+from fnmatch import fnmatch
+import os
+import json
+import time
+import queue
+import threading
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Cache lokasi chromedriver supaya tidak perlu lookup ke internet setiap run
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "scraping_project", "chromedriver.json")
+DRIVER_CACHE_TTL = 7 * 24 * 3600  # refresh seminggu sekali jika online
+
+_driver_path_lock = threading.Lock()
+_driver_path = None
+
+# Profil resource yang diblokir via CDP Network.setBlockedURLs (wildcard *).
+# Hanya resource yang tidak pernah di-extract: tile peta, gambar, font, tracker.
+_TRACKERS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*branch.io*",
+]
+_IMAGES = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.ico*"]
+_FONTS = ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*"]
+
+BLOCK_PROFILES = {
+    # Maps: tile vector/satelit, street view, foto tempat. XHR search/place tetap jalan.
+    "maps": [
+        "*/maps/vt*", "*khms*.google.com*", "*/kh/v=*",
+        "*streetviewpixels*", "*googleusercontent.com*",
+    ] + _IMAGES + _FONTS + _TRACKERS,
+    # Tokopedia: gambar produk & video diblokir, JSON/GraphQL (gql.tokopedia.com) tetap jalan
+    "tokopedia": [
+        "*images.tokopedia.net*", "*ecs7.tokopedia.net*", "*.mp4*",
+    ] + _IMAGES + _FONTS + _TRACKERS,
+    "google": _IMAGES + _FONTS + _TRACKERS,
+}
+
+def build_chrome_options(headless=False, user_agent=DEFAULT_USER_AGENT, lang=None, anti_detection=True,
+                         network_logging=False):
+    """Buat ChromeOptions standar yang dipakai semua scraper"""
+    chrome_options = ChromeOptions()
+
+    if headless:
+        chrome_options.add_argument('--headless')
+
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+
+    # Anti-detection settings
+    if anti_detection:
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    if user_agent:
+        chrome_options.add_argument(f'user-agent={user_agent}')
+    if lang:
+        chrome_options.add_argument(f'--lang={lang}')
+
+    # Performance log berisi event CDP Network.* (untuk hitung byte per halaman)
+    if network_logging:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    return chrome_options
+
+def _read_driver_cache():
+    """Baca cache lokasi chromedriver, return (path, umur detik) atau (None, None)"""
+    try:
+        with open(DRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if os.path.exists(cached["path"]):
+            return cached["path"], time.time() - cached["resolved_at"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None, None
+
+def _write_driver_cache(path):
+    """Simpan lokasi chromedriver ke file cache"""
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+        with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"path": path, "resolved_at": time.time()}, f)
+    except OSError as e:
+        print(f"⚠️  Gagal menyimpan cache chromedriver: {str(e)}")
+
+def resolve_driver_path(refresh=False):
+    """Cari lokasi chromedriver dengan urutan: env, memory, file cache, webdriver-manager
+
+    Jika webdriver-manager gagal (mis. offline), pakai cache lama walaupun
+    sudah kedaluwarsa. Return None berarti serahkan ke Selenium Manager.
+    """
+    global _driver_path
+
+    env_path = os.environ.get("CHROMEDRIVER_PATH")
+    if env_path and os.path.exists(env_path):
+        return env_path
+
+    with _driver_path_lock:
+        if _driver_path and not refresh:
+            return _driver_path
+
+        cached_path, age = _read_driver_cache()
+        if cached_path and age < DRIVER_CACHE_TTL and not refresh:
+            _driver_path = cached_path
+            return _driver_path
+
+        try:
+            _driver_path = ChromeDriverManager().install()
+            _write_driver_cache(_driver_path)
+        except Exception as e:
+            if cached_path:
+                print(f"⚠️  webdriver-manager gagal ({str(e)}), pakai chromedriver dari cache")
+                _driver_path = cached_path
+            else:
+                print(f"⚠️  webdriver-manager gagal ({str(e)}), fallback ke Selenium Manager")
+                _driver_path = None
+        return _driver_path
+
+def resolve_block_profile(block_profile):
+    """Pola URL untuk nama profil (boleh dengan suffix ":measure")"""
+    name = (block_profile or "").split(":")[0]
+    return BLOCK_PROFILES.get(name, [])
+
+def default_block_profile(profile, headless, block_resources=None):
+    """Profil blokir untuk scraper: default aktif hanya di headless mode"""
+    enabled = headless if block_resources is None else block_resources
+    return profile if enabled else None
+
+def session_options(headless=False, block_profile=None, network_logging=False, **option_kwargs):
+    """Opsi Chrome efektif (default build_chrome_options diisi) untuk membandingkan scraper dengan pool"""
+    options = {"user_agent": DEFAULT_USER_AGENT, "lang": None, "anti_detection": True}
+    options.update(option_kwargs)
+    options.update(headless=headless, block_profile=block_profile,
+                   network_logging=bool(network_logging or resolve_block_profile(block_profile)))
+    return options
+
+def create_driver(headless=False, block_profile=None, **option_kwargs):
+    """Start Chrome baru dengan chromedriver dari cache
+
+    block_profile: nama profil di BLOCK_PROFILES ("maps", "tokopedia", "google").
+    Tambahkan ":measure" (mis. "maps:measure") untuk tidak memblokir tapi
+    menghitung berapa byte yang akan terblokir.
+    """
+    patterns = resolve_block_profile(block_profile)
+    measure_only = (block_profile or "").endswith(":measure")
+    # Profil blokir butuh performance log untuk statistik byte
+    option_kwargs["network_logging"] = bool(option_kwargs.get("network_logging") or patterns)
+
+    chrome_options = build_chrome_options(headless, **option_kwargs)
+    driver_path = resolve_driver_path()
+    service = ChromeService(driver_path) if driver_path else ChromeService()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.maximize_window()
+
+    if patterns:
+        driver.execute_cdp_cmd('Network.enable', {})
+        if not measure_only:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    driver.block_patterns = patterns
+    return driver
+
+# Ringkasan halaman untuk deteksi blokir (dibaca tanpa ikut hitungan command)
+PAGE_PROBE_JS = """
+return {url: location.href, title: document.title};
+"""
+
+class BrowserSession:
+    """Satu browser Chrome beserta hitungan halaman dan WebDriver command
+
+    Setiap driver.get melewati rate_limiter (token bucket per domain) dan
+    halaman hasilnya dicek apakah halaman blokir / interstitial.
+    """
+
+    def __init__(self, driver, pool=None, rate_limiter=RATE_LIMITER):
+        self.driver = driver
+        self.pool = pool
+        self.rate_limiter = rate_limiter
+        self.pages = 0
+        self.command_count = 0
+        self.block_patterns = getattr(driver, "block_patterns", [])
+        self.page_network_stats = []
+        self.log_listeners = []
+        self._pending_messages = []
+        self._current_page = None
+        self._install_counter()
+
+    def _install_counter(self):
+        """Bungkus driver.execute supaya setiap command (dan setiap driver.get) terhitung"""
+        original_execute = self.driver.execute
+        self._raw_execute = original_execute
+
+        def counted_execute(driver_command, params=None):
+            self.command_count += 1
+            if driver_command == Command.GET:
+                self.pages += 1
+                # Tutup statistik network halaman sebelumnya sebelum pindah halaman
+                self.flush_network_stats()
+                self._current_page = params.get("url") if params else None
+                return self._limited_get(original_execute, driver_command, params)
+            return original_execute(driver_command, params)
+
+        # WebElement memanggil parent.execute, jadi command element ikut terhitung
+        self.driver.execute = counted_execute
+
+    def _limited_get(self, original_execute, driver_command, params):
+        """driver.get lewat rate limiter: tunggu token, ukur latency, cek halaman blokir"""
+        url = params.get("url", "") if params else ""
+        limiter = self.rate_limiter.acquire(url) if self.rate_limiter else None
+        if not limiter:
+            return original_execute(driver_command, params)
+
+        started = time.monotonic()
+        try:
+            response = original_execute(driver_command, params)
+        except Exception:
+            limiter.record_error()
+            raise
+        limiter.record_success(time.monotonic() - started)
+        self.check_block()
+        return response
+
+    def check_block(self):
+        """Cek halaman saat ini, raise BlockedError jika halaman blokir / consent wall
+
+        Dipanggil otomatis setelah driver.get, dan bisa dipanggil manual
+        setelah navigasi lewat form / klik (tidak lewat driver.get).
+        """
+        try:
+            page = self._raw_execute(Command.W3C_EXECUTE_SCRIPT, {'script': PAGE_PROBE_JS, 'args': []})['value']
+        except Exception:
+            return None
+        reason = detect_block(page.get("url"), page.get("title"))
+        if not reason:
+            return None
+
+        limiter = self.rate_limiter.for_url(page.get("url", "")) if self.rate_limiter else None
+        cooldown = limiter.record_block(reason) if limiter else None
+        print(f"🛑 Halaman blokir terdeteksi ({reason}): {page.get('url')}")
+        raise BlockedError(reason, page.get("url"), cooldown)
+
+    def throttle(self):
+        """Ambil token rate limiter untuk domain halaman saat ini (navigasi tanpa driver.get, mis. klik)"""
+        if not self.rate_limiter:
+            return
+        try:
+            url = self._raw_execute(Command.GET_CURRENT_URL)['value']
+        except Exception:
+            return
+        self.rate_limiter.acquire(url)
+
+    def _is_blocked_url(self, url):
+        """Cek apakah URL cocok dengan salah satu pola profil blokir"""
+        return any(fnmatch(url, pattern) for pattern in self.block_patterns)
+
+    def flush_network_stats(self):
+        """Baca performance log dan simpan ringkasan byte untuk halaman saat ini
+
+        Request yang diblokir tidak pernah ditransfer, jadi hanya jumlahnya
+        yang dihitung. Pada mode ":measure" byte-nya ikut terhitung karena
+        request tetap berjalan.
+        """
+        if not self.block_patterns or not self._current_page:
+            return None
+        self.drain_performance_log()
+        messages, self._pending_messages = self._pending_messages, []
+
+        urls = {}
+        stats = {
+            "page": self._current_page,
+            "allowed_requests": 0, "allowed_bytes": 0,
+            "blocked_requests": 0, "blocked_bytes": 0,
+        }
+        for message in messages:
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+
+            if method == "Network.requestWillBeSent":
+                urls[request_id] = params.get("request", {}).get("url", "")
+            elif method == "Network.loadingFinished":
+                size = int(params.get("encodedDataLength", 0))
+                if self._is_blocked_url(urls.get(request_id, "")):
+                    # Mode measure: request jalan tapi cocok dengan profil blokir
+                    stats["blocked_requests"] += 1
+                    stats["blocked_bytes"] += size
+                else:
+                    stats["allowed_requests"] += 1
+                    stats["allowed_bytes"] += size
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                stats["blocked_requests"] += 1
+
+        self.page_network_stats.append(stats)
+        return stats
+
+    def drain_performance_log(self):
+        """Baca semua event CDP dari performance log dan bagikan ke listener
+
+        Performance log hanya bisa dibaca sekali, jadi semua pemakai
+        (statistik byte, capture response) lewat method ini.
+        """
+        try:
+            # Langsung ke execute asli supaya tidak ikut hitungan command scraper
+            entries = self._raw_execute(Command.GET_LOG, {'type': 'performance'})['value']
+        except Exception:
+            return []
+
+        messages = []
+        for entry in entries:
+            try:
+                messages.append(json.loads(entry["message"])["message"])
+            except (KeyError, ValueError):
+                continue
+
+        if self.block_patterns:
+            self._pending_messages.extend(messages)
+        for listener in self.log_listeners:
+            listener(messages)
+        return messages
+
+    def print_network_stats(self):
+        """Tampilkan total byte allowed/blocked dari semua halaman"""
+        self.flush_network_stats()
+        self._current_page = None
+        if not self.page_network_stats:
+            return
+        pages = len(self.page_network_stats)
+        allowed = sum(s["allowed_bytes"] for s in self.page_network_stats)
+        blocked = sum(s["blocked_bytes"] for s in self.page_network_stats)
+        blocked_requests = sum(s["blocked_requests"] for s in self.page_network_stats)
+        print(f"\n🚫 NETWORK ({pages} halaman): allowed {allowed / 1024:.0f} KB "
+              f"(~{allowed / 1024 / pages:.0f} KB/halaman), blocked {blocked_requests} request"
+              + (f" / {blocked / 1024:.0f} KB" if blocked else ""))
+
+    def is_alive(self):
+        """Cek apakah browser masih merespon"""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        """Kembalikan ke pool, atau tutup browser jika tidak dari pool"""
+        if self.pool:
+            self.pool.release(self)
+        else:
+            self.quit()
+
+    def quit(self):
+        """Tutup browser"""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+def open_session(headless=False, pool=None, **option_kwargs):
+    """Pinjam session dari pool jika ada, atau start browser baru
+
+    Opsi tetap dicek terhadap opsi pool (ValueError jika tidak cocok), karena
+    browser pool sudah di-start dan opsinya tidak bisa diubah lagi.
+    """
+    if pool:
+        pool.check_options(headless, **option_kwargs)
+        return pool.acquire()
+    return BrowserSession(create_driver(headless, **option_kwargs))
+
+class BrowserPool:
+    """Pool browser Chrome yang sudah di-warm dan dipakai ulang antar query
+
+    Setiap browser di-recycle (quit lalu start ulang) setelah membuka
+    max_pages halaman untuk membatasi pertumbuhan memori Chrome: saat
+    dikembalikan (release), atau saat pemakai memanggil maybe_recycle di
+    antara record.
+    """
+
+    def __init__(self, size=2, headless=True, max_pages=50, warm_url="about:blank", **option_kwargs):
+        self.size = size
+        self.headless = headless
+        self.max_pages = max_pages
+        self.warm_url = warm_url
+        self.option_kwargs = option_kwargs
+        self.recycled = 0
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def check_options(self, headless=False, **option_kwargs):
+        """Raise ValueError jika opsi yang diminta scraper berbeda dengan opsi browser pool
+
+        network_logging hanya dicek jika diminta: pool dengan performance log
+        tetap boleh dipakai scraper yang tidak membutuhkannya.
+        """
+        wanted = session_options(headless, **option_kwargs)
+        actual = session_options(self.headless, **self.option_kwargs)
+        mismatched = [f"{key}={wanted[key]!r} (pool: {actual.get(key)!r})" for key in wanted
+                      if key != "network_logging" and wanted[key] != actual.get(key)]
+        if wanted["network_logging"] and not actual["network_logging"]:
+            mismatched.append("network_logging=True (pool: False)")
+        if mismatched:
+            raise ValueError(f"Opsi session tidak cocok dengan BrowserPool: {', '.join(mismatched)}")
+
+    def start(self):
+        """Start dan warm semua browser secara paralel"""
+        # Resolve driver sekali di sini supaya thread tidak lookup bersamaan
+        resolve_driver_path()
+
+        threads = [threading.Thread(target=self._add_session, daemon=True) for _ in range(self.size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print(f"🔥 Browser pool siap: {self._idle.qsize()}/{self.size} browser")
+        if not self._all:
+            raise RuntimeError("Tidak ada browser yang berhasil di-start untuk pool")
+        return self
+
+    def _new_session(self):
+        """Start satu browser dan buka warm_url"""
+        session = BrowserSession(create_driver(self.headless, **self.option_kwargs), pool=self)
+        if self.warm_url:
+            session.driver.get(self.warm_url)
+        session.pages = 0
+        return session
+
+    def _add_session(self):
+        """Tambah satu browser baru ke antrian idle"""
+        try:
+            session = self._new_session()
+        except Exception as e:
+            print(f"❌ Gagal start browser untuk pool: {str(e)}")
+            return
+        with self._lock:
+            self._all.append(session)
+        self._idle.put(session)
+
+    def _replace(self, session):
+        """Tutup session lama dan ganti dengan browser baru"""
+        with self._lock:
+            if session in self._all:
+                self._all.remove(session)
+            self.recycled += 1
+        session.quit()
+        if not self._closed:
+            self._add_session()
+
+    def acquire(self, timeout=None):
+        """Pinjam satu browser (blocking sampai ada yang idle)"""
+        if self._closed:
+            raise RuntimeError("Browser pool sudah ditutup")
+        if not self._all and self._idle.empty():
+            self.start()
+
+        try:
+            session = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("Tidak ada browser idle di pool")
+
+        if not session.is_alive():
+            print("♻️  Browser mati, start ulang...")
+            # Pengganti langsung dipinjamkan; jika gagal start, error diteruskan ke
+            # pemanggil, bukan menunggu antrian idle yang bisa kosong selamanya
+            try:
+                fresh = self._new_session()
+            except Exception:
+                self._swap(session, None)
+                raise
+            self._swap(session, fresh)
+            return fresh
+        return session
+
+    def release(self, session):
+        """Kembalikan browser ke pool, recycle jika sudah melewati max_pages"""
+        if self._closed:
+            session.quit()
+            return
+
+        if session.pages >= self.max_pages:
+            print(f"♻️  Recycle browser setelah {session.pages} halaman")
+            self._replace(session)
+            return
+
+        # Cookie sengaja tidak dihapus supaya consent/session tetap warm
+        self._idle.put(session)
+
+    def maybe_recycle(self, session):
+        """Recycle browser yang masih dipinjam jika sudah melewati max_pages
+
+        Dipanggil pemakai di titik aman (antar record / halaman), supaya session
+        yang dipegang sepanjang run tetap kena batas memori. Return session
+        pengganti (langsung berstatus dipinjam) atau session yang sama.
+        """
+        if self._closed or session.pages < self.max_pages:
+            return session
+        print(f"♻️  Recycle browser setelah {session.pages} halaman (masih dipinjam)")
+        try:
+            fresh = self._new_session()
+        except Exception as e:
+            print(f"⚠️  Gagal start browser pengganti, lanjut dengan browser lama: {str(e)}")
+            return session
+        self._swap(session, fresh)
+        return fresh
+
+    def _swap(self, session, fresh):
+        """Keluarkan session lama dari pool (dan quit), fresh (jika ada) berstatus dipinjam"""
+        with self._lock:
+            if session in self._all:
+                self._all.remove(session)
+            if fresh is not None:
+                self._all.append(fresh)
+            self.recycled += 1
+        session.quit()
+
+    @contextmanager
+    def borrow(self, timeout=None):
+        """Context manager: with pool.borrow() as session: ..."""
+        session = self.acquire(timeout)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def close(self):
+        """Tutup semua browser di pool"""
+        self._closed = True
+        with self._lock:
+            sessions = list(self._all)
+            self._all.clear()
+        for session in sessions:
+            session.quit()
+        print(f"🔒 Browser pool ditutup ({len(sessions)} browser, {self.recycled} kali recycle)")
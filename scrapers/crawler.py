@@ -0,0 +1,465 @@
+"""
+Crawler (pagination + URL frontier)
+Crawl banyak halaman statis lewat HTTP dengan N fetcher paralel: ikuti link
+"next" / link lain yang dipilih, baca sitemap, normalisasi URL, dedup hemat
+memori (Bloom filter), patuhi robots.txt + crawl-delay per host, dan tulis
+record hasil extract langsung ke output writers (streaming).
+
+Pemakaian:
+    python3 scrapers/crawler.py http://quotes.toscrape.com/ --schema docs/quotes_schema.json --output quotes.jsonl
+    python3 scrapers/crawler.py https://situs.com/ --sitemap --follow "a.product" --allow "/produk/" --workers 8
+"""
+
+from http_session import HttpSession, DEFAULT_HEADERS
+from list_schema import compile_schema, extract_list
+from output_writers import open_writer
+from rate_limiter import BlockedError
+from static_dom import By, require_lxml
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+from urllib import robotparser
+from collections import deque
+import re
+import json
+import math
+import time
+import heapq
+import hashlib
+import argparse
+import threading
+
+# Selector link halaman berikutnya, dicoba berurutan
+NEXT_SELECTORS = [
+    "link[rel='next']",
+    "a[rel='next']",
+    "li.next a",
+    "a.next",
+    "a[aria-label='Next']",
+]
+
+# Parameter query yang tidak mengubah isi halaman (dibuang saat normalisasi)
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|yclid|mc_cid|mc_eid|ref_src)$", re.IGNORECASE)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url, base=None):
+    """URL kanonik untuk dedup, atau None jika bukan http(s)
+
+    Host huruf kecil, tanpa fragment / port default / parameter tracking,
+    query diurutkan dan // ganda di path dirapikan.
+    """
+    if base:
+        url = urljoin(base, url)
+    parts = urlparse(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    return urlunparse((scheme, netloc, path, "", query, ""))
+
+class BloomFilter:
+    """Set probabilistik hemat memori untuk URL yang sudah dilihat
+
+    Tidak ada false negative; false positive (URL baru dianggap sudah dilihat)
+    sekitar error_rate selama jumlah item <= capacity.
+    1 juta URL dengan error_rate 0.001 hanya butuh ~1.8 MB.
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k posisi dari dua hash 64-bit
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        """Tambah item, return True jika item belum pernah dilihat"""
+        new = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        self.count += new
+        return new
+
+    def __contains__(self, item):
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+class Frontier:
+    """Antrian URL per host untuk fetcher paralel
+
+    Setiap host dilayani maksimal per_host fetcher sekaligus dan jarak antar
+    request ke host yang sama minimal delay host tersebut (crawl-delay).
+    Host yang siap paling awal dilayani lebih dulu.
+    """
+
+    def __init__(self, seen, per_host=2, delay=1.0):
+        self.seen = seen
+        self.per_host = per_host
+        self.default_delay = delay
+        self.delays = {}
+        self.queues = {}
+        self.next_time = {}
+        self.active = {}
+        self.scheduled = set()
+        self.ready = []  # heap (waktu siap, host)
+        self.in_flight = 0
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def set_delay(self, host, delay):
+        with self.cond:
+            self.delays[host] = delay
+
+    def _schedule(self, host):
+        """Masukkan host ke heap jika ada URL antri dan slot host masih ada"""
+        if host in self.scheduled or not self.queues.get(host) or self.active.get(host, 0) >= self.per_host:
+            return
+        self.scheduled.add(host)
+        heapq.heappush(self.ready, (self.next_time.get(host, 0), host))
+        self.cond.notify()
+
+    def add(self, url, depth):
+        """Antrikan URL (sudah dinormalisasi), return False jika sudah pernah dilihat"""
+        with self.cond:
+            if self.closed or not self.seen.add(url):
+                return False
+            host = urlparse(url).netloc
+            self.queues.setdefault(host, deque()).append((url, depth))
+            self._schedule(host)
+            return True
+
+    def get(self):
+        """(url, depth) berikutnya yang host-nya sudah boleh diakses, None jika crawl selesai"""
+        with self.cond:
+            while not self.closed:
+                if self.ready:
+                    ready_at, host = self.ready[0]
+                    wait = ready_at - time.monotonic()
+                    if wait > 0:
+                        self.cond.wait(wait)
+                        continue
+                    heapq.heappop(self.ready)
+                    self.scheduled.discard(host)
+                    if not self.queues[host]:
+                        # Antrian host dibuang (drop_host) setelah dijadwalkan
+                        continue
+                    url, depth = self.queues[host].popleft()
+                    self.active[host] = self.active.get(host, 0) + 1
+                    self.next_time[host] = time.monotonic() + self.delays.get(host, self.default_delay)
+                    self.in_flight += 1
+                    self._schedule(host)
+                    return url, depth
+                if not self.in_flight:
+                    # Tidak ada URL antri dan tidak ada fetcher yang bisa menemukan URL baru
+                    self.closed = True
+                    self.cond.notify_all()
+                    break
+                self.cond.wait()
+            return None
+
+    def done(self, url):
+        """Fetcher selesai dengan url (berhasil atau gagal)"""
+        with self.cond:
+            host = urlparse(url).netloc
+            self.active[host] -= 1
+            self.in_flight -= 1
+            self._schedule(host)
+            self.cond.notify_all()
+
+    def drop_host(self, host):
+        """Buang semua URL antri milik host (mis. host memblokir)"""
+        with self.cond:
+            dropped = len(self.queues.get(host, ()))
+            self.queues[host] = deque()
+            return dropped
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def __len__(self):
+        with self.cond:
+            return sum(len(queue) for queue in self.queues.values())
+
+class Crawler:
+    """Crawler HTTP paralel dengan frontier, robots.txt dan output streaming
+
+    schema: schema list_schema untuk extract record setiap halaman, atau
+    extract: fungsi (page) -> list record (mis. memakai fungsi di extractors)
+    next_selectors: selector link halaman berikutnya (pagination, depth tetap)
+    follow: selector CSS link lain yang diikuti (depth + 1, dibatasi max_depth)
+    allow / deny: regex URL yang boleh / tidak boleh di-crawl
+    writers: RecordWriter tujuan record (lihat output_writers)
+    """
+
+    def __init__(self, schema=None, extract=None, next_selectors=NEXT_SELECTORS, follow=None,
+                 allow=None, deny=None, same_host=True, max_pages=100, max_depth=2, workers=4,
+                 per_host=2, delay=1.0, respect_robots=True, use_sitemaps=False, writers=(),
+                 http=None, seen_capacity=1_000_000):
+        self.schema = compile_schema(schema) if schema and not isinstance(schema.get("fields"), list) else schema
+        self.extract = extract
+        self.next_selectors = list(next_selectors or [])
+        self.follow = follow
+        self.allow = re.compile(allow) if allow else None
+        self.deny = re.compile(deny) if deny else None
+        self.same_host = same_host
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.workers = workers
+        self.delay = delay
+        self.respect_robots = respect_robots
+        self.use_sitemaps = use_sitemaps
+        self.writers = list(writers)
+        require_lxml()
+        self.http = http or HttpSession(maxsize=workers)
+        self.frontier = Frontier(BloomFilter(seen_capacity), per_host=per_host, delay=delay)
+
+        self.hosts = set()
+        self.robots = {}
+        self._robots_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.dispatched = 0
+        self.pages = 0
+        self.records = 0
+        self.errors = 0
+
+    # ==================== URL ====================
+
+    def _allowed(self, url):
+        host = urlparse(url).netloc
+        if self.same_host and self.hosts and host not in self.hosts:
+            return False
+        if self.allow and not self.allow.search(url):
+            return False
+        if self.deny and self.deny.search(url):
+            return False
+        robots = self._robots_for(url)
+        return robots is None or robots.can_fetch(DEFAULT_HEADERS["User-Agent"], url)
+
+    def enqueue(self, url, depth=0, base=None):
+        """Normalisasi lalu antrikan URL jika lolos filter, return True jika URL baru"""
+        url = normalize_url(url, base)
+        if not url or not self._allowed(url):
+            return False
+        return self.frontier.add(url, depth)
+
+    def _robots_for(self, url):
+        """robots.txt host (di-cache), sekaligus set crawl-delay host di frontier"""
+        if not self.respect_robots:
+            return None
+        parts = urlparse(url)
+        with self._robots_lock:
+            if parts.netloc in self.robots:
+                return self.robots[parts.netloc]
+            robots = robotparser.RobotFileParser()
+            try:
+                status, text = self.http.get_text(f"{parts.scheme}://{parts.netloc}/robots.txt")
+            except Exception:
+                status, text = 0, ""
+            if status in (401, 403):
+                robots.disallow_all = True
+            else:
+                robots.parse(text.splitlines() if status == 200 else [])
+            crawl_delay = robots.crawl_delay(DEFAULT_HEADERS["User-Agent"])
+            if crawl_delay:
+                print(f"🐢 {parts.netloc}: crawl-delay {crawl_delay}s dari robots.txt")
+                self.frontier.set_delay(parts.netloc, max(self.delay, float(crawl_delay)))
+            self.robots[parts.netloc] = robots
+            return robots
+
+    def add_sitemap(self, url, _level=0):
+        """Antrikan semua URL di sitemap (sitemap index dibaca rekursif), return jumlah URL baru"""
+        try:
+            status, text = self.http.get_text(url)
+        except Exception as e:
+            print(f"⚠️  Sitemap gagal dibaca: {url} ({str(e)})")
+            return 0
+        if status != 200:
+            return 0
+        locations = re.findall(r"<loc>\s*([^<\s]+)\s*</loc>", text)
+        if "<sitemapindex" in text and _level < 3:
+            return sum(self.add_sitemap(location, _level + 1) for location in locations)
+        added = sum(self.enqueue(location.replace("&amp;", "&")) for location in locations)
+        print(f"🗺️  Sitemap {url}: {added} URL baru")
+        return added
+
+    # ==================== FETCH ====================
+
+    def _links(self, page, depth):
+        """Link pagination (depth tetap) dan link follow (depth + 1) dari halaman"""
+        links = []
+        for selector in self.next_selectors:
+            elements = page.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                links.append((elements[0].get_attribute("href"), depth))
+                break
+        if self.follow and (self.max_depth is None or depth < self.max_depth):
+            for element in page.find_elements(By.CSS_SELECTOR, self.follow):
+                links.append((element.get_attribute("href"), depth + 1))
+        return [(href, link_depth) for href, link_depth in links if href]
+
+    def _extract(self, page):
+        if self.extract:
+            return self.extract(page) or []
+        if self.schema:
+            return extract_list(page, self.schema)
+        return []
+
+    def _crawl_page(self, url, depth):
+        page = self.http.get(url)
+        records = self._extract(page)
+        for href, link_depth in self._links(page, depth):
+            self.enqueue(href, link_depth, base=page.current_url)
+
+        with self._lock:
+            self.pages += 1
+            for record in records:
+                # Index global lintas halaman, urut sesuai waktu selesai
+                self.records += 1
+                record["index"] = self.records
+                record.setdefault("url", page.current_url)
+                for writer in self.writers:
+                    writer.write(record)
+            print(f"📄 [{self.pages}] {url} ({len(records)} record, antrian {len(self.frontier)})")
+
+    def _worker(self):
+        while True:
+            item = self.frontier.get()
+            if item is None:
+                return
+            url, depth = item
+            try:
+                with self._lock:
+                    if self.dispatched >= self.max_pages:
+                        self.frontier.close()
+                        continue
+                    self.dispatched += 1
+                self._crawl_page(url, depth)
+            except BlockedError as e:
+                host = urlparse(url).netloc
+                dropped = self.frontier.drop_host(host)
+                print(f"🛑 {host} memblokir ({e.reason}), {dropped} URL antri dibuang")
+                with self._lock:
+                    self.errors += 1
+            except Exception as e:
+                print(f"⚠️  Gagal: {url} ({str(e)})")
+                with self._lock:
+                    self.errors += 1
+            finally:
+                self.frontier.done(url)
+
+    def run(self, start_urls, sitemaps=()):
+        """Crawl dari start_urls (+ sitemap) sampai frontier habis atau max_pages, return statistik"""
+        if isinstance(start_urls, str):
+            start_urls = [start_urls]
+        started = time.monotonic()
+        for url in start_urls:
+            normalized = normalize_url(url)
+            if normalized:
+                self.hosts.add(urlparse(normalized).netloc)
+        for url in start_urls:
+            self.enqueue(url)
+
+        sitemaps = list(sitemaps)
+        if self.use_sitemaps:
+            for url in start_urls:
+                robots = self._robots_for(normalize_url(url) or url)
+                sitemaps += (robots.site_maps() if robots else None) or [urljoin(url, "/sitemap.xml")]
+        for sitemap in dict.fromkeys(sitemaps):
+            self.add_sitemap(sitemap)
+
+        threads = [threading.Thread(target=self._worker, name=f"crawler-{i + 1}", daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            print("\n⏸️  Crawl dihentikan, menunggu fetcher yang sedang berjalan...")
+            self.frontier.close()
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.monotonic() - started
+        return {
+            "pages": self.pages,
+            "records": self.records,
+            "errors": self.errors,
+            "seen_urls": len(self.frontier.seen),
+            "queued": len(self.frontier),
+            "elapsed_seconds": round(elapsed, 2),
+            "pages_per_sec": round(self.pages / elapsed, 2) if elapsed else None,
+        }
+
+def print_stats(stats):
+    print("\n📊 CRAWL:")
+    print(f"   Halaman: {stats['pages']} ({stats['pages_per_sec']}/detik), error: {stats['errors']}")
+    print(f"   Record: {stats['records']}, URL dilihat: {stats['seen_urls']}, sisa antrian: {stats['queued']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl halaman statis dengan pagination + frontier URL")
+    parser.add_argument("urls", nargs="+", help="URL awal")
+    parser.add_argument("--schema", help="file JSON schema list (lihat list_schema.py)")
+    parser.add_argument("--output", help="file hasil (.jsonl, .json, .csv, .parquet, + .gz / .zst)")
+    parser.add_argument("--next", action="append", help="selector link halaman berikutnya (default: rel=next, li.next a, ...)")
+    parser.add_argument("--follow", help="selector CSS link lain yang diikuti")
+    parser.add_argument("--allow", help="regex URL yang boleh di-crawl")
+    parser.add_argument("--deny", help="regex URL yang dilewati")
+    parser.add_argument("--sitemap", action="store_true", help="baca sitemap dari robots.txt / sitemap.xml")
+    parser.add_argument("--workers", type=int, default=4, help="jumlah fetcher paralel")
+    parser.add_argument("--per-host", type=int, default=2, help="maksimal fetcher bersamaan per host")
+    parser.add_argument("--delay", type=float, default=1.0, help="jeda minimal antar request per host (detik)")
+    parser.add_argument("--max-pages", type=int, default=100)
+    parser.add_argument("--max-depth", type=int, default=2, help="kedalaman link --follow")
+    parser.add_argument("--ignore-robots", action="store_true", help="abaikan robots.txt")
+    args = parser.parse_args()
+
+    schema = None
+    if args.schema:
+        with open(args.schema, 'r', encoding='utf-8') as f:
+            schema = compile_schema(json.load(f))
+
+    writers = []
+    if args.output:
+        fieldnames = (["index"] + [field["name"] for field in schema["fields"]] + ["scraped_at", "url"]) if schema else None
+        writers.append(open_writer(args.output, fieldnames=fieldnames))
+
+    crawler = Crawler(schema=schema, next_selectors=args.next or NEXT_SELECTORS, follow=args.follow,
+                      allow=args.allow, deny=args.deny, max_pages=args.max_pages, max_depth=args.max_depth,
+                      workers=args.workers, per_host=args.per_host, delay=args.delay,
+                      respect_robots=not args.ignore_robots, use_sitemaps=args.sitemap, writers=writers)
+    try:
+        stats = crawler.run(args.urls)
+    finally:
+        for writer in writers:
+            writer.close()
+        crawler.http.close()
+
+    print_stats(stats)
+    if args.output:
+        print(f"💾 Data disimpan ke {args.output}")
+
+if __name__ == "__main__":
+    main()
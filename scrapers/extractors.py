@@ -0,0 +1,330 @@
+"""
+Fungsi Extract Bersama
+Selector + logika extract yang dipakai scraper live (Selenium WebElement /
+driver) dan mode replay (StaticElement / StaticPage dari static_dom).
+Semua fungsi hanya memakai find_element, find_elements, text, get_attribute
+dan current_url. Field dengan beberapa selector fallback memakai SelectorChain
+(selector primary yang terakhir cocok dicoba duluan, fallback umum selalu terakhir).
+"""
+
+from static_dom import By
+from selector_chain import SelectorChain
+from maps_urls import coords_from_place_url, parse_place_url
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime
+
+# ==================== TOKOPEDIA ====================
+
+TOKOPEDIA_CARD_SELECTORS = [
+    "div[data-testid='master-product-card']",
+    "div[data-testid='divProductWrapper']",
+    "div.css-1sn1xa2",
+    "div.pcv3__container"
+]
+
+TOKOPEDIA_FIELD_SELECTORS = {
+    "name": [
+        "span[class*='prd_link-product-name']",
+        "div.prd_link-product-name",
+        "span.css-20kt3o",
+        "div[data-testid='spnSRPProdName']"
+    ],
+    "price": [
+        "span[class*='prd_link-product-price']",
+        "div.prd_link-product-price",
+        "span.css-o5uqvq",
+        "div[data-testid='spnSRPProdPrice']"
+    ],
+    "rating": [
+        "span[class*='rating']",
+        "span.css-t70v7i",
+        "div[data-testid='spnSRPProdRating']"
+    ],
+    "shop": [
+        "span[class*='prd_link-shop-name']",
+        "span.css-1kr22w3",
+        "div[data-testid='spnSRPProdShop']"
+    ],
+    "location": [
+        "span[class*='prd_link-shop-loc']",
+        "span.css-1kdc32b",
+        "div[data-testid='spnSRPProdLoc']"
+    ]
+}
+
+# Jumlah selector awal yang sama spesifiknya (boleh diurutkan ulang), default semua.
+# span[class*='rating'] terlalu umum, jadi urutan rating tetap.
+TOKOPEDIA_FIELD_PRIMARY = {"rating": 1}
+
+TOKOPEDIA_CARD_CHAIN = SelectorChain("tokopedia.card", TOKOPEDIA_CARD_SELECTORS)
+TOKOPEDIA_FIELD_CHAINS = {
+    field: SelectorChain(f"tokopedia.{field}", selectors, primary=TOKOPEDIA_FIELD_PRIMARY.get(field))
+    for field, selectors in TOKOPEDIA_FIELD_SELECTORS.items()
+}
+
+# ==================== GOOGLE SEARCH ====================
+
+GOOGLE_RESULT_SELECTOR = "div.g"
+
+# ==================== GOOGLE MAPS ====================
+
+MAPS_CARD_SELECTORS = [
+    "div.Nv2PK",
+    "a.hfpxzc",
+    "div[role='article']",
+    "div.lI9IFe"
+]
+
+MAPS_PANEL_SELECTORS = {
+    "name": "h1.DUwDvf",
+    "category": "button.DkEaL",
+    "rating": [
+        "div.F7nice span[aria-hidden='true']",
+        "span.ceNzKf",
+        "div.fontDisplayLarge"
+    ],
+    "total_reviews": [
+        "div.F7nice span[aria-label*='reviews']",
+        "button.HHrUdb span",
+        "span.RDApEe"
+    ],
+    "address": [
+        "button[data-item-id='address'] div.fontBodyMedium",
+        "div.Io6YTe",
+        "button[data-tooltip='Copy address']"
+    ],
+    "phone": [
+        "button[data-item-id*='phone'] div.fontBodyMedium",
+        "button[aria-label*='Phone']",
+        "a[href^='tel:']"
+    ],
+    "website": [
+        "a[data-item-id='authority']",
+        "button[data-item-id='authority'] div.fontBodyMedium",
+        "a[aria-label*='Website']"
+    ],
+    "hours": "button[aria-label*='Hours']"
+}
+
+# Selector sesudah jumlah ini fallback umum (urutan tetap): div.fontDisplayLarge,
+# button.HHrUdb span dan div.Io6YTe juga cocok dengan baris / angka lain di panel.
+MAPS_PANEL_PRIMARY = {"rating": 2, "total_reviews": 1, "address": 1}
+
+MAPS_CARD_CHAIN = SelectorChain("maps.card", MAPS_CARD_SELECTORS)
+MAPS_PANEL_CHAINS = {
+    field: SelectorChain(f"maps.{field}", selectors, primary=MAPS_PANEL_PRIMARY.get(field))
+    for field, selectors in MAPS_PANEL_SELECTORS.items() if isinstance(selectors, list)
+}
+
+def first_card_selector(root, selectors):
+    """Cari selector card pertama yang menghasilkan element, return (selector, elements)"""
+    if isinstance(selectors, SelectorChain):
+        return selectors.find_all(root)
+    for selector in selectors:
+        try:
+            elements = root.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                return selector, elements
+        except:
+            continue
+    return None, []
+
+def first_text(root, selectors, default="N/A"):
+    """Teks dari selector pertama yang ditemukan dan tidak kosong"""
+    if isinstance(selectors, SelectorChain):
+        return selectors.first(root, default=default)
+    for selector in selectors:
+        try:
+            text = root.find_element(By.CSS_SELECTOR, selector).text
+            if text:
+                return text
+        except:
+            continue
+    return default
+
+def get_text_safe(root, selector, default="N/A"):
+    """Safely get text from element"""
+    try:
+        element = root.find_element(By.CSS_SELECTOR, selector)
+        return element.text if element.text else default
+    except:
+        return default
+
+def extract_tokopedia_card(card, index):
+    """Extract data dari product card Tokopedia"""
+    try:
+        name = first_text(card, TOKOPEDIA_FIELD_CHAINS["name"], None)
+        if not name:
+            return None
+
+        # Link produk
+        link = "N/A"
+        try:
+            link = card.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
+        except:
+            pass
+
+        return {
+            "index": index,
+            "name": name,
+            "price": first_text(card, TOKOPEDIA_FIELD_CHAINS["price"]),
+            "rating": first_text(card, TOKOPEDIA_FIELD_CHAINS["rating"]),
+            "shop": first_text(card, TOKOPEDIA_FIELD_CHAINS["shop"]),
+            "location": first_text(card, TOKOPEDIA_FIELD_CHAINS["location"]),
+            "link": link,
+            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    except Exception as e:
+        print(f"   Debug: Error extracting data - {str(e)}")
+        return None
+
+def _tokopedia_product_url(link):
+    """urlparse link produk, link iklan (ta.tokopedia.com/promo/...?r=<url produk>) di-unwrap"""
+    parsed = urlparse(link)
+    if parsed.netloc.startswith("ta."):
+        target = parse_qs(parsed.query).get("r")
+        if target:
+            parsed = urlparse(target[0])
+    return parsed
+
+def tokopedia_product_key(product):
+    """Key dedup produk: host + path link tanpa query tracking
+
+    Produk tanpa link memakai nama + toko.
+    """
+    link = product.get("link")
+    if not link or link == "N/A":
+        return f"{product.get('name')}|{product.get('shop')}"
+    parsed = _tokopedia_product_url(link)
+    return f"{parsed.netloc}{parsed.path.rstrip('/')}"
+
+def tokopedia_shop_domain(product):
+    """Domain toko (segmen pertama path link produk, mis. "advan-store-cirebon"), atau None"""
+    link = product.get("link")
+    if not link or link == "N/A":
+        return None
+    segments = [segment for segment in _tokopedia_product_url(link).path.split('/') if segment]
+    return segments[0] if len(segments) >= 2 else None
+
+def extract_google_result(result, index):
+    """Extract data dari search result Google"""
+    try:
+        # Title
+        title = result.find_element(By.CSS_SELECTOR, "h3").text
+
+        # Link
+        link = result.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
+
+        # Description
+        try:
+            desc = result.find_element(By.CSS_SELECTOR, "div[data-sncf='1']").text
+        except:
+            desc = "N/A"
+
+        return {
+            "index": index,
+            "title": title,
+            "link": link,
+            "description": desc,
+            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    except:
+        return None
+
+def extract_maps_card(card, index):
+    """Extract nama, link dan koordinat dari card hasil Maps (a.hfpxzc)"""
+    try:
+        if card.tag_name == 'a':
+            anchor = card
+        else:
+            anchor = card.find_element(By.CSS_SELECTOR, "a.hfpxzc")
+        link = anchor.get_attribute('href')
+        place = parse_place_url(link) or {}
+        name = anchor.get_attribute('aria-label') or place.get("name")
+        if not name:
+            return None
+
+        # Rating & jumlah ulasan kecil di card, contoh "4,5" dan "(123)"
+        rating = get_text_safe(card, "span.MW4etd")
+        reviews = get_text_safe(card, "span.UY7F9")
+        return {
+            "index": index,
+            "name": name,
+            "rating": rating,
+            "total_reviews": reviews.strip("()") if reviews != "N/A" else reviews,
+            "place_id": place.get("place_id") or "N/A",
+            "coordinates": (f"{place['lat']},{place['lng']}"
+                            if place.get("lat") is not None else "N/A"),
+            "link": link,
+            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    except:
+        return None
+
+def _rating_value(element):
+    text = element.text
+    return text.split()[0] if text and any(char.isdigit() for char in text) else None
+
+def _reviews_value(element):
+    text = element.text
+    return text.split('(')[1].split(')')[0] if '(' in text and ')' in text else None
+
+def _phone_value(element):
+    if element.text:
+        return element.text
+    href = element.get_attribute('href')
+    return href.replace('tel:', '') if href else None
+
+def _website_value(element):
+    href = element.get_attribute('href')
+    return href if href and 'http' in href else element.text
+
+def get_maps_rating(root):
+    """Get rating"""
+    return MAPS_PANEL_CHAINS["rating"].first(root, _rating_value)
+
+def get_maps_total_reviews(root):
+    """Get total reviews"""
+    return MAPS_PANEL_CHAINS["total_reviews"].first(root, _reviews_value)
+
+def get_maps_phone(root):
+    """Get phone number"""
+    return MAPS_PANEL_CHAINS["phone"].first(root, _phone_value)
+
+def get_maps_website(root):
+    """Get website"""
+    return MAPS_PANEL_CHAINS["website"].first(root, _website_value)
+
+def get_maps_hours(root):
+    """Get business hours"""
+    try:
+        hours_button = root.find_element(By.CSS_SELECTOR, MAPS_PANEL_SELECTORS["hours"])
+        return hours_button.get_attribute('aria-label')
+    except:
+        return "N/A"
+
+def get_maps_coordinates(root):
+    """Get coordinates from URL"""
+    try:
+        coords = coords_from_place_url(root.current_url)
+        if coords:
+            return f"{coords[0]},{coords[1]}"
+        return "N/A"
+    except:
+        return "N/A"
+
+def read_place_panel(root, index, coordinates=None):
+    """Baca panel detail tempat per-field (driver Selenium atau StaticPage)"""
+    return {
+        "index": index,
+        "name": get_text_safe(root, MAPS_PANEL_SELECTORS["name"]),
+        "category": get_text_safe(root, MAPS_PANEL_SELECTORS["category"]),
+        "rating": get_maps_rating(root),
+        "total_reviews": get_maps_total_reviews(root),
+        "address": first_text(root, MAPS_PANEL_CHAINS["address"]),
+        "phone": get_maps_phone(root),
+        "website": get_maps_website(root),
+        "hours": get_maps_hours(root),
+        "coordinates": coordinates or get_maps_coordinates(root),
+        "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
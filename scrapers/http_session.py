@@ -0,0 +1,148 @@
+"""
+HTTP Session (tanpa browser)
+Client HTTP keep-alive (urllib3, sudah ikut terpasang bersama Selenium) untuk
+halaman statis. Hasilnya StaticPage dari static_dom, jadi selector By.* dan
+fungsi extract yang sama tetap bisa dipakai. Request melewati rate limiter
+dan deteksi blokir yang sama dengan BrowserSession.
+"""
+
+from static_dom import By, StaticPage
+from rate_limiter import RATE_LIMITER, BlockedError, detect_block
+from urllib.parse import urljoin
+import re
+import gzip
+import json
+import time
+import urllib3
+
+DEFAULT_HEADERS = {
+    "User-Agent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "id-ID,id;q=0.9,en;q=0.8",
+}
+
+# Container aplikasi SPA yang kosong di HTML awal dan baru diisi JavaScript
+SPA_ROOT_IDS = ("root", "app", "__next", "__nuxt", "main-app")
+
+class HttpError(Exception):
+    """Response HTTP dengan status error (4xx / 5xx)"""
+
+    def __init__(self, status, url):
+        self.status = status
+        self.url = url
+        super().__init__(f"HTTP {status}: {url}")
+
+def needs_javascript(page, expect=None):
+    """Return alasan jika halaman kemungkinan butuh JavaScript untuk tampil, atau None
+
+    expect: locator (by, value) yang seharusnya ada; jika tidak ditemukan di
+    HTML statis padahal halaman memuat script, halaman dianggap butuh JS.
+    """
+    scripts = page.find_elements(By.TAG_NAME, "script")
+    if expect and not page.find_elements(*expect):
+        return f"selector {expect[1]} tidak ada di HTML statis" if scripts else None
+
+    bodies = page.find_elements(By.TAG_NAME, "body")
+    body_text = bodies[0].text if bodies else ""
+    for noscript in page.find_elements(By.TAG_NAME, "noscript"):
+        if "javascript" in noscript.node.text_content().lower() and len(body_text) < 500:
+            return "noscript meminta JavaScript"
+    for root_id in SPA_ROOT_IDS:
+        roots = page.find_elements(By.ID, root_id)
+        if roots and not roots[0].text.strip() and len(body_text) < 200:
+            return f"container #{root_id} kosong"
+    if scripts and len(body_text) < 200:
+        return "hampir tidak ada teks tanpa JavaScript"
+    return None
+
+class HttpSession:
+    """Pool koneksi HTTP keep-alive, dipakai ulang untuk semua request ke host yang sama
+
+    Hanya get() yang butuh lxml (parse HTML); get_text() dan post_json() cukup urllib3.
+    """
+
+    def __init__(self, rate_limiter=RATE_LIMITER, headers=None, timeout=15, retries=2, maxsize=4):
+        self.rate_limiter = rate_limiter
+        self.http = urllib3.PoolManager(
+            num_pools=20,
+            maxsize=maxsize,
+            headers=dict(DEFAULT_HEADERS, **(headers or {})),
+            timeout=urllib3.Timeout(connect=5, read=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+        )
+        self.requests = 0
+        self.bytes = 0
+
+    def _request(self, url, method="GET", body=None, headers=None):
+        """Request lewat rate limiter, return (response, final_url, limiter)"""
+        limiter = self.rate_limiter.acquire(url) if self.rate_limiter else None
+        started = time.monotonic()
+        try:
+            if headers:
+                headers = dict(self.http.headers, **headers)
+            response = self.http.request(method, url, body=body, headers=headers)
+        except urllib3.exceptions.HTTPError:
+            if limiter:
+                limiter.record_error()
+            raise
+        self.requests += 1
+        self.bytes += len(response.data)
+        final_url = self._final_url(url, response)
+
+        if response.status == 429 or response.status >= 500:
+            if limiter:
+                limiter.record_error()
+            raise HttpError(response.status, final_url)
+        if limiter:
+            limiter.record_success(time.monotonic() - started)
+        return response, final_url, limiter
+
+    def get(self, url):
+        """GET url dan parse menjadi StaticPage (raise HttpError / BlockedError)"""
+        response, final_url, limiter = self._request(url)
+        page = StaticPage(self._decode(response.data, response), final_url)
+        page.status = response.status
+        reason = detect_block(final_url, page.title)
+        if reason:
+            cooldown = limiter.record_block(reason) if limiter else None
+            print(f"🛑 Halaman blokir terdeteksi ({reason}): {final_url}")
+            raise BlockedError(reason, final_url, cooldown)
+        if response.status >= 400:
+            raise HttpError(response.status, final_url)
+        return page
+
+    def _final_url(self, url, response):
+        """URL setelah redirect (dibutuhkan untuk resolve href relatif dan deteksi blokir)"""
+        for redirect in reversed(response.retries.history if response.retries else ()):
+            if redirect.redirect_location:
+                return urljoin(url, redirect.redirect_location)
+        return url
+
+    def get_text(self, url):
+        """GET mentah tanpa parse HTML (robots.txt, sitemap), return (status, teks)"""
+        response, _, _ = self._request(url)
+        data = response.data
+        if data[:2] == b"\x1f\x8b":
+            # sitemap.xml.gz
+            data = gzip.decompress(data)
+        return response.status, self._decode(data, response)
+
+    def post_json(self, url, payload, headers=None):
+        """POST body JSON (mis. GraphQL), return response JSON yang sudah di-parse"""
+        headers = dict({"Content-Type": "application/json", "Accept": "application/json"}, **(headers or {}))
+        response, final_url, _ = self._request(url, "POST", json.dumps(payload).encode('utf-8'), headers)
+        if response.status >= 400:
+            raise HttpError(response.status, final_url)
+        return json.loads(self._decode(response.data, response))
+
+    def _decode(self, data, response):
+        """Decode body sesuai charset di Content-Type (default utf-8)"""
+        match = re.search(r"charset=([\w-]+)", response.headers.get("Content-Type", ""), re.IGNORECASE)
+        try:
+            return data.decode(match.group(1) if match else "utf-8", errors="replace")
+        except LookupError:
+            return data.decode("utf-8", errors="replace")
+
+    def close(self):
+        """Tutup semua koneksi di pool"""
+        self.http.clear()
@@ -0,0 +1,121 @@
+"""
+Schema Extraction (deklaratif)
+Ambil semua item list di satu halaman sekaligus dari schema: selector
+container + selector field dengan mode text / attribute / list.
+
+Di browser schema dijalankan dengan satu execute_script per halaman (bukan
+find_element per field per item), di StaticPage (HTTP / replay) dengan lxml.
+
+Contoh:
+    QUOTES_SCHEMA = {
+        "container": "div.quote",
+        "fields": {
+            "quote": "span.text",                              # text (default)
+            "author": {"selector": "small.author", "required": True},
+            "author_url": {"selector": "a", "attr": "href"},   # attribute
+            "tags": {"selector": "a.tag", "mode": "list"},     # list text
+        },
+    }
+"""
+
+from static_dom import By
+from datetime import datetime
+
+MODES = ("text", "attr", "list")
+
+# Baca field satu item di browser (dipakai SCHEMA_JS dan scroll_harvester)
+READ_ITEM_JS = """
+const pickValue = (el, field) => {
+    if (!field.attr) return (el.innerText || el.textContent || '').trim();
+    // href / src lewat property supaya URL sudah absolut (sama seperti get_attribute Selenium)
+    const value = (field.attr === 'href' || field.attr === 'src') ? el[field.attr] : el.getAttribute(field.attr);
+    return (value || '').trim();
+};
+const readItem = (item, fields) => {
+    const record = {};
+    for (const field of fields) {
+        if (field.mode === 'list') {
+            const elements = field.selector ? item.querySelectorAll(field.selector) : [item];
+            record[field.name] = Array.from(elements).map((el) => pickValue(el, field)).filter(Boolean);
+        } else {
+            const el = field.selector ? item.querySelector(field.selector) : item;
+            record[field.name] = el ? pickValue(el, field) : '';
+        }
+    }
+    return record;
+};
+"""
+
+# Evaluasi schema di browser: satu round trip untuk semua item di halaman
+SCHEMA_JS = READ_ITEM_JS + """
+const schema = arguments[0];
+return Array.from(document.querySelectorAll(schema.container)).map((item) => readItem(item, schema.fields));
+"""
+
+def compile_schema(schema):
+    """Normalisasi schema menjadi {"container", "fields": [ {name, selector, attr, mode, default, required} ]}"""
+    if "container" not in schema or not schema.get("fields"):
+        raise ValueError("Schema butuh 'container' dan 'fields'")
+    fields = []
+    for name, spec in schema["fields"].items():
+        if isinstance(spec, str):
+            spec = {"selector": spec}
+        mode = spec.get("mode") or ("attr" if spec.get("attr") else "text")
+        if mode not in MODES:
+            raise ValueError(f"Mode field '{name}' tidak dikenal: {mode} ({', '.join(MODES)})")
+        fields.append({
+            "name": name,
+            "selector": spec.get("selector"),
+            "attr": spec.get("attr"),
+            "mode": mode,
+            "default": spec.get("default", [] if mode == "list" else "N/A"),
+            "required": spec.get("required", False),
+        })
+    return {"container": schema["container"], "fields": fields}
+
+def _pick_static(element, field):
+    if not field["attr"]:
+        return (element.text or "").strip()
+    return (element.get_attribute(field["attr"]) or "").strip()
+
+def _extract_static(root, compiled):
+    """Evaluasi schema pada StaticPage / StaticElement (lxml)"""
+    items = []
+    for container in root.find_elements(By.CSS_SELECTOR, compiled["container"]):
+        record = {}
+        for field in compiled["fields"]:
+            # Field tanpa selector = container itu sendiri
+            elements = container.find_elements(By.CSS_SELECTOR, field["selector"]) if field["selector"] else [container]
+            if field["mode"] == "list":
+                record[field["name"]] = [value for value in (_pick_static(el, field) for el in elements) if value]
+            else:
+                record[field["name"]] = _pick_static(elements[0], field) if elements else ""
+        items.append(record)
+    return items
+
+def extract_list(root, schema, start_index=1):
+    """Semua item di halaman sesuai schema, dengan index dan scraped_at
+
+    root: WebDriver (satu execute_script) atau StaticPage / StaticElement (lxml).
+    Item yang field required-nya kosong dilewati, field kosong lain diisi default.
+    """
+    compiled = schema if isinstance(schema.get("fields"), list) else compile_schema(schema)
+    if hasattr(root, "execute_script"):
+        raw_items = root.execute_script(SCHEMA_JS, compiled) or []
+    else:
+        raw_items = _extract_static(root, compiled)
+    return finish_records(raw_items, compiled, start_index)
+
+def finish_records(raw_items, compiled, start_index=1):
+    """Terapkan required / default lalu tambah index dan scraped_at ke item mentah"""
+    scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    records = []
+    for raw in raw_items:
+        if any(field["required"] and not raw.get(field["name"]) for field in compiled["fields"]):
+            continue
+        record = {"index": start_index + len(records)}
+        for field in compiled["fields"]:
+            record[field["name"]] = raw.get(field["name"]) or field["default"]
+        record["scraped_at"] = scraped_at
+        records.append(record)
+    return records
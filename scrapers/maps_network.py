@@ -0,0 +1,245 @@
+"""
+Google Maps Network Capture Engine
+Ambil data bisnis langsung dari payload XHR/JSON Google Maps (search & place)
+yang ditangkap lewat Chrome performance log, bukan dari DOM
+
+Parser bisa dijalankan offline terhadap file payload hasil rekaman:
+    python3 scrapers/maps_network.py debug/network_payloads/*.txt
+"""
+
+from datetime import datetime
+import os
+import sys
+import json
+import time
+
+# URL XHR yang membawa data tempat
+SEARCH_URL_MARKERS = ("/search?tbm=map", "/maps/search?")
+PLACE_URL_MARKERS = ("/maps/preview/place",)
+
+def strip_xssi(text):
+    """Buang prefix anti-XSSI )]}' dan trailer /*""*/ dari payload Google"""
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-len('/*""*/')]
+    if text.startswith(")]}'"):
+        text = text[len(")]}'"):]
+    return text.strip()
+
+def load_payload(text):
+    """Parse payload mentah menjadi struktur JSON (nested list)
+
+    Beberapa response dibungkus {"c":0,"d":")]}'..."}; isi "d" ikut di-parse.
+    """
+    data = json.loads(strip_xssi(text))
+    if isinstance(data, dict) and "d" in data:
+        data = json.loads(strip_xssi(data["d"]))
+    return data
+
+def _dig(data, *path):
+    """Ambil nilai nested list/dict tanpa error, return None jika path tidak ada"""
+    for key in path:
+        try:
+            data = data[key]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+def _format_hours(hours):
+    """Ubah blok jam buka [[hari, [jam, ...]], ...] menjadi satu string"""
+    if not isinstance(hours, list):
+        return "N/A"
+    parts = []
+    for day in hours:
+        name = _dig(day, 0)
+        slots = _dig(day, 1)
+        if name and isinstance(slots, list):
+            parts.append(f"{name}: {', '.join(str(slot) for slot in slots)}")
+    return "; ".join(parts) if parts else "N/A"
+
+def place_to_record(place, index=None):
+    """Ubah array tempat dari payload menjadi dict dengan schema _extract_business_data"""
+    name = _dig(place, 11)
+    if not name:
+        return None
+
+    rating = _dig(place, 4, 7)
+    reviews = _dig(place, 4, 8)
+    lat, lng = _dig(place, 9, 2), _dig(place, 9, 3)
+
+    address = _dig(place, 39)
+    if not address:
+        lines = _dig(place, 2)
+        address = ", ".join(lines) if isinstance(lines, list) and lines else None
+
+    categories = _dig(place, 13)
+    category = categories[0] if isinstance(categories, list) and categories else None
+
+    return {
+        "index": index,
+        "name": name,
+        "category": category or "N/A",
+        # Format sama dengan tampilan DOM --lang=id-ID (koma desimal)
+        "rating": str(rating).replace('.', ',') if rating is not None else "N/A",
+        "total_reviews": str(reviews) if reviews is not None else "N/A",
+        "address": address or "N/A",
+        "phone": _dig(place, 178, 0, 0) or "N/A",
+        "website": _dig(place, 7, 0) or "N/A",
+        "hours": _format_hours(_dig(place, 34, 1)),
+        "coordinates": f"{lat},{lng}" if lat is not None and lng is not None else "N/A",
+        "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def place_identity(place):
+    """Identitas tempat dari payload: place id (ChIJ...) atau feature id"""
+    return _dig(place, 78) or _dig(place, 10) or _dig(place, 11)
+
+def parse_search_payload(text):
+    """Parse response /search?tbm=map menjadi list (identity, record)
+
+    Daftar hasil ada di data[0][1]; elemen pertama berisi metadata query,
+    setiap elemen berikutnya menyimpan array tempat di index 14.
+    """
+    data = load_payload(text)
+    results = []
+    for entry in _dig(data, 0, 1) or []:
+        place = _dig(entry, 14)
+        if not isinstance(place, list):
+            continue
+        record = place_to_record(place)
+        if record:
+            results.append((place_identity(place), record))
+    return results
+
+def parse_place_payload(text):
+    """Parse response /maps/preview/place (detail satu tempat) menjadi (identity, record)"""
+    place = _dig(load_payload(text), 6)
+    if not isinstance(place, list):
+        return None
+    record = place_to_record(place)
+    return (place_identity(place), record) if record else None
+
+def parse_payload_file(path):
+    """Parse file payload rekaman; jenis payload ditebak dari isinya"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    results = parse_search_payload(text)
+    if not results:
+        single = parse_place_payload(text)
+        results = [single] if single else []
+    return results
+
+class MapsNetworkCapture:
+    """Tangkap response search/place Maps dari performance log BrowserSession
+
+    Driver harus dibuat dengan network_logging=True supaya event
+    Network.responseReceived tersedia.
+    """
+
+    def __init__(self, session, save_dir=None):
+        self.session = session
+        self.driver = session.driver
+        self.save_dir = save_dir
+        self.places = {}  # identity -> record, urutan insert = urutan muncul
+        self.payload_count = 0
+        self._pending = []
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        session.log_listeners.append(self._on_messages)
+
+    def _on_messages(self, messages):
+        """Listener performance log: catat requestId response yang relevan"""
+        for message in messages:
+            if message.get("method") != "Network.responseReceived":
+                continue
+            params = message.get("params", {})
+            url = params.get("response", {}).get("url", "")
+            if any(marker in url for marker in SEARCH_URL_MARKERS):
+                self._pending.append(("search", params["requestId"]))
+            elif any(marker in url for marker in PLACE_URL_MARKERS):
+                self._pending.append(("place", params["requestId"]))
+
+    def poll(self):
+        """Ambil body response yang baru datang, parse, return jumlah tempat baru"""
+        self.session.drain_performance_log()
+        pending, self._pending = self._pending, []
+
+        new_count = 0
+        for kind, request_id in pending:
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            except Exception:
+                # Body bisa sudah dibuang browser jika halaman berpindah
+                continue
+            new_count += self.feed(kind, body.get("body", ""))
+        return new_count
+
+    def feed(self, kind, text):
+        """Parse satu payload ("search", "place" atau "auto") dan gabungkan ke hasil"""
+        self.payload_count += 1
+        if self.save_dir:
+            os.makedirs(self.save_dir, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            with open(os.path.join(self.save_dir, f"maps_{kind}_{timestamp}.txt"), 'w', encoding='utf-8') as f:
+                f.write(text)
+
+        try:
+            results = parse_search_payload(text) if kind in ("search", "auto") else []
+            if not results and kind in ("place", "auto"):
+                single = parse_place_payload(text)
+                results = [single] if single else []
+        except (ValueError, TypeError) as e:
+            print(f"⚠️  Payload {kind} tidak bisa di-parse: {str(e)}")
+            return 0
+
+        new_count = 0
+        for identity, record in results:
+            if identity not in self.places:
+                new_count += 1
+            # Payload place (detail) lebih lengkap, jadi boleh menimpa hasil search
+            if identity not in self.places or kind == "place":
+                self.places[identity] = record
+        return new_count
+
+    def feed_initial_state(self):
+        """Parse hasil awal yang di-embed di window.APP_INITIALIZATION_STATE
+
+        Halaman pertama hasil pencarian tidak datang lewat XHR, tapi sudah
+        ada di HTML sebagai string payload.
+        """
+        try:
+            state = self.driver.execute_script("return window.APP_INITIALIZATION_STATE")
+        except Exception:
+            return 0
+        new_count = 0
+        for blob in (_dig(state, 3) or []):
+            if isinstance(blob, str) and blob.startswith(")]}'"):
+                new_count += self.feed("auto", blob)
+        return new_count
+
+    def records(self, max_results=None):
+        """Semua record unik dengan index sesuai urutan muncul"""
+        records = list(self.places.values())[:max_results]
+        for idx, record in enumerate(records, 1):
+            record["index"] = idx
+        return records
+
+def main():
+    """Parse file payload rekaman secara offline dan tampilkan throughput"""
+    paths = sys.argv[1:]
+    if not paths:
+        print("Pemakaian: python3 scrapers/maps_network.py <payload.txt> [...]")
+        return
+
+    start = time.perf_counter()
+    total = 0
+    for path in paths:
+        results = parse_payload_file(path)
+        total += len(results)
+        print(f"📄 {path}: {len(results)} tempat")
+        for _, record in results[:3]:
+            print(f"   - {record['name']} | {record['rating']} | {record['coordinates']}")
+    elapsed = time.perf_counter() - start
+    print(f"\n⚡ {total} tempat dari {len(paths)} file dalam {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Grid Tiling untuk Google Maps Search
+Membagi bounding box menjadi tile viewport @lat,lng,zoom supaya pencarian
+tidak terpotong batas jumlah hasil Google Maps
+"""
+
+from collections import namedtuple
+import math
+
+# Bounding box Kota + Kabupaten Cirebon: (south, west, north, east)
+CIREBON_BBOX = (-7.00, 108.30, -6.55, 108.85)
+
+# Google Maps berhenti memuat feed di sekitar 120 hasil per pencarian
+MAPS_RESULT_CAP = 120
+
+# Base URL Google Maps (bisa diganti ke fixture server lokal untuk benchmark)
+MAPS_BASE_URL = "https://www.google.com/maps"
+
+# Perkiraan lebar peta yang terlihat dalam satuan tile 256px (panel hasil memakan sisanya)
+VIEWPORT_TILES = 3
+
+Tile = namedtuple("Tile", ["south", "west", "north", "east", "depth"])
+
+def make_grid(bbox=CIREBON_BBOX, rows=4, cols=4):
+    """Bagi bounding box menjadi grid rows x cols"""
+    south, west, north, east = bbox
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+    tiles = []
+    for r in range(rows):
+        for c in range(cols):
+            tiles.append(Tile(
+                south=south + r * lat_step,
+                west=west + c * lng_step,
+                north=south + (r + 1) * lat_step,
+                east=west + (c + 1) * lng_step,
+                depth=0
+            ))
+    return tiles
+
+def split_tile(tile):
+    """Pecah tile menjadi 4 sub-tile (dipakai jika tile kena batas hasil)"""
+    mid_lat = (tile.south + tile.north) / 2
+    mid_lng = (tile.west + tile.east) / 2
+    depth = tile.depth + 1
+    return [
+        Tile(tile.south, tile.west, mid_lat, mid_lng, depth),
+        Tile(tile.south, mid_lng, mid_lat, tile.east, depth),
+        Tile(mid_lat, tile.west, tile.north, mid_lng, depth),
+        Tile(mid_lat, mid_lng, tile.north, tile.east, depth),
+    ]
+
+def tile_center(tile):
+    """Titik tengah tile (lat, lng)"""
+    return (tile.south + tile.north) / 2, (tile.west + tile.east) / 2
+
+def tile_zoom(tile):
+    """Zoom level supaya seluruh tile masuk ke viewport"""
+    span = max(tile.north - tile.south, tile.east - tile.west)
+    zoom = int(math.log2(360 * VIEWPORT_TILES / span))
+    return max(10, min(18, zoom))
+
+def tile_search_url(query, tile, base_url=MAPS_BASE_URL):
+    """URL pencarian Maps yang dikunci ke viewport tile"""
+    lat, lng = tile_center(tile)
+    return (f"{base_url}/search/{query.replace(' ', '+')}"
+            f"/@{lat:.6f},{lng:.6f},{tile_zoom(tile)}z")
+
+def in_bbox(coords, bbox=CIREBON_BBOX):
+    """Cek apakah koordinat (lat, lng) ada di dalam bounding box"""
+    if not coords:
+        return False
+    lat, lng = float(coords[0]), float(coords[1])
+    south, west, north, east = bbox
+    return south <= lat <= north and west <= lng <= east
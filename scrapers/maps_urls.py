@@ -0,0 +1,60 @@
+"""
+Helper URL Google Maps
+Parsing place id, CID dan koordinat langsung dari URL tempat tanpa query DOM
+"""
+
+import re
+from urllib.parse import unquote
+
+def coords_from_place_url(url):
+    """Ambil koordinat tempat dari URL Maps
+
+    Prioritas ke pin tempat (!3d<lat>!4d<lng>) karena @lat,lng hanya
+    titik tengah viewport. Return (lat, lng) string atau None.
+    """
+    if not url:
+        return None
+    match = re.search(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)', url)
+    if not match:
+        match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
+    return (match.group(1), match.group(2)) if match else None
+
+def parse_place_url(url):
+    """Parse URL tempat (href a.hfpxzc) menjadi dict identitas + koordinat
+
+    Contoh URL:
+    https://www.google.com/maps/place/Nama+Tempat/data=!4m7!3m6!1s0x2e6f...:0x5f3b...
+        !8m2!3d-6.7295044!4d108.4773185!16s%2Fg%2F11...!19sChIJ...
+    """
+    if not url:
+        return None
+    
+    place_id = re.search(r'!19s(ChIJ[\w-]+)', url)
+    feature_id = re.search(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)', url)
+    cid = re.search(r'[?&]cid=(\d+)', url)
+    name = re.search(r'/maps/place/([^/]+)', url)
+    coords = coords_from_place_url(url)
+    
+    # CID juga bisa diturunkan dari bagian kedua feature id (hex -> desimal)
+    cid_value = cid.group(1) if cid else None
+    if not cid_value and feature_id:
+        cid_value = str(int(feature_id.group(1).split(':')[1], 16))
+    
+    return {
+        "place_id": place_id.group(1) if place_id else None,
+        "feature_id": feature_id.group(1) if feature_id else None,
+        "cid": cid_value,
+        "name": unquote(name.group(1)).replace('+', ' ') if name else None,
+        "lat": coords[0] if coords else None,
+        "lng": coords[1] if coords else None,
+    }
+
+def place_key(link):
+    """Identitas tempat dari link card: place id (ChIJ...), feature id, atau CID
+
+    Fallback ke URL tanpa query string jika tidak ada id yang dikenali.
+    """
+    place = parse_place_url(link)
+    if not place:
+        return None
+    return place["place_id"] or place["feature_id"] or place["cid"] or link.split('?')[0]
@@ -0,0 +1,265 @@
+"""
+Output Writers (streaming)
+Tulis record satu per satu begitu datang, tanpa menyimpan seluruh hasil di
+memori. Format: JSONL, JSON array, CSV dengan schema tetap dan Parquet
+(pyarrow), dengan kompresi gzip / zstd opsional dan flush berkala.
+
+Format dan kompresi ditebak dari nama file:
+    hasil.jsonl, hasil.jsonl.gz, hasil.csv.zst, hasil.json, hasil.parquet
+"""
+
+import io
+import os
+import csv
+import gzip
+import json
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ("jsonl", "json", "csv", "parquet")
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+def parse_filename(filename):
+    """Tebak (format, kompresi) dari nama file, mis. data.csv.gz -> ("csv", "gzip")
+
+    Hanya .jsonl, .json, .csv, .parquet (+ .gz / .zst) yang dianggap ekstensi;
+    nama lain (tanpa ekstensi, hasil_v1.5, ...) ditulis sebagai JSONL.
+    """
+    name = os.path.basename(filename).lower()
+    compression = None
+    for suffix, codec in COMPRESSIONS.items():
+        if name.endswith(suffix):
+            compression = codec
+            name = name[:-len(suffix)]
+    extension = name.rsplit('.', 1)[-1] if '.' in name else ""
+    if extension in FORMATS:
+        return extension, compression
+    return "jsonl", compression
+
+def parse_format(spec):
+    """Nama format dari input user (mis. "csv", "jsonl.gz", ".parquet") -> (format, kompresi)
+
+    Berbeda dengan parse_filename, nama format yang tidak dikenal = ValueError.
+    """
+    name = spec.strip().lower().lstrip('.')
+    compression = None
+    for suffix, codec in COMPRESSIONS.items():
+        if name.endswith(suffix):
+            compression = codec
+            name = name[:-len(suffix)]
+    if name not in FORMATS:
+        raise ValueError(f"Format tidak dikenal: {spec}")
+    return name, compression
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ImportError("Kompresi zstd butuh paket zstandard: pip install zstandard")
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("Format parquet butuh pyarrow: pip install pyarrow")
+
+def _open_text(filename, compression):
+    """Buka file teks untuk ditulis, dibungkus gzip / zstd jika diminta"""
+    if compression == "gzip":
+        return gzip.open(filename, 'wt', encoding='utf-8', newline='')
+    if compression == "zstd":
+        _require_zstandard()
+        raw = open(filename, 'wb')
+        stream = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    return open(filename, 'w', encoding='utf-8', newline='')
+
+def _flat(value):
+    """Nilai list/dict di CSV ditulis sebagai JSON"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+class RecordWriter:
+    """Base writer: hitung record dan flush setiap flush_every record / flush_seconds detik"""
+
+    def __init__(self, filename, fieldnames=None, flush_every=100, flush_seconds=10):
+        self.filename = filename
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.count = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        self._write(record)
+        self.count += 1
+        if self.count % self.flush_every == 0 or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+        return self
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class JsonlWriter(RecordWriter):
+    """Satu record JSON per baris"""
+
+    def __init__(self, filename, compression=None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._file = _open_text(filename, compression)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self._file.flush()
+        super().flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+class JsonArrayWriter(JsonlWriter):
+    """JSON array valid yang ditulis bertahap (satu record per baris)"""
+
+    def __init__(self, filename, compression=None, **kwargs):
+        super().__init__(filename, compression, **kwargs)
+        self._file.write("[")
+
+    def _write(self, record):
+        self._file.write(("," if self.count else "") + "\n  " + json.dumps(record, ensure_ascii=False))
+
+    def close(self):
+        self._file.write("\n]\n" if self.count else "]\n")
+        super().close()
+
+class CsvWriter(RecordWriter):
+    """CSV dengan schema tetap: kolom dari fieldnames (atau record pertama), key lain diabaikan"""
+
+    def __init__(self, filename, compression=None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._file = _open_text(filename, compression)
+        self._writer = None
+        if self.fieldnames:
+            self._start(self.fieldnames)
+
+    def _start(self, fieldnames):
+        self.fieldnames = list(fieldnames)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames,
+                                      restval="N/A", extrasaction='ignore')
+        self._writer.writeheader()
+
+    def _write(self, record):
+        if self._writer is None:
+            self._start(record.keys())
+        self._writer.writerow({key: _flat(value) for key, value in record.items()})
+
+    def flush(self):
+        self._file.flush()
+        super().flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+class ParquetWriter(RecordWriter):
+    """Parquet via pyarrow, record di-buffer lalu ditulis per row group (memori tetap)"""
+
+    def __init__(self, filename, compression=None, row_group_size=1000, **kwargs):
+        _require_pyarrow()
+        super().__init__(filename, **kwargs)
+        self.row_group_size = row_group_size
+        # Kompresi parquet ditangani codec internal, bukan pembungkus file
+        self.codec = compression or "zstd"
+        self._buffer = []
+        self._writer = None
+
+    def _write(self, record):
+        if self.fieldnames is None:
+            self.fieldnames = list(record.keys())
+        self._buffer.append(record)
+        if len(self._buffer) >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self):
+        if not self._buffer:
+            return
+        columns = {
+            # Semua kolom disimpan sebagai string supaya schema tidak berubah antar row group
+            key: [None if record.get(key) is None else str(_flat(record.get(key))) for record in self._buffer]
+            for key in self.fieldnames
+        }
+        table = pyarrow.table({key: pyarrow.array(values, type=pyarrow.string()) for key, values in columns.items()})
+        if self._writer is None:
+            self._writer = pyarrow_parquet.ParquetWriter(self.filename, table.schema, compression=self.codec)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def flush(self):
+        # Row group kecil membuat file boros, jadi flush berkala hanya saat buffer penuh
+        super().flush()
+
+    def close(self):
+        self._write_row_group()
+        if self._writer is None and self.fieldnames:
+            # Tanpa record: tetap tulis file kosong dengan schema
+            schema = pyarrow.schema([(key, pyarrow.string()) for key in self.fieldnames])
+            self._writer = pyarrow_parquet.ParquetWriter(self.filename, schema, compression=self.codec)
+        if self._writer is not None:
+            self._writer.close()
+
+WRITERS = {
+    "jsonl": JsonlWriter,
+    "json": JsonArrayWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+}
+
+def check_writer(filename, format=None, compression=None):
+    """Cek format dan paket opsionalnya tanpa membuat file, supaya gagal sebelum scraping dimulai
+
+    Return (format, kompresi), raise ValueError / ImportError.
+    """
+    guessed_format, guessed_compression = parse_filename(filename)
+    format = format or guessed_format
+    compression = compression or guessed_compression
+    if format not in WRITERS:
+        raise ValueError(f"Format tidak dikenal: {format}")
+    if format == "parquet":
+        _require_pyarrow()
+    elif compression == "zstd":
+        _require_zstandard()
+    return format, compression
+
+def open_writer(filename, fieldnames=None, format=None, compression=None, **kwargs):
+    """Buka writer sesuai format (ditebak dari nama file jika tidak diberikan)"""
+    guessed_format, guessed_compression = parse_filename(filename)
+    writer_class = WRITERS[format or guessed_format]
+    return writer_class(filename, compression=compression or guessed_compression,
+                        fieldnames=fieldnames, **kwargs)
+
+def write_records(records, filename, fieldnames=None, **kwargs):
+    """Tulis iterable record ke satu file, return jumlah record"""
+    with open_writer(filename, fieldnames=fieldnames, **kwargs) as writer:
+        writer.write_many(records)
+    print(f"💾 Data disimpan ke {filename}")
+    return writer.count
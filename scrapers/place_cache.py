@@ -0,0 +1,92 @@
+"""
+Place Cache (SQLite)
+Cache lintas run untuk hasil extract Google Maps, key = place id / CID dari
+link card (place_key). Tempat yang masih segar (umur < TTL, default 7 hari)
+tidak dibuka ulang; record dari cache tetap ditulis ke journal. Cache opt-in:
+prompt scraper default TTL 0 (tanpa PlaceCache) = refresh penuh.
+"""
+
+from maps_urls import place_key
+import os
+import json
+import time
+import sqlite3
+import threading
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "scraping_project", "place_cache.sqlite3")
+
+class PlaceCache:
+    """Cache record tempat dengan TTL
+
+    mode "serve": record dari cache ikut dikembalikan sebagai hasil method search_*
+    mode "skip" : tempat yang masih segar tidak dibuka ulang dan tidak ikut
+                  dikembalikan, hanya ditulis ke journal (resume / file akhir)
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, ttl_days=7, mode="serve"):
+        self.path = path
+        self.ttl_seconds = ttl_days * 24 * 3600
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Dipakai dari thread producer dan writer, akses dijaga dengan lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS places (
+                key TEXT PRIMARY KEY,
+                link TEXT,
+                record TEXT NOT NULL,
+                scraped_at TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, link):
+        """Ambil record segar untuk link, atau None (miss / kedaluwarsa)"""
+        key = place_key(link)
+        if not key:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record, updated_at FROM places WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and time.time() - row[1] <= self.ttl_seconds:
+                self.hits += 1
+                return json.loads(row[0])
+
+            self.misses += 1
+            if row:
+                self.expired += 1
+            return None
+
+    def put(self, link, record):
+        """Simpan / perbarui record tempat"""
+        key = place_key(link)
+        if not key or not record:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places (key, link, record, scraped_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (key, link, json.dumps(record, ensure_ascii=False), record.get("scraped_at"), time.time())
+            )
+            self._conn.commit()
+
+    def print_stats(self):
+        """Tampilkan jumlah hit/miss cache di akhir run"""
+        total = self.hits + self.misses
+        if not total:
+            return
+        print(f"\n🗄️  PLACE CACHE: {self.hits} hit, {self.misses} miss "
+              f"({self.expired} kedaluwarsa), hit rate {self.hits / total:.0%}")
+
+    def close(self):
+        """Tutup koneksi SQLite"""
+        with self._lock:
+            self._conn.close()
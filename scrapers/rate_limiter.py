@@ -0,0 +1,221 @@
+"""
+Adaptive Rate Limiter
+Token bucket per domain yang dipakai bersama semua scraper (dan semua thread).
+Rate naik pelan-pelan selama situs sehat, turun saat response melambat atau
+error, dan berhenti total (fail fast) saat halaman blokir / consent wall /
+"unusual traffic" terdeteksi.
+"""
+
+from urllib.parse import urlparse
+import re
+import time
+import random
+import threading
+
+# Rate awal (request/detik) per domain, domain lain memakai DEFAULT_RATE
+DEFAULT_DOMAIN_RATES = {
+    "google.com": 1.0,
+    "tokopedia.com": 0.5,
+}
+DEFAULT_RATE = 1.0
+
+# Host lokal (fixture server benchmark) tidak dibatasi
+UNLIMITED_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+# Tanda halaman blokir / interstitial: (alasan, pola URL, pola title).
+# Hanya URL dan title halaman interstitial itu sendiri yang dicek (title dicocokkan
+# utuh), bukan isi halaman, supaya artikel / hasil pencarian yang kebetulan memuat
+# frasa seperti "too many requests" tidak dianggap blokir.
+BLOCK_MARKERS = [
+    ("unusual_traffic", r"://(www\.)?google\.[a-z.]+/sorry/", None),
+    ("consent_wall", r"://consent\.(google|youtube)\.",
+     r"before you continue to google( search| maps)?|sebelum anda melanjutkan ke google( search| maps)?"),
+    ("captcha", r"://([a-z0-9-]+\.)*(captcha-delivery\.com|hcaptcha\.com|recaptcha\.net)/|/px-captcha",
+     r"just a moment\.\.\.|attention required! \| cloudflare|verify you are human"),
+    ("access_denied", None, r"access denied|akses ditolak"),
+]
+
+class BlockedError(Exception):
+    """Situs menampilkan halaman blokir / interstitial, scraping domain ini dihentikan sementara"""
+
+    def __init__(self, reason, url=None, retry_after=None):
+        self.reason = reason
+        self.url = url
+        self.retry_after = retry_after
+        message = f"Diblokir ({reason})"
+        if retry_after:
+            message += f", coba lagi dalam {retry_after:.0f}s"
+        super().__init__(message)
+
+def domain_of(url):
+    """Domain untuk pengelompokan limiter, mis. www.google.com -> google.com"""
+    host = (urlparse(url).hostname or "").lower()
+    if not host or host in UNLIMITED_HOSTS or re.match(r"^[\d.]+$", host):
+        return host or None
+    parts = host.split(".")
+    # co.id, co.uk, ... -> ambil 3 label terakhir
+    if len(parts) >= 3 and parts[-2] in ("co", "com", "ac", "or", "go"):
+        return ".".join(parts[-3:])
+    return ".".join(parts[-2:])
+
+def detect_block(url="", title=""):
+    """Return alasan blokir jika URL / title halaman cocok dengan halaman blokir / interstitial, atau None"""
+    url = url or ""
+    title = (title or "").strip().lower()
+    for reason, url_pattern, title_pattern in BLOCK_MARKERS:
+        if url_pattern and re.search(url_pattern, url, re.IGNORECASE):
+            return reason
+        if title_pattern and title and re.fullmatch(title_pattern, title):
+            return reason
+    return None
+
+class DomainLimiter:
+    """Token bucket satu domain dengan rate adaptif (additive increase, multiplicative decrease)"""
+
+    def __init__(self, domain, rate=DEFAULT_RATE, min_rate=0.1, max_rate=4.0, burst=2,
+                 target_latency=2.5, block_cooldown=300):
+        self.domain = domain
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.target_latency = target_latency
+        self.block_cooldown = block_cooldown
+
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.latency = None  # EWMA latency (detik)
+        self.backoff_until = 0
+        self.blocked_until = 0
+        self.block_reason = None
+        self.consecutive_errors = 0
+        self.requests = 0
+        self.errors = 0
+        self.blocks = 0
+        self.waited_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Ambil satu token (blocking), raise BlockedError jika domain sedang diblokir"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.blocked_until > now:
+                    raise BlockedError(self.block_reason, retry_after=self.blocked_until - now)
+                self._refill(now)
+                wait = max(0, self.backoff_until - now)
+                if not wait and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.requests += 1
+                    return
+                if not wait:
+                    wait = (1 - self.tokens) / self.rate
+                # Sedikit jitter supaya thread yang menunggu tidak bangun bersamaan
+                wait += random.uniform(0, 0.1 * wait)
+                self.waited_seconds += wait
+            time.sleep(wait)
+
+    def record_success(self, latency):
+        """Catat response sukses dan sesuaikan rate dengan latency"""
+        with self._lock:
+            self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+            self.consecutive_errors = 0
+            if self.latency > 2 * self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.8)
+            elif self.latency < self.target_latency:
+                self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def record_error(self):
+        """Catat error (timeout, 5xx, ...): rate turun setengah + backoff eksponensial"""
+        with self._lock:
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            backoff = min(120, 2 ** self.consecutive_errors)
+            self.backoff_until = time.monotonic() + backoff
+
+    def record_block(self, reason):
+        """Halaman blokir terdeteksi: rate ke minimum dan domain berhenti selama cooldown"""
+        with self._lock:
+            self.blocks += 1
+            self.block_reason = reason
+            self.rate = self.min_rate
+            self.tokens = 0
+            cooldown = self.block_cooldown * 2 ** (self.blocks - 1)
+            self.blocked_until = time.monotonic() + cooldown
+            return cooldown
+
+    def snapshot(self):
+        """Metrik saat ini"""
+        with self._lock:
+            now = time.monotonic()
+            if self.blocked_until > now:
+                state = "blocked"
+            elif self.backoff_until > now:
+                state = "backoff"
+            else:
+                state = "ok"
+            return {
+                "domain": self.domain,
+                "state": state,
+                "rate": round(self.rate, 2),
+                "latency": round(self.latency, 2) if self.latency is not None else None,
+                "requests": self.requests,
+                "errors": self.errors,
+                "blocks": self.blocks,
+                "block_reason": self.block_reason,
+                "backoff_remaining": round(max(0, self.backoff_until - now, self.blocked_until - now), 1),
+                "waited_seconds": round(self.waited_seconds, 1),
+            }
+
+class RateLimiter:
+    """Kumpulan DomainLimiter, dibuat otomatis saat domain pertama kali dipakai"""
+
+    def __init__(self, domain_rates=None, **limiter_kwargs):
+        self.domain_rates = dict(DEFAULT_DOMAIN_RATES, **(domain_rates or {}))
+        self.limiter_kwargs = limiter_kwargs
+        self.domains = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        """DomainLimiter untuk URL, atau None jika domain tidak dibatasi"""
+        domain = domain_of(url)
+        if not domain or domain in UNLIMITED_HOSTS or re.match(r"^[\d.]+$", domain):
+            return None
+        with self._lock:
+            if domain not in self.domains:
+                rate = self.domain_rates.get(domain, DEFAULT_RATE)
+                self.domains[domain] = DomainLimiter(domain, rate=rate, **self.limiter_kwargs)
+            return self.domains[domain]
+
+    def acquire(self, url):
+        limiter = self.for_url(url)
+        if limiter:
+            limiter.acquire()
+        return limiter
+
+    def snapshot(self):
+        with self._lock:
+            limiters = list(self.domains.values())
+        return [limiter.snapshot() for limiter in limiters]
+
+    def print_stats(self):
+        """Tampilkan rate, latency dan status backoff setiap domain"""
+        stats = self.snapshot()
+        if not stats:
+            return
+        print("\n🚦 RATE LIMITER:")
+        for s in stats:
+            latency = f"{s['latency']:.2f}s" if s["latency"] is not None else "-"
+            line = (f"   {s['domain']:<16} {s['state']:<8} rate={s['rate']:.2f}/s latency={latency} "
+                    f"req={s['requests']} error={s['errors']} blok={s['blocks']} tunggu={s['waited_seconds']:.0f}s")
+            if s["state"] != "ok":
+                line += f" (sisa {s['backoff_remaining']:.0f}s" + (f", {s['block_reason']})" if s["block_reason"] else ")")
+            print(line)
+
+# Limiter bersama untuk semua scraper di proses ini
+RATE_LIMITER = RateLimiter()
@@ -0,0 +1,139 @@
+"""
+Offline Replay
+Jalankan ulang extract (selector yang sama dengan scraper live) terhadap
+page source HTML yang tersimpan, tanpa WebDriver. Berguna untuk memproses
+ulang arsip halaman setelah selector berubah.
+
+Pemakaian:
+    python3 scrapers/replay.py debug/html_sources/
+    python3 scrapers/replay.py halaman1.html halaman2.html --site tokopedia --output hasil.json
+"""
+
+from static_dom import By, load_page
+from extractors import (
+    TOKOPEDIA_CARD_SELECTORS, GOOGLE_RESULT_SELECTOR, MAPS_CARD_SELECTORS, MAPS_PANEL_SELECTORS,
+    first_card_selector, extract_tokopedia_card, extract_google_result, extract_maps_card,
+    read_place_panel
+)
+from output_writers import write_records
+import os
+import sys
+import time
+import argparse
+
+# Base URL untuk resolve href relatif (browser melakukannya otomatis)
+BASE_URLS = {
+    "tokopedia": "https://www.tokopedia.com/",
+    "google": "https://www.google.com/",
+    "maps": "https://www.google.com/maps/",
+}
+
+def detect_site(page):
+    """Tebak asal halaman dari isi HTML"""
+    source = page.page_source
+    if "tokopedia" in page.title.lower() or "assets.tokopedia.net" in source:
+        return "tokopedia"
+    if "hfpxzc" in source or "DUwDvf" in source:
+        return "maps"
+    if page.find_elements(By.CSS_SELECTOR, GOOGLE_RESULT_SELECTOR):
+        return "google"
+    return None
+
+def _page_url(page):
+    """URL asli halaman dari og:url / canonical (page source tidak menyimpan current_url)"""
+    for selector, attr in (("meta[property='og:url']", "content"), ("link[rel='canonical']", "href")):
+        found = page.find_elements(By.CSS_SELECTOR, selector)
+        if found and found[0].get_attribute(attr):
+            return found[0].get_attribute(attr)
+    return ""
+
+def replay_tokopedia(page):
+    """Product card Tokopedia"""
+    _, cards = first_card_selector(page, TOKOPEDIA_CARD_SELECTORS)
+    records = (extract_tokopedia_card(card, idx) for idx, card in enumerate(cards, 1))
+    return [record for record in records if record]
+
+def replay_google(page):
+    """Hasil pencarian Google"""
+    results = page.find_elements(By.CSS_SELECTOR, GOOGLE_RESULT_SELECTOR)
+    records = (extract_google_result(result, idx) for idx, result in enumerate(results, 1))
+    return [record for record in records if record]
+
+def replay_maps(page):
+    """Panel detail tempat (jika terbuka) atau daftar card hasil pencarian Maps"""
+    if page.find_elements(By.CSS_SELECTOR, MAPS_PANEL_SELECTORS["name"]):
+        page.current_url = page.current_url or _page_url(page)
+        return [read_place_panel(page, 1)]
+
+    _, cards = first_card_selector(page, MAPS_CARD_SELECTORS)
+    records = (extract_maps_card(card, idx) for idx, card in enumerate(cards, 1))
+    return [record for record in records if record]
+
+REPLAYERS = {
+    "tokopedia": replay_tokopedia,
+    "google": replay_google,
+    "maps": replay_maps,
+}
+
+def replay_file(path, site="auto"):
+    """Parse satu file HTML, return (site, records)"""
+    page = load_page(path)
+    if site == "auto":
+        site = detect_site(page)
+    if site not in REPLAYERS:
+        return site, []
+    page.base_url = BASE_URLS[site]
+    return site, REPLAYERS[site](page)
+
+def collect_paths(inputs):
+    """Expand argumen menjadi daftar file .html (folder dibaca isinya)"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if name.endswith((".html", ".htm")):
+                    paths.append(os.path.join(item, name))
+        else:
+            paths.append(item)
+    return paths
+
+def main():
+    """Replay semua file HTML dan tampilkan throughput"""
+    parser = argparse.ArgumentParser(description="Extract ulang page source HTML tersimpan tanpa browser")
+    parser.add_argument("inputs", nargs="+", help="file .html atau folder berisi .html")
+    parser.add_argument("--site", default="auto", choices=["auto"] + list(REPLAYERS),
+                        help="jenis halaman (default: tebak dari isi)")
+    parser.add_argument("--output", help="simpan semua record ke file (.json, .jsonl, .csv, .parquet, + .gz / .zst)")
+    args = parser.parse_args()
+
+    paths = collect_paths(args.inputs)
+    if not paths:
+        print("⚠️  Tidak ada file HTML")
+        return
+
+    start = time.perf_counter()
+    all_records = []
+    for path in paths:
+        try:
+            site, records = replay_file(path, args.site)
+        except ImportError as e:
+            print(f"❌ {str(e)}")
+            sys.exit(1)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  {path}: {str(e)}")
+            continue
+
+        print(f"📄 {path} [{site or '?'}]: {len(records)} record")
+        for record in records:
+            record["source_file"] = path
+        all_records.extend(records)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n⚡ {len(all_records)} record dari {len(paths)} halaman dalam {elapsed * 1000:.1f} ms "
+          f"({len(paths) / elapsed:.0f} halaman/detik)")
+
+    if args.output:
+        write_records(all_records, args.output)
+
+if __name__ == "__main__":
+    main()
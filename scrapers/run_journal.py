@@ -0,0 +1,148 @@
+"""
+Run Journal (JSONL)
+Setiap record ditulis ke journal begitu selesai di-extract, jadi run yang
+crash / dibatalkan bisa dilanjutkan dan hasil akhirnya dibangun dari journal
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from output_writers import write_records
+
+class RunJournal:
+    """Journal append-only satu run scraping
+
+    Format tiap baris:
+        {"type": "meta", "created_at": ..., ...}            (baris pertama)
+        {"type": "record", "link": "...", "record": {...}}
+    """
+
+    def __init__(self, path, meta=None, key=None):
+        """key: fungsi link -> key resume (mis. place_key), supaya URL berbeda
+        untuk item yang sama dianggap sudah selesai; default link apa adanya"""
+        self.path = path
+        self.key = key
+        self.meta = {}
+        self.done_links = set()
+        self.count = 0
+        # Index terbesar di journal, record baru saat resume melanjutkan dari sini
+        self.last_index = 0
+        self._lock = threading.Lock()
+
+        resumed = os.path.exists(path) and os.path.getsize(path) > 0
+        if resumed:
+            self._load()
+
+        self._file = open(path, 'a', encoding='utf-8')
+        if resumed:
+            print(f"♻️  Resume journal {path}: {self.count} record sudah ada")
+        else:
+            self.meta = dict(meta or {}, type="meta", created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            self._write_line(self.meta)
+
+    def _load(self):
+        """Baca journal lama: meta, link yang sudah selesai, jumlah record, index terakhir"""
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                try:
+                    entry = json.loads(raw.decode('utf-8'))
+                except (ValueError, UnicodeDecodeError):
+                    # Baris terakhir bisa terpotong kalau proses mati saat menulis
+                    continue
+                if entry.get("type") == "meta":
+                    self.meta = entry
+                elif entry.get("type") == "record":
+                    self.count += 1
+                    self.last_index = max(self.last_index, (entry.get("record") or {}).get("index") or 0)
+                    if entry.get("link"):
+                        self.done_links.add(self._done_key(entry["link"]))
+
+            # Pastikan record berikutnya mulai di baris baru
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    with open(self.path, 'a', encoding='utf-8') as fix:
+                        fix.write("\n")
+
+    def _write_line(self, entry):
+        """Tulis satu baris lalu flush + fsync supaya aman dari crash"""
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def append(self, record, link=None):
+        """Simpan satu record begitu selesai di-extract"""
+        self._write_line({"type": "record", "link": link, "record": record})
+        with self._lock:
+            self.count += 1
+            self.last_index = max(self.last_index, record.get("index") or 0)
+            if link:
+                self.done_links.add(self._done_key(link))
+
+    def _done_key(self, link):
+        return (self.key(link) if self.key else None) or link
+
+    def is_done(self, link):
+        """Cek apakah link tempat sudah ada di journal"""
+        return self._done_key(link) in self.done_links
+
+    def iter_records(self, sort_by_index=True):
+        """Stream record dari journal
+
+        Jika sort_by_index, hanya (index, offset) yang disimpan di memori,
+        record dibaca ulang satu per satu sesuai urutan index.
+        """
+        with self._lock:
+            self._file.flush()
+
+        with open(self.path, 'rb') as f:
+            if not sort_by_index:
+                for entry in self._iter_entries(f):
+                    yield entry["record"]
+                return
+
+            offsets = []
+            offset = f.tell()
+            for raw in iter(f.readline, b""):
+                try:
+                    entry = json.loads(raw.decode('utf-8'))
+                except (ValueError, UnicodeDecodeError):
+                    entry = None
+                if entry and entry.get("type") == "record":
+                    offsets.append((entry["record"].get("index") or 0, offset))
+                offset = f.tell()
+
+            offsets.sort(key=lambda item: item[0])
+            for _, offset in offsets:
+                f.seek(offset)
+                yield json.loads(f.readline().decode('utf-8'))["record"]
+
+    def _iter_entries(self, f):
+        """Stream entry record (baris rusak dilewati)"""
+        for raw in f:
+            try:
+                entry = json.loads(raw.decode('utf-8'))
+            except (ValueError, UnicodeDecodeError):
+                continue
+            if entry.get("type") == "record":
+                yield entry
+
+    def export(self, filename, fieldnames=None):
+        """Bangun file akhir dari journal secara streaming, format dari ekstensi file"""
+        return write_records(self.iter_records(), filename, fieldnames=fieldnames)
+
+    def export_json(self, filename):
+        """Bangun file JSON akhir dari journal secara streaming"""
+        return self.export(filename)
+
+    def export_csv(self, filename, fieldnames=None):
+        """Bangun file CSV akhir dari journal secara streaming"""
+        return self.export(filename, fieldnames)
+
+    def close(self):
+        """Tutup file journal"""
+        with self._lock:
+            self._file.close()
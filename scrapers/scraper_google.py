@@ -3,33 +3,42 @@ Web Scraper untuk Google Search Results
 Scraping hasil pencarian Google
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-import json
+from selenium.common.exceptions import TimeoutException
+from browser_session import open_session, default_block_profile
+from extractors import GOOGLE_RESULT_SELECTOR, extract_google_result
+from rate_limiter import RATE_LIMITER
+from output_writers import write_records
 from datetime import datetime
 
 class GoogleScraper:
-    def __init__(self, headless=False):
-        """Initialize scraper dengan Chrome driver"""
-        chrome_options = ChromeOptions()
-        
-        if headless:
-            chrome_options.add_argument('--headless')
-        
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-        
-        service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
+    BASE_URL = "https://www.google.com"
+    # Kolom tetap untuk output CSV / Parquet
+    FIELDNAMES = ["index", "title", "link", "description", "scraped_at"]
+    
+    # Opsi Chrome khusus Google Search (juga dipakai BrowserPool batch runner)
+    SESSION_OPTIONS = {
+        "anti_detection": False,
+        "user_agent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    }
+    
+    def __init__(self, headless=False, pool=None, block_resources=None, base_url=BASE_URL):
+        """Initialize scraper dengan Chrome driver (atau pinjam dari BrowserPool)
+
+        base_url: homepage Google (diganti ke fixture server saat benchmark)
+        """
+        self.headless = headless
+        self.base_url = base_url
+        self.pool = pool
+        self.session = open_session(
+            headless, pool=pool,
+            block_profile=default_block_profile("google", headless, block_resources),
+            **self.SESSION_OPTIONS
+        )
+        self.driver = self.session.driver
         self.wait = WebDriverWait(self.driver, 10)
     
     def search(self, query, max_results=10):
@@ -38,8 +47,7 @@ class GoogleScraper:
         
         try:
             # Buka Google
-            self.driver.get("https://www.google.com")
-            time.sleep(2)
+            self.driver.get(self.base_url)
             
             # Cari search box
             search_box = self.wait.until(
@@ -50,11 +58,11 @@ class GoogleScraper:
             search_box.send_keys(Keys.RETURN)
             
             print("⏳ Menunggu hasil...")
-            time.sleep(3)
+            self._wait_for_results()
             
             # Ambil hasil pencarian
             results = []
-            search_results = self.driver.find_elements(By.CSS_SELECTOR, "div.g")
+            search_results = self.driver.find_elements(By.CSS_SELECTOR, GOOGLE_RESULT_SELECTOR)
             
             print(f"📄 Menemukan {len(search_results)} hasil")
             
@@ -73,43 +81,33 @@ class GoogleScraper:
             print(f"❌ Error: {str(e)}")
             return []
     
-    def _extract_result_data(self, result, index):
-        """Extract data dari search result"""
+    def _wait_for_results(self, timeout=10):
+        """Tunggu hasil pencarian muncul; BlockedError langsung jika halaman blokir / consent"""
+        def results_ready(driver):
+            self.session.check_block()
+            return driver.find_elements(By.CSS_SELECTOR, GOOGLE_RESULT_SELECTOR)
+        
         try:
-            # Title
-            title_elem = result.find_element(By.CSS_SELECTOR, "h3")
-            title = title_elem.text
-            
-            # Link
-            link_elem = result.find_element(By.CSS_SELECTOR, "a")
-            link = link_elem.get_attribute("href")
-            
-            # Description
-            try:
-                desc = result.find_element(By.CSS_SELECTOR, "div[data-sncf='1']").text
-            except:
-                desc = "N/A"
-            
-            return {
-                "index": index,
-                "title": title,
-                "link": link,
-                "description": desc,
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-        except:
-            return None
+            WebDriverWait(self.driver, timeout, poll_frequency=0.5).until(results_ready)
+        except TimeoutException:
+            print("⚠️  Hasil pencarian belum muncul setelah menunggu")
+    
+    def _extract_result_data(self, result, index):
+        """Extract data dari search result (logika di extractors, dipakai juga oleh replay)"""
+        return extract_google_result(result, index)
+    
+    def save(self, data, filename):
+        """Simpan data, format dari ekstensi (.json, .jsonl, .csv, .parquet, + .gz / .zst)"""
+        return write_records(data, filename, fieldnames=self.FIELDNAMES)
     
     def save_to_json(self, data, filename):
         """Simpan data ke JSON"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"💾 Data disimpan ke {filename}")
+        return self.save(data, filename)
     
     def close(self):
-        """Tutup browser"""
-        self.driver.quit()
-        print("🔒 Browser ditutup")
+        """Tutup browser (atau kembalikan ke pool)"""
+        self.session.close()
+        print("🔁 Browser dikembalikan ke pool" if self.pool else "🔒 Browser ditutup")
 
 def main():
     print("=" * 60)
@@ -141,6 +139,7 @@ def main():
             print(f"📁 File tersimpan: {filename}")
         else:
             print("\n⚠️  Tidak ada hasil yang berhasil di-scrape")
+        RATE_LIMITER.print_stats()
     
     except KeyboardInterrupt:
         print("\n\n⏸️  Scraping dibatalkan")
@@ -3,58 +3,222 @@ Google Maps Scraper - Kabupaten Cirebon
 Scraping data pengusaha/bisnis di Kabupaten Cirebon, Jawa Barat
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 import time
-import json
-import csv
 from datetime import datetime
-import random
+import os
+import queue
+import threading
+from maps_tiles import (
+    CIREBON_BBOX, MAPS_RESULT_CAP, MAPS_BASE_URL, make_grid, split_tile, tile_search_url, in_bbox
+)
+from maps_urls import coords_from_place_url, parse_place_url, place_key
+from browser_session import open_session, default_block_profile
+from maps_network import MapsNetworkCapture
+from run_journal import RunJournal
+from extractors import MAPS_CARD_CHAIN, MAPS_PANEL_CHAINS, first_card_selector, get_text_safe, read_place_panel
+from selector_chain import SelectorChain, SELECTOR_STATS
+from place_cache import PlaceCache
+from rate_limiter import RATE_LIMITER, BlockedError
+from scroll_harvester import ScrollHarvester
+from output_writers import check_writer, parse_format, write_records
+
+# Perkiraan RAM per instance Chrome (MB), dipakai untuk membatasi jumlah worker
+CHROME_MEMORY_MB = 600
+
+def recommended_workers(per_browser_mb=CHROME_MEMORY_MB):
+    """Hitung jumlah worker Chrome yang aman berdasarkan jumlah core dan RAM"""
+    cpu_count = os.cpu_count() or 1
+    try:
+        total_mb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+        # Sisakan setengah RAM untuk sistem dan driver utama
+        by_ram = total_mb // 2 // per_browser_mb
+    except (ValueError, OSError, AttributeError):
+        by_ram = cpu_count
+    return max(1, min(cpu_count, by_ram))
+
+# Satu kali execute_script untuk membaca seluruh panel detail tempat.
+# arguments[0]: selector fallback per field dari MAPS_PANEL_CHAINS (urutan yang
+# dipelajari), selector yang cocok dikembalikan di "hits" untuk statistik chain.
+PLACE_PANEL_JS = """
+const chains = arguments[0];
+const hits = {};
+const text = (sel) => {
+    const el = document.querySelector(sel);
+    return el ? (el.innerText || '').trim() : '';
+};
+const firstMatch = (field, pick) => {
+    for (const sel of chains[field]) {
+        const el = document.querySelector(sel);
+        if (!el) continue;
+        const value = pick(el);
+        if (value) {
+            hits[field] = sel;
+            return value;
+        }
+    }
+    return 'N/A';
+};
+const hours = document.querySelector("button[aria-label*='Hours']");
+return {
+    name: text('h1.DUwDvf') || 'N/A',
+    category: text('button.DkEaL') || 'N/A',
+    rating: firstMatch('rating', (el) => {
+        const t = (el.innerText || '').trim();
+        return /\\d/.test(t) ? t.split(/\\s+/)[0] : '';
+    }),
+    total_reviews: firstMatch('total_reviews', (el) => {
+        const m = (el.innerText || '').match(/\\(([^)]*)\\)/);
+        return m ? m[1] : '';
+    }),
+    address: firstMatch('address', (el) => (el.innerText || '').trim()),
+    phone: firstMatch('phone', (el) => (el.innerText || '').trim() || (el.getAttribute('href') || '').replace('tel:', '')),
+    website: firstMatch('website', (el) => (el.href && el.href.includes('http')) ? el.href : (el.innerText || '').trim()),
+    hours: hours ? (hours.getAttribute('aria-label') || 'N/A') : 'N/A',
+    url: window.location.href,
+    hits: hits
+};
+"""
+
+# Panel hasil pencarian yang bisa di-scroll
+# div.m6QErb juga dipakai panel scroll lain, jadi hanya feed yang primary
+RESULTS_PANEL_CHAIN = SelectorChain("maps.results_panel", [
+    "div[role='feed']",
+    "div.m6QErb",
+    "div[aria-label*='Results']"
+], primary=1)
+
+# Link card unik di feed + deteksi penanda "akhir daftar" dalam satu round trip
+FEED_STATE_JS = """
+const links = [];
+const seen = new Set();
+for (const a of document.querySelectorAll('a.hfpxzc')) {
+    if (a.href && !seen.has(a.href)) {
+        seen.add(a.href);
+        links.push(a.href);
+    }
+}
+const feed = document.querySelector("div[role='feed']");
+const tail = feed && feed.lastElementChild ? (feed.lastElementChild.innerText || '') : '';
+const end = !!document.querySelector('span.HlvSq') ||
+    /reached the end of the list|akhir daftar/i.test(tail);
+return {links: links, end: end};
+"""
 
 class GoogleMapsScraper:
-    def __init__(self, headless=False):
-        """Initialize scraper dengan Chrome driver"""
-        chrome_options = ChromeOptions()
-        
-        if headless:
-            chrome_options.add_argument('--headless')
-        
-        # Anti-detection settings
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        chrome_options.add_argument('--lang=id-ID')
-        
-        service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
+    # Opsi Chrome khusus Maps (juga dipakai BrowserPool batch runner)
+    SESSION_OPTIONS = {"lang": "id-ID"}
+    # Kolom tetap untuk output CSV / Parquet
+    FIELDNAMES = ["index", "name", "category", "rating", "total_reviews", "address",
+                  "phone", "website", "hours", "coordinates", "scraped_at"]
+    
+    # Timeout (detik) untuk setiap jenis wait
+    WAIT_TIMEOUTS = {
+        "feed": 15,          # feed hasil pencarian (atau panel tempat tunggal) muncul
+        "scroll": 4,         # feed memuat card baru setelah scroll
+        "place_name": 8,     # h1.DUwDvf berganti ke nama tempat baru
+        "place_coords": 8,   # current_url berisi koordinat tempat baru
+    }
+    
+    def __init__(self, headless=False, extraction="js", pool=None, block_resources=None, engine="dom",
+                 place_cache=None, base_url=MAPS_BASE_URL):
+        """Initialize scraper dengan Chrome driver
+
+        extraction: "js" (satu execute_script per tempat, fallback ke per-field)
+        atau "fields" (method _get_* per field seperti sebelumnya)
+        pool: BrowserPool opsional, browser dipinjam dari pool (dan worker
+        paralel ikut meminjam dari pool yang sama)
+        block_resources: blokir tile peta, gambar, font dan tracker via CDP
+        (default: aktif saat headless)
+        engine: "dom" (baca panel/feed) atau "network" (parse payload XHR
+        search/place dari performance log, lihat search_businesses_network)
+        place_cache: PlaceCache opsional, tempat yang masih segar di cache
+        tidak dibuka ulang (dilewati atau diambil dari cache)
+        base_url: root URL Maps (diganti ke fixture server saat benchmark)
+        """
+        self.headless = headless
+        self.base_url = base_url.rstrip('/')
+        self.engine = engine
+        self.extraction = extraction
+        self.pool = pool
+        
+        self.block_resources = block_resources
+        self.session = open_session(
+            headless, pool=pool,
+            block_profile=default_block_profile("maps", headless, block_resources),
+            network_logging=(engine == "network"),
+            **self.SESSION_OPTIONS
+        )
+        self.driver = self.session.driver
         self.wait = WebDriverWait(self.driver, 15)
+        self.wait_stats = {}
+        self._stats_lock = threading.Lock()
+        
+        # Jumlah WebDriver command per record (counter ada di session)
+        self.record_command_counts = []
+        
+        # RunJournal aktif (diset lewat parameter journal di method search_*)
+        self.journal = None
+        self.place_cache = place_cache
         
         print("✅ Browser initialized")
     
-    def search_businesses(self, query, location="Kabupaten Cirebon, Jawa Barat", max_results=50):
-        """Scraping bisnis dari Google Maps"""
+    def _search_url(self, search_query):
+        """URL halaman hasil pencarian Maps"""
+        return f"{self.base_url}/search/{search_query.replace(' ', '+')}"
+    
+    def _worker_pool(self):
+        """Pool untuk worker paralel (None jika pool tidak cukup besar untuk dibagi)"""
+        return self.pool if self.pool and self.pool.size > 1 else None
+    
+    def _cap_workers(self, workers):
+        """Batasi worker supaya tidak menunggu browser pool yang sedang dipakai driver utama"""
+        if self._worker_pool():
+            return max(1, min(workers, self.pool.size - 1))
+        return workers
+    
+    def _recycle_session(self):
+        """Ganti browser pinjaman pool yang sudah melewati max_pages (dipanggil antar record)"""
+        if not self.pool:
+            return
+        session = self.pool.maybe_recycle(self.session)
+        if session is not self.session:
+            self.session = session
+            self.driver = session.driver
+            self.wait = WebDriverWait(self.driver, 15)
+    
+    @property
+    def command_count(self):
+        """Total WebDriver command yang sudah dikirim browser ini"""
+        return self.session.command_count
+    
+    def search_businesses(self, query, location="Kabupaten Cirebon, Jawa Barat", max_results=50, navigation="click",
+                          journal=None):
+        """Scraping bisnis dari Google Maps
+
+        navigation: "click" (klik card di feed) atau "direct" (kumpulkan href
+        semua card dulu, lalu buka setiap URL tempat secara langsung)
+        journal: RunJournal opsional, setiap record langsung ditulis ke
+        journal dan tempat yang sudah ada di journal dilewati (resume;
+        buat dengan RunJournal(path, key=place_key) supaya URL lain untuk
+        tempat yang sama juga dikenali)
+        """
+        self.journal = journal
         print(f"🔍 Mencari: {query}")
         print(f"📍 Lokasi: {location}")
         
         try:
             # Buka Google Maps
             search_query = f"{query} {location}"
-            url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
+            url = self._search_url(search_query)
             
             self.driver.get(url)
             print("⏳ Menunggu hasil pencarian...")
-            time.sleep(8)
+            self._wait_for_feed()
             
             # Screenshot untuk debugging
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -63,11 +227,15 @@ class GoogleMapsScraper:
             
             # Scroll untuk load lebih banyak hasil
             print("📜 Scrolling untuk load lebih banyak hasil...")
-            self._scroll_results_panel(max_results)
+            harvested_links = self._scroll_results_panel(max_results)
             
             # Ambil semua business cards
             businesses = []
-            business_elements = self._get_business_elements()
+            if navigation == "direct":
+                # Cukup href-nya saja, tidak ada WebElement yang bisa stale
+                business_elements = harvested_links or self._get_place_links()
+            else:
+                business_elements = self._get_business_elements()
             
             print(f"📦 Menemukan {len(business_elements)} bisnis")
             
@@ -78,16 +246,36 @@ class GoogleMapsScraper:
             # Extract data dari setiap bisnis
             for idx, element in enumerate(business_elements[:max_results], 1):
                 try:
+                    link = element if navigation == "direct" else self._card_link(element)
+                    if self._is_done(link):
+                        print(f"⏭️  [{idx}] Sudah ada di journal, skip")
+                        continue
+                    
+                    cached = self._check_cache(link, idx)
+                    if cached:
+                        if self._serve_cached():
+                            businesses.append(cached)
+                        self._store_record(cached, link, from_cache=True)
+                        print(f"🗄️  [{idx}] {cached['name']} (cache)")
+                        continue
+                    
                     print(f"⏳ Scraping bisnis {idx}/{min(len(business_elements), max_results)}...")
-                    business_data = self._extract_business_data(element, idx)
+                    if navigation == "direct":
+                        # Feed tidak dipakai lagi, browser aman di-recycle antar tempat
+                        self._recycle_session()
+                        business_data = self._scrape_place_url(element, idx)
+                    else:
+                        business_data = self._extract_business_data(element, idx)
                     
                     if business_data:
                         businesses.append(business_data)
+                        self._store_record(business_data, link)
                         print(f"✅ [{idx}] {business_data['name']}")
-                        
-                        # Random delay untuk menghindari deteksi bot
-                        time.sleep(random.uniform(0.5, 1.5))
                     
+                except BlockedError as e:
+                    # Fail fast: sisa bisnis tidak dicoba selama domain diblokir
+                    print(f"🛑 {str(e)}, scraping dihentikan")
+                    break
                 except Exception as e:
                     print(f"⚠️  Error pada bisnis {idx}: {str(e)}")
                     continue
@@ -100,268 +288,742 @@ class GoogleMapsScraper:
             self.driver.save_screenshot(f"gmaps_error_{timestamp}.png")
             return []
     
-    def _scroll_results_panel(self, target_results=50):
-        """Scroll panel hasil untuk load lebih banyak bisnis"""
-        # Cari panel hasil
+    def search_businesses_parallel(self, query, location="Kabupaten Cirebon, Jawa Barat", max_results=50, workers=None,
+                                   journal=None):
+        """Scraping bisnis dengan pool worker Chrome paralel (pipeline)
+
+        Driver utama scroll feed dan langsung mengirim link tempat baru ke
+        antrian, sementara N worker driver membuka halaman detail secara
+        bersamaan. Hasil dikumpulkan oleh satu writer (thread utama) dan
+        diurutkan berdasarkan index asli.
+        """
+        self.journal = journal
+        print(f"🔍 Mencari: {query}")
+        print(f"📍 Lokasi: {location}")
+        
         try:
-            # Berbagai selector untuk panel hasil
-            panel_selectors = [
-                "div[role='feed']",
-                "div.m6QErb",
-                "div[aria-label*='Results']"
-            ]
+            search_query = f"{query} {location}"
+            url = self._search_url(search_query)
             
-            scrollable_div = None
-            for selector in panel_selectors:
-                try:
-                    scrollable_div = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if scrollable_div:
-                        break
-                except:
-                    continue
+            self.driver.get(url)
+            print("⏳ Menunggu hasil pencarian...")
+            self._wait_for_feed()
             
-            if not scrollable_div:
-                print("⚠️  Panel hasil tidak ditemukan, skip scrolling")
-                return
+            workers = self._cap_workers(min(workers or recommended_workers(), max_results))
+            print(f"⚡ Pipeline: scroll + {workers} worker paralel")
             
-            # Scroll beberapa kali
-            scroll_count = max(5, target_results // 10)
-            for i in range(scroll_count):
-                # Scroll ke bawah
-                self.driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight", 
-                    scrollable_div
-                )
-                time.sleep(2)
-                
-                # Cek apakah sudah sampai bawah
-                current_height = self.driver.execute_script(
-                    "return arguments[0].scrollTop", scrollable_div
-                )
-                max_height = self.driver.execute_script(
-                    "return arguments[0].scrollHeight", scrollable_div
-                )
+            task_queue = queue.Queue()
+            result_queue = queue.Queue()
+            harvest = {"queued": 0, "finished": False}
+            producer = threading.Thread(
+                target=self._produce_place_links,
+                args=(task_queue, result_queue, harvest, max_results, workers),
+                daemon=True
+            )
+            producer.start()
+            
+            businesses = self._run_place_workers(task_queue, result_queue, harvest, workers, [producer])
+            if harvest["queued"] == 0:
+                print("⚠️  Tidak ada bisnis ditemukan.")
+            return businesses
+            
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.driver.save_screenshot(f"gmaps_error_{timestamp}.png")
+            return []
+    
+    def search_businesses_network(self, query, location="Kabupaten Cirebon, Jawa Barat", max_results=50,
+                                  save_payloads_dir=None, journal=None):
+        """Scraping bisnis dari payload XHR Google Maps (engine network)
+
+        Hasil halaman pertama dibaca dari APP_INITIALIZATION_STATE, lalu
+        setiap scroll feed memicu XHR /search?tbm=map berikutnya yang
+        ditangkap dan di-parse langsung tanpa membuka panel detail.
+        Setiap tempat baru langsung ditulis ke journal begitu payload-nya
+        di-parse (key = place id); saat resume tempat yang sudah ada di
+        journal dilewati dan index melanjutkan index terakhir journal.
+        """
+        self.journal = journal
+        print(f"🔍 Mencari: {query}")
+        print(f"📍 Lokasi: {location}")
+        print("📡 Engine: network capture")
+        
+        try:
+            capture = MapsNetworkCapture(self.session, save_dir=save_payloads_dir)
+            search_query = f"{query} {location}"
+            url = self._search_url(search_query)
+            
+            self.driver.get(url)
+            print("⏳ Menunggu hasil pencarian...")
+            self._wait_for_feed()
+            stored = {"seen": set(), "index": journal.last_index if journal else 0}
+            capture.feed_initial_state()
+            capture.poll()
+            businesses = self._store_network_places(capture, stored, max_results)
+            
+            scrollable_div = self._find_results_panel()
+            stalled = 0
+            while len(capture.places) < max_results and scrollable_div:
+                if self._feed_state()["end"]:
+                    break
+                grown = self._scroll_feed_once(scrollable_div)
+                new_count = capture.poll()
+                businesses.extend(self._store_network_places(capture, stored, max_results))
+                print(f"   📡 {len(capture.places)} tempat dari {capture.payload_count} payload")
+                stalled = 0 if (grown or new_count) else stalled + 1
+                if stalled >= 2:
+                    break
+            
+            print(f"📦 {len(businesses)} bisnis dari {capture.payload_count} payload")
+            return businesses
+            
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.driver.save_screenshot(f"gmaps_error_{timestamp}.png")
+            return []
+    
+    def _store_network_places(self, capture, stored, max_results):
+        """Tulis tempat yang baru muncul di capture ke journal, return record baru
+
+        stored["seen"] = identity yang sudah diproses, stored["index"] = index
+        terakhir yang dipakai. Identity (place id) jadi key journal untuk resume.
+        """
+        businesses = []
+        for identity, record in list(capture.places.items())[:max_results]:
+            if identity in stored["seen"]:
+                continue
+            stored["seen"].add(identity)
+            if self._is_done(identity):
+                continue
+            stored["index"] += 1
+            business_data = dict(record, index=stored["index"])
+            businesses.append(business_data)
+            if self.journal:
+                self.journal.append(business_data, identity)
+        return businesses
+    
+    def _produce_place_links(self, task_queue, result_queue, harvest, max_results, workers):
+        """Producer: scroll feed dan stream link tempat baru (unik) ke antrian
+
+        Berhenti begitu max_results tempat unik sudah diantrikan, penanda
+        akhir daftar muncul, atau feed tidak bertambah lagi.
+        """
+        seen = set()
+        try:
+            scrollable_div = self._find_results_panel()
+            stalled = 0
+            while True:
+                state = self._feed_state()
+                for link in state["links"]:
+                    if link in seen:
+                        continue
+                    seen.add(link)
+                    # Index = posisi di feed; link yang sudah ada di journal tidak diantrikan
+                    if not self._is_done(link):
+                        self._dispatch_link(len(seen), link, task_queue, result_queue, harvest)
+                    if len(seen) >= max_results:
+                        break
                 
-                print(f"   Scroll {i+1}/{scroll_count}...")
+                if len(seen) >= max_results:
+                    print(f"   📥 {harvest['queued']} tempat diantrikan, target tercapai")
+                    break
+                if state["end"]:
+                    print(f"   📥 {harvest['queued']} tempat diantrikan, akhir daftar")
+                    break
+                if not scrollable_div:
+                    print("⚠️  Panel hasil tidak ditemukan, skip scrolling")
+                    break
                 
-                if current_height >= max_height - 100:
-                    print("   Sudah sampai bawah")
+                stalled = 0 if self._scroll_feed_once(scrollable_div) else stalled + 1
+                if stalled >= 2:
+                    print(f"   📥 {harvest['queued']} tempat diantrikan, feed tidak bertambah")
                     break
-                    
         except Exception as e:
             print(f"⚠️  Error saat scrolling: {str(e)}")
+        finally:
+            harvest["finished"] = True
+            for _ in range(workers):
+                task_queue.put(None)
     
-    def _get_business_elements(self):
-        """Ambil semua element bisnis"""
-        business_elements = []
+    def search_businesses_tiled(self, query, bbox=CIREBON_BBOX, grid=(4, 4), max_results=None,
+                                workers=None, result_cap=MAPS_RESULT_CAP, max_depth=3, journal=None):
+        """Scraping bisnis dengan membagi wilayah menjadi grid tile viewport
+
+        Setiap tile dicari dengan URL @lat,lng,zoom oleh worker harvester.
+        Tile yang hasilnya kena batas Google (result_cap) dipecah menjadi 4
+        sub-tile secara rekursif. Link digabung berdasarkan identitas tempat,
+        lalu detail diambil dengan pool worker yang sama dengan mode paralel.
+        """
+        self.journal = journal
+        tiles = make_grid(bbox, *grid)
+        workers = self._cap_workers(workers or recommended_workers())
+        print(f"🔍 Mencari: {query}")
+        print(f"🧩 Mode tile: {len(tiles)} tile awal, {workers} worker, batas {result_cap} hasil/tile")
+        
+        tile_queue = queue.Queue()
+        for tile in tiles:
+            tile_queue.put(tile)
         
-        # Berbagai selector untuk business cards
-        selectors = [
-            "div.Nv2PK",
-            "a.hfpxzc",
-            "div[role='article']",
-            "div.lI9IFe"
-        ]
+        # place_key -> link, urutan insert = urutan index
+        places = {}
+        places_lock = threading.Lock()
+        tile_stats = {"searched": 0, "split": 0}
         
-        for selector in selectors:
+        threads = []
+        for worker_id in range(1, workers + 1):
+            thread = threading.Thread(
+                target=self._tile_worker,
+                args=(worker_id, query, bbox, tile_queue, places, places_lock,
+                      tile_stats, result_cap, max_depth),
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        
+        # Tunggu semua tile (termasuk sub-tile hasil pecahan) selesai
+        while tile_queue.unfinished_tasks > 0:
+            if not any(thread.is_alive() for thread in threads):
+                print("⚠️  Semua worker berhenti sebelum semua tile selesai")
+                break
+            time.sleep(0.5)
+        for _ in threads:
+            tile_queue.put(None)
+        for thread in threads:
+            thread.join()
+        
+        links = list(places.values())
+        print(f"🧩 {tile_stats['searched']} tile dicari, {tile_stats['split']} tile dipecah, "
+              f"{len(links)} tempat unik")
+        
+        if max_results:
+            links = links[:max_results]
+        if not links:
+            print("⚠️  Tidak ada bisnis ditemukan.")
+            return []
+        
+        return self._scrape_links_parallel(links, workers)
+    
+    def _tile_worker(self, worker_id, query, bbox, tile_queue, places, places_lock,
+                     tile_stats, result_cap, max_depth):
+        """Worker harvester: cari tile dari antrian sampai dapat sentinel None"""
+        try:
+            harvester = GoogleMapsScraper(headless=self.headless, extraction=self.extraction,
+                                       pool=self._worker_pool(), block_resources=self.block_resources,
+                                       base_url=self.base_url)
+        except Exception as e:
+            print(f"❌ Worker {worker_id} gagal start browser: {str(e)}")
+            return
+        
+        try:
+            while True:
+                tile = tile_queue.get()
+                if tile is None:
+                    tile_queue.task_done()
+                    break
+                
+                try:
+                    harvester._recycle_session()
+                    links = harvester._harvest_tile(query, tile, result_cap)
+                    capped = len(links) >= result_cap and tile.depth < max_depth
+                    
+                    with places_lock:
+                        tile_stats["searched"] += 1
+                        new_count = 0
+                        for link in links:
+                            coords = coords_from_place_url(link)
+                            if coords and not in_bbox(coords, bbox):
+                                continue
+                            key = place_key(link)
+                            if key not in places:
+                                places[key] = link
+                                new_count += 1
+                        if capped:
+                            tile_stats["split"] += 1
+                    
+                    if capped:
+                        for child in split_tile(tile):
+                            tile_queue.put(child)
+                    
+                    print(f"   🧩 Worker {worker_id}: tile depth {tile.depth} -> {len(links)} hasil, "
+                          f"{new_count} baru{' (dipecah)' if capped else ''}")
+                except Exception as e:
+                    print(f"⚠️  Worker {worker_id} error pada tile: {str(e)}")
+                finally:
+                    tile_queue.task_done()
+        finally:
+            self._merge_wait_stats(harvester.wait_stats)
+            harvester.close()
+    
+    def _harvest_tile(self, query, tile, result_cap):
+        """Buka pencarian untuk satu tile, scroll sampai habis, ambil link tempat"""
+        self.driver.get(tile_search_url(query, tile, self.base_url))
+        self._wait_for_feed()
+        return self._scroll_results_panel(result_cap) or self._get_place_links()
+    
+    def _scrape_links_parallel(self, links, workers=None):
+        """Bagi daftar link tempat yang sudah lengkap ke beberapa worker driver"""
+        workers = self._cap_workers(min(workers or recommended_workers(), len(links)))
+        print(f"⚡ Menjalankan {workers} worker paralel untuk {len(links)} bisnis")
+        
+        task_queue = queue.Queue()
+        result_queue = queue.Queue()
+        harvest = {"queued": 0, "finished": False}
+        for idx, link in enumerate(links, 1):
+            if not self._is_done(link):
+                self._dispatch_link(idx, link, task_queue, result_queue, harvest)
+        for _ in range(workers):
+            task_queue.put(None)
+        
+        harvest["finished"] = True
+        return self._run_place_workers(task_queue, result_queue, harvest, workers)
+    
+    def _dispatch_link(self, idx, link, task_queue, result_queue, harvest):
+        """Kirim link ke worker, atau langsung ke writer jika cache masih segar"""
+        cached = self._check_cache(link, idx)
+        if cached:
+            harvest["queued"] += 1
+            result_queue.put((idx, link, cached, True))
+            return
+        harvest["queued"] += 1
+        task_queue.put((idx, link))
+    
+    def _run_place_workers(self, task_queue, result_queue, harvest, workers, extra_threads=()):
+        """Jalankan worker detail dan kumpulkan hasil di satu writer
+
+        harvest["queued"] boleh terus bertambah selama harvest["finished"]
+        masih False (mode pipeline).
+        """
+        threads = list(extra_threads)
+        for worker_id in range(1, workers + 1):
+            thread = threading.Thread(
+                target=self._place_worker,
+                args=(worker_id, task_queue, result_queue),
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        
+        # Single writer: hanya thread ini yang menyentuh list hasil
+        businesses = []
+        done = 0
+        while not harvest["finished"] or done < harvest["queued"]:
             try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    print(f"✅ Business elements ditemukan dengan selector: {selector}")
-                    business_elements = elements
+                idx, link, business_data, from_cache = result_queue.get(timeout=1)
+            except queue.Empty:
+                if not any(thread.is_alive() for thread in threads):
+                    print("⚠️  Semua worker berhenti sebelum semua bisnis selesai")
                     break
-            except:
                 continue
+            
+            done += 1
+            if business_data:
+                if not from_cache or self._serve_cached():
+                    businesses.append(business_data)
+                self._store_record(business_data, link, from_cache)
+                source = "🗄️ " if from_cache else "✅"
+                print(f"{source} [{idx}] {business_data['name']} ({done}/{harvest['queued']})")
+            else:
+                print(f"⚠️  Gagal scraping bisnis {idx} ({done}/{harvest['queued']})")
+        
+        for thread in threads:
+            thread.join()
+        
+        businesses.sort(key=lambda b: b['index'])
+        return businesses
+    
+    def _place_worker(self, worker_id, task_queue, result_queue):
+        """Worker: buka driver sendiri dan proses link sampai dapat sentinel None"""
+        try:
+            worker = GoogleMapsScraper(headless=self.headless, extraction=self.extraction,
+                                       pool=self._worker_pool(), block_resources=self.block_resources,
+                                       base_url=self.base_url)
+        except Exception as e:
+            print(f"❌ Worker {worker_id} gagal start browser: {str(e)}")
+            return
+        
+        try:
+            while True:
+                task = task_queue.get()
+                if task is None:
+                    break
+                idx, link = task
+                
+                try:
+                    worker._recycle_session()
+                    business_data = worker._scrape_place_url(link, idx)
+                except Exception as e:
+                    print(f"⚠️  Worker {worker_id} error pada bisnis {idx}: {str(e)}")
+                    business_data = None
+                result_queue.put((idx, link, business_data, False))
+        finally:
+            self._merge_wait_stats(worker.wait_stats)
+            with self._stats_lock:
+                self.record_command_counts.extend(worker.record_command_counts)
+            worker.close()
+    
+    def _scrape_place_url(self, link, index, retries=1):
+        """Buka halaman detail tempat langsung dari URL lalu extract datanya
+
+        Nama dan koordinat diambil dari URL itu sendiri, jadi tidak perlu
+        query DOM tambahan. Setiap record bisa di-retry sendiri.
+        """
+        place = parse_place_url(link) or {}
+        coordinates = f"{place['lat']},{place['lng']}" if place.get("lat") else None
+        
+        for attempt in range(retries + 1):
+            commands_before = self.command_count
+            try:
+                self.driver.get(link)
+                self._wait_for_place_name(place.get("name"))
+                data = self._read_place_panel(index, coordinates)
+            except BlockedError:
+                raise
+            except Exception as e:
+                print(f"   Error extracting: {str(e)}")
+                data = None
+            finally:
+                self.record_command_counts.append(self.command_count - commands_before)
+            
+            if data:
+                return data
+            if attempt < retries:
+                print(f"   🔁 Retry bisnis {index} ({attempt + 1}/{retries})")
+        return None
+    
+    def _get_place_links(self):
+        """Ambil href unik dari semua card hasil (a.hfpxzc), urutan dipertahankan"""
+        return self._feed_state()["links"]
+    
+    def _feed_state(self):
+        """Satu execute_script: link card unik + apakah penanda akhir daftar sudah muncul"""
+        state = self.driver.execute_script(FEED_STATE_JS)
+        return state or {"links": [], "end": False}
+    
+    def _find_results_panel(self):
+        """Cari element panel hasil yang bisa di-scroll"""
+        _, panels = RESULTS_PANEL_CHAIN.find_all(self.driver)
+        return panels[0] if panels else None
+    
+    def _scroll_feed_once(self, scrollable_div):
+        """Scroll panel sekali, return True jika feed memuat card baru"""
+        previous_height = self.driver.execute_script(
+            "return arguments[0].scrollHeight", scrollable_div
+        )
+        
+        # Scroll ke bawah
+        self.driver.execute_script(
+            "arguments[0].scrollTop = arguments[0].scrollHeight", 
+            scrollable_div
+        )
         
+        # Tunggu sampai feed memuat card baru (tinggi panel bertambah)
+        grown = self._wait_until(
+            "scroll",
+            lambda driver: driver.execute_script(
+                "return arguments[0].scrollHeight", scrollable_div
+            ) > previous_height
+        )
+        return bool(grown)
+    
+    def _scroll_results_panel(self, target_results=50):
+        """Scroll panel hasil sampai target_results card termuat atau akhir daftar
+
+        Link card dikumpulkan MutationObserver saat dirender, jadi card yang
+        sudah dibuang feed (list virtual) tetap terhitung. Return link unik
+        sesuai urutan feed, atau [] jika gagal (pemanggil fallback ke DOM).
+        """
+        try:
+            scrollable_div = self._find_results_panel()
+            if not scrollable_div:
+                print("⚠️  Panel hasil tidak ditemukan, skip scrolling")
+                return []
+            
+            harvester = ScrollHarvester(
+                self.driver,
+                item_selector="a.hfpxzc",
+                key="href",
+                container=scrollable_div,
+                end_selector="span.HlvSq",
+                end_text=r"reached the end of the list|akhir daftar",
+                target=target_results,
+                idle_timeout=self.WAIT_TIMEOUTS["scroll"],
+            )
+            start = time.perf_counter()
+            harvester.harvest()
+            links = harvester.keys()
+            print(f"   {len(links)} card dari {harvester.polls} scroll ({harvester.stop_reason}, "
+                  f"{time.perf_counter() - start:.1f}s)")
+            return links
+                    
+        except Exception as e:
+            print(f"⚠️  Error saat scrolling: {str(e)}")
+            return []
+    
+    def _get_business_elements(self):
+        """Ambil semua element bisnis"""
+        selector, business_elements = first_card_selector(self.driver, MAPS_CARD_CHAIN)
+        if business_elements:
+            print(f"✅ Business elements ditemukan dengan selector: {selector}")
         return business_elements
     
     def _extract_business_data(self, element, index):
         """Extract data dari business element"""
+        commands_before = self.command_count
         try:
+            expected_name, expected_coords = self._card_identity(element)
+            previous_name = self._get_text_safe("h1.DUwDvf", None)
+            previous_url = self.driver.current_url
+            
+            # Klik membuka panel lewat XHR (tanpa driver.get), jadi ambil token rate limiter manual
+            self.session.throttle()
+            
             # Klik element untuk buka detail
             try:
                 element.click()
-                time.sleep(3)
             except:
                 # Jika tidak bisa klik, coba scroll ke element
                 self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                time.sleep(1)
                 element.click()
-                time.sleep(3)
             
-            # Ambil data dari panel detail
-            data = {
-                "index": index,
-                "name": self._get_text_safe("h1.DUwDvf", "N/A"),
-                "category": self._get_text_safe("button.DkEaL", "N/A"),
-                "rating": self._get_rating(),
-                "total_reviews": self._get_total_reviews(),
-                "address": self._get_address(),
-                "phone": self._get_phone(),
-                "website": self._get_website(),
-                "hours": self._get_hours(),
-                "coordinates": self._get_coordinates(),
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+            # Tunggu panel detail benar-benar berganti ke tempat yang diklik
+            self._wait_for_place_name(expected_name, previous_name)
+            self._wait_for_place_coords(expected_coords, previous_url)
             
-            return data
+            return self._read_place_panel(index)
             
+        except BlockedError:
+            raise
         except Exception as e:
             print(f"   Error extracting: {str(e)}")
             return None
+        finally:
+            self.record_command_counts.append(self.command_count - commands_before)
     
-    def _get_text_safe(self, selector, default="N/A"):
-        """Safely get text from element"""
+    def _read_place_panel(self, index, coordinates=None):
+        """Baca data dari panel detail yang sedang terbuka
+
+        coordinates: "lat,lng" yang sudah diketahui (mis. dari URL tempat),
+        jika None dibaca dari current_url.
+        """
+        if self.extraction == "js":
+            data = self._read_place_panel_js(index, coordinates)
+            if data:
+                return data
+        
         try:
-            element = self.driver.find_element(By.CSS_SELECTOR, selector)
-            return element.text if element.text else default
-        except:
-            return default
+            return read_place_panel(self.driver, index, coordinates)
+            
+        except Exception as e:
+            print(f"   Error extracting: {str(e)}")
+            return None
     
-    def _get_rating(self):
-        """Get rating"""
-        try:
-            rating_selectors = [
-                "div.F7nice span[aria-hidden='true']",
-                "span.ceNzKf",
-                "div.fontDisplayLarge"
-            ]
-            for selector in rating_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    text = element.text
-                    if text and any(char.isdigit() for char in text):
-                        return text.split()[0] if text else "N/A"
-                except:
-                    continue
-            return "N/A"
-        except:
-            return "N/A"
+    def _is_done(self, link):
+        """Cek apakah link tempat sudah selesai di journal (mode resume)"""
+        return bool(self.journal and link and self.journal.is_done(link))
     
-    def _get_total_reviews(self):
-        """Get total reviews"""
-        try:
-            review_selectors = [
-                "div.F7nice span[aria-label*='reviews']",
-                "button.HHrUdb span",
-                "span.RDApEe"
-            ]
-            for selector in review_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    text = element.text
-                    if '(' in text and ')' in text:
-                        return text.split('(')[1].split(')')[0]
-                except:
-                    continue
-            return "N/A"
-        except:
-            return "N/A"
+    def _store_record(self, business_data, link=None, from_cache=False):
+        """Tulis record ke journal dan cache (jika ada) begitu selesai di-extract"""
+        if self.journal:
+            self.journal.append(business_data, link)
+        if self.place_cache and link and not from_cache:
+            self.place_cache.put(link, business_data)
     
-    def _get_address(self):
-        """Get address"""
-        try:
-            address_selectors = [
-                "button[data-item-id='address'] div.fontBodyMedium",
-                "div.Io6YTe",
-                "button[data-tooltip='Copy address']"
-            ]
-            for selector in address_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if element.text:
-                        return element.text
-                except:
-                    continue
-            return "N/A"
-        except:
-            return "N/A"
+    def _check_cache(self, link, idx):
+        """Cek place cache untuk link, return salinan record segar (index baru) atau None
+
+        Record cache selalu ditulis ke journal seperti record baru, jadi resume
+        dan file akhir menghitungnya sama di kedua mode cache.
+        """
+        if not self.place_cache or not link:
+            return None
+        cached = self.place_cache.get(link)
+        if cached is None:
+            return None
+        return dict(cached, index=idx)
+    
+    def _serve_cached(self):
+        """Record cache ikut dikembalikan method search_* (mode "serve") atau tidak (mode "skip")"""
+        return self.place_cache.mode != "skip"
     
-    def _get_phone(self):
-        """Get phone number"""
+    def _card_link(self, element):
+        """Ambil href card (hanya saat journal/cache aktif, untuk skip/resume)"""
+        if not self.journal and not self.place_cache:
+            return None
         try:
-            phone_selectors = [
-                "button[data-item-id*='phone'] div.fontBodyMedium",
-                "button[aria-label*='Phone']",
-                "a[href^='tel:']"
-            ]
-            for selector in phone_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if element.text:
-                        return element.text
-                    elif 'href' in element.get_attribute('outerHTML'):
-                        return element.get_attribute('href').replace('tel:', '')
-                except:
-                    continue
-            return "N/A"
+            if element.tag_name == 'a':
+                return element.get_attribute('href')
+            anchors = element.find_elements(By.CSS_SELECTOR, "a.hfpxzc")
+            return anchors[0].get_attribute('href') if anchors else None
         except:
-            return "N/A"
+            return None
     
-    def _get_website(self):
-        """Get website"""
+    def _card_identity(self, element):
+        """Ambil nama (aria-label) dan koordinat (dari href) dari card hasil"""
         try:
-            website_selectors = [
-                "a[data-item-id='authority']",
-                "button[data-item-id='authority'] div.fontBodyMedium",
-                "a[aria-label*='Website']"
-            ]
-            for selector in website_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    href = element.get_attribute('href')
-                    if href and 'http' in href:
-                        return href
-                    elif element.text:
-                        return element.text
-                except:
-                    continue
-            return "N/A"
+            if element.tag_name == 'a':
+                anchor = element
+            else:
+                anchors = element.find_elements(By.CSS_SELECTOR, "a.hfpxzc")
+                if not anchors:
+                    return None, None
+                anchor = anchors[0]
+            return anchor.get_attribute('aria-label'), coords_from_place_url(anchor.get_attribute('href'))
         except:
-            return "N/A"
+            return None, None
     
-    def _get_hours(self):
-        """Get business hours"""
+    def _wait_until(self, label, condition, timeout=None):
+        """Tunggu sampai condition terpenuhi dan catat berapa lama waktunya
+
+        Return hasil condition, atau None jika timeout.
+        """
+        timeout = timeout or self.WAIT_TIMEOUTS[label]
+        start = time.perf_counter()
         try:
-            hours_button = self.driver.find_element(By.CSS_SELECTOR, "button[aria-label*='Hours']")
-            return hours_button.get_attribute('aria-label')
-        except:
-            return "N/A"
+            result = WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(condition)
+        except TimeoutException:
+            result = None
+        elapsed = time.perf_counter() - start
+        
+        with self._stats_lock:
+            stats = self.wait_stats.setdefault(label, {
+                "count": 0, "timeouts": 0, "total_seconds": 0.0, "max_seconds": 0.0
+            })
+            stats["count"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            if result is None:
+                stats["timeouts"] += 1
+        
+        if result is None and label != "scroll":
+            print(f"   ⏱️  Wait '{label}' timeout setelah {elapsed:.1f}s")
+        return result
+    
+    def _wait_for_feed(self):
+        """Tunggu feed hasil pencarian (atau langsung panel tempat) ter-render"""
+        return self._wait_until(
+            "feed",
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "div[role='feed'] a.hfpxzc, h1.DUwDvf")
+            )
+        )
+    
+    def _wait_for_place_name(self, expected_name=None, previous_name=None):
+        """Tunggu h1.DUwDvf berisi nama tempat baru"""
+        def name_ready(driver):
+            headers = driver.find_elements(By.CSS_SELECTOR, "h1.DUwDvf")
+            text = headers[0].text.strip() if headers else ""
+            if not text:
+                return False
+            if expected_name and text == expected_name.strip():
+                return text
+            return text if text != previous_name else False
+        
+        return self._wait_until("place_name", name_ready)
+    
+    def _wait_for_place_coords(self, expected_coords=None, previous_url=None):
+        """Tunggu current_url berisi @lat,lng (atau pin) tempat baru"""
+        def coords_ready(driver):
+            url = driver.current_url
+            if '@' not in url:
+                return False
+            if expected_coords:
+                lat, lng = expected_coords
+                if f"@{lat},{lng}" in url or f"!3d{lat}!4d{lng}" in url:
+                    return url
+                return False
+            return url if url != previous_url else False
+        
+        return self._wait_until("place_coords", coords_ready)
+    
+    def _merge_wait_stats(self, other_stats):
+        """Gabungkan statistik wait dari worker lain"""
+        with self._stats_lock:
+            for label, other in other_stats.items():
+                stats = self.wait_stats.setdefault(label, {
+                    "count": 0, "timeouts": 0, "total_seconds": 0.0, "max_seconds": 0.0
+                })
+                stats["count"] += other["count"]
+                stats["timeouts"] += other["timeouts"]
+                stats["total_seconds"] += other["total_seconds"]
+                stats["max_seconds"] = max(stats["max_seconds"], other["max_seconds"])
     
-    def _get_coordinates(self):
-        """Get coordinates from URL"""
+    def print_wait_stats(self):
+        """Tampilkan ringkasan durasi setiap jenis wait"""
+        if not self.wait_stats:
+            return
+        print("\n⏱️  WAIT STATS:")
+        for label, stats in self.wait_stats.items():
+            avg = stats["total_seconds"] / stats["count"] if stats["count"] else 0
+            print(f"   {label:<13} n={stats['count']:<4} avg={avg:.2f}s "
+                  f"max={stats['max_seconds']:.2f}s timeout={stats['timeouts']}")
+    
+    def _read_place_panel_js(self, index, coordinates=None):
+        """Baca semua field panel detail dengan satu execute_script
+
+        Return None jika script gagal atau nama tempat tidak terbaca,
+        supaya _read_place_panel bisa fallback ke method per-field.
+        """
+        chains = {field: chain.ordered() for field, chain in MAPS_PANEL_CHAINS.items()}
         try:
-            current_url = self.driver.current_url
-            if '@' in current_url:
-                coords = current_url.split('@')[1].split(',')[:2]
-                return f"{coords[0]},{coords[1]}"
-            return "N/A"
-        except:
-            return "N/A"
+            panel = self.driver.execute_script(PLACE_PANEL_JS, chains)
+        except Exception as e:
+            print(f"   JS extraction gagal, fallback per-field: {str(e)}")
+            return None
+        
+        if not panel or panel.get("name", "N/A") == "N/A":
+            return None
+        hits = panel.get("hits") or {}
+        for field, tried in chains.items():
+            MAPS_PANEL_CHAINS[field].record(tried, hits.get(field))
+        
+        if not coordinates:
+            coords = coords_from_place_url(panel.get("url"))
+            coordinates = f"{coords[0]},{coords[1]}" if coords else "N/A"
+        return {
+            "index": index,
+            "name": panel["name"],
+            "category": panel["category"],
+            "rating": panel["rating"],
+            "total_reviews": panel["total_reviews"],
+            "address": panel["address"],
+            "phone": panel["phone"],
+            "website": panel["website"],
+            "hours": panel["hours"],
+            "coordinates": coordinates,
+            "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+    
+    def print_command_stats(self):
+        """Tampilkan rata-rata jumlah WebDriver command per record"""
+        if not self.record_command_counts:
+            return
+        counts = self.record_command_counts
+        print(f"\n📡 WebDriver commands per record ({self.extraction}): "
+              f"avg={sum(counts) / len(counts):.1f} min={min(counts)} max={max(counts)}")
+    
+    def _get_text_safe(self, selector, default="N/A"):
+        """Safely get text from element"""
+        return get_text_safe(self.driver, selector, default)
+    
+    def save(self, data, filename):
+        """Simpan data, format dari ekstensi (.json, .jsonl, .csv, .parquet, + .gz / .zst)"""
+        return write_records(data, filename, fieldnames=self.FIELDNAMES)
     
     def save_to_json(self, data, filename):
         """Simpan data ke JSON"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"💾 Data disimpan ke {filename}")
+        return self.save(data, filename)
     
     def save_to_csv(self, data, filename):
         """Simpan data ke CSV"""
-        if not data:
-            print("⚠️  Tidak ada data untuk disimpan")
-            return
-        
-        keys = data[0].keys()
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(data)
-        print(f"💾 Data disimpan ke {filename}")
+        return self.save(data, filename)
     
     def close(self):
-        """Tutup browser"""
-        self.driver.quit()
-        print("🔒 Browser ditutup")
+        """Tutup browser (atau kembalikan ke pool), simpan statistik selector"""
+        SELECTOR_STATS.save()
+        self.session.close()
+        print("🔁 Browser dikembalikan ke pool" if self.pool else "🔒 Browser ditutup")
 
 def main():
     """Main function"""
@@ -380,58 +1042,127 @@ def main():
     print("   - warung makan")
     print("   - toko bangunan")
     
-    query = input("\n🔍 Masukkan kategori bisnis yang ingin di-scrape: ").strip()
-    if not query:
-        query = "restoran"
-        print(f"   Menggunakan kategori default: {query}")
+    resume_path = input("\n♻️  Resume dari journal? (path file .jsonl, kosongkan untuk run baru): ").strip()
+    journal = RunJournal(resume_path, key=place_key) if resume_path and os.path.exists(resume_path) else None
     
-    location = input("📍 Lokasi (default: Kabupaten Cirebon, Jawa Barat): ").strip()
-    if not location:
-        location = "Kabupaten Cirebon, Jawa Barat"
+    if journal and journal.meta.get("query"):
+        # Lanjutkan run lama dengan parameter yang sama
+        query = journal.meta["query"]
+        location = journal.meta["location"]
+        max_results = journal.meta["max_results"]
+        print(f"   Melanjutkan: {query} @ {location} (target {max_results})")
+    else:
+        query = input("\n🔍 Masukkan kategori bisnis yang ingin di-scrape: ").strip()
+        if not query:
+            query = "restoran"
+            print(f"   Menggunakan kategori default: {query}")
+        
+        location = input("📍 Lokasi (default: Kabupaten Cirebon, Jawa Barat): ").strip()
+        if not location:
+            location = "Kabupaten Cirebon, Jawa Barat"
+        
+        max_results = input("📊 Berapa bisnis yang ingin di-scrape? (default: 20): ").strip()
+        max_results = int(max_results) if max_results.isdigit() else 20
+    
+    navigation = input("🔗 Mode navigasi: klik card atau buka URL langsung? (klik/url, default: klik): ").strip().lower()
+    navigation = "direct" if navigation == "url" else "click"
+    
+    engine = input("📡 Engine: dom (panel detail) atau network (payload XHR)? (dom/network, default: dom): ").strip().lower()
+    engine = "network" if engine == "network" else "dom"
     
-    max_results = input("📊 Berapa bisnis yang ingin di-scrape? (default: 20): ").strip()
-    max_results = int(max_results) if max_results.isdigit() else 20
+    tiled = input("🧩 Mode tile grid (cakupan penuh Kota + Kabupaten Cirebon)? (y/n, default: n): ").strip().lower()
+    tiled = tiled == 'y'
     
     headless = input("👻 Jalankan headless mode? (y/n, default: n): ").strip().lower()
     headless = headless == 'y'
     
+    max_workers = recommended_workers()
+    workers = input(f"⚡ Jumlah worker paralel? (1 = mode biasa, maks disarankan: {max_workers}, default: 1): ").strip()
+    workers = min(int(workers), max_workers) if workers.isdigit() and int(workers) > 0 else 1
+    
+    output_formats = input("💾 Format output? (json,csv,jsonl,parquet; tambah .gz / .zst untuk kompresi, default: json,csv): ").strip().lower()
+    output_formats = [f.strip() for f in output_formats.split(",") if f.strip()] or ["json", "csv"]
+    for extension in output_formats:
+        # Format / paket yang salah ketahuan sekarang, bukan setelah scraping selesai
+        try:
+            check_writer("hasil", *parse_format(extension))
+        except (ValueError, ImportError) as e:
+            print(f"❌ {str(e)}")
+            return
+    
     print("\n🚀 Memulai scraping...")
-    print("⏰ Estimasi waktu: ~{} menit".format(max_results // 10 + 1))
+    print("⏰ Estimasi waktu: ~{} menit".format(max_results // (10 * workers) + 1))
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if not journal:
+        # Setiap record langsung ditulis ke journal supaya aman dari crash / Ctrl-C
+        journal = RunJournal(
+            f"gmaps_{query.replace(' ', '_')}_{timestamp}.jsonl",
+            meta={"query": query, "location": location, "max_results": max_results},
+            key=place_key
+        )
+    print(f"📓 Journal: {journal.path}")
+    
+    # Cache opt-in: tanpa input, semua tempat di-scrape ulang (tidak ada record lama diam-diam)
+    ttl_days = input("🗄️  Cache tempat: lewati tempat yang di-scrape < N hari lalu (N, default: 0 = tanpa cache): ").strip()
+    ttl_days = int(ttl_days) if ttl_days.isdigit() else 0
+    place_cache = PlaceCache(ttl_days=ttl_days) if ttl_days > 0 else None
     
     # Inisialisasi scraper
-    scraper = GoogleMapsScraper(headless=headless)
+    scraper = GoogleMapsScraper(headless=headless, engine=engine, place_cache=place_cache)
     
     try:
         # Scraping bisnis
-        businesses = scraper.search_businesses(query, location, max_results)
+        if engine == "network":
+            scraper.search_businesses_network(query, location, max_results, journal=journal)
+        elif tiled:
+            scraper.search_businesses_tiled(query, max_results=max_results, workers=workers, journal=journal)
+        elif workers > 1:
+            scraper.search_businesses_parallel(query, location, max_results, workers, journal=journal)
+        else:
+            scraper.search_businesses(query, location, max_results, navigation, journal=journal)
         
-        if businesses:
-            # Simpan ke file
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            json_filename = f"gmaps_{query.replace(' ', '_')}_{timestamp}.json"
-            csv_filename = f"gmaps_{query.replace(' ', '_')}_{timestamp}.csv"
-            
-            scraper.save_to_json(businesses, json_filename)
-            scraper.save_to_csv(businesses, csv_filename)
+        if journal.count:
+            # File akhir dibangun dari journal secara streaming
+            base_filename = journal.path[:-len('.jsonl')]
+            # .jsonl sudah dipakai journal, hasil JSONL diberi akhiran _records
+            output_files = [base_filename + ('_records.' if extension.startswith('jsonl') else '.') + extension
+                            for extension in output_formats]
+            for filename in output_files:
+                journal.export(filename, fieldnames=GoogleMapsScraper.FIELDNAMES)
             
-            print(f"\n✨ Berhasil scraping {len(businesses)} bisnis!")
-            print(f"📁 File JSON: {json_filename}")
-            print(f"📁 File CSV: {csv_filename}")
+            print(f"\n✨ Berhasil scraping {journal.count} bisnis!")
+            for filename in output_files:
+                print(f"📁 File: {filename}")
             
             # Tampilkan summary
             print("\n📊 SUMMARY:")
-            print(f"   Total bisnis: {len(businesses)}")
-            with_phone = sum(1 for b in businesses if b['phone'] != 'N/A')
-            with_website = sum(1 for b in businesses if b['website'] != 'N/A')
+            print(f"   Total bisnis: {journal.count}")
+            with_phone = 0
+            with_website = 0
+            for b in journal.iter_records(sort_by_index=False):
+                with_phone += b['phone'] != 'N/A'
+                with_website += b['website'] != 'N/A'
             print(f"   Dengan nomor telepon: {with_phone}")
             print(f"   Dengan website: {with_website}")
+            scraper.print_wait_stats()
+            scraper.print_command_stats()
+            scraper.session.print_network_stats()
+            if place_cache:
+                place_cache.print_stats()
         else:
             print("\n⚠️  Tidak ada bisnis yang berhasil di-scrape")
+        RATE_LIMITER.print_stats()
+        SELECTOR_STATS.print_stats()
     
     except KeyboardInterrupt:
         print("\n\n⏸️  Scraping dibatalkan oleh user")
+        print(f"♻️  {journal.count} record aman di journal, lanjutkan dengan resume: {journal.path}")
     
     finally:
+        journal.close()
+        if place_cache:
+            place_cache.close()
         scraper.close()
         print("\n✅ Selesai!")
 
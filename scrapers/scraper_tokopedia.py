@@ -3,47 +3,117 @@ Web Scraper untuk Tokopedia
 Scraping produk berdasarkan keyword pencarian
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from browser_session import open_session, default_block_profile
+from extractors import TOKOPEDIA_CARD_CHAIN, first_card_selector, extract_tokopedia_card, tokopedia_product_key
+from selector_chain import SelectorChain, SELECTOR_STATS
+from static_dom import StaticPage
+from tokopedia_api import GQL_URL, TokopediaSearchApi, TokopediaShopApi, product_to_record
+from shop_catalog import CATALOG_FIELDNAMES, CatalogStore, ShopCatalogCrawler, shops_from_products
+from output_writers import open_writer, write_records
+from rate_limiter import RATE_LIMITER, BlockedError
+from urllib.parse import urljoin, urlencode
 import time
-import json
+import queue
+import threading
 from datetime import datetime
 
+# Selector search box, yang terakhir cocok dicoba duluan (setiap miss = satu wait penuh)
+SEARCH_BOX_CHAIN = SelectorChain("tokopedia.search_box", [
+    "input[data-unify='Search']",
+    "input[type='search']",
+    "input[placeholder*='Cari']",
+    "input.css-3017qm"
+])
+
 class TokopediaScraper:
-    def __init__(self, headless=False):
-        """Initialize scraper dengan Chrome driver"""
-        chrome_options = ChromeOptions()
-        
-        if headless:
-            chrome_options.add_argument('--headless')
-        
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
+    BASE_URL = "https://www.tokopedia.com/"
+    # Kolom tetap untuk output CSV / Parquet
+    FIELDNAMES = ["index", "name", "price", "rating", "shop", "location", "link", "scraped_at"]
+    # Produk per halaman hasil pencarian; max_products di atas ini memakai pagination (?page=N)
+    PAGE_SIZE = 60
+    MAX_PAGES = 50
+    # Empty state "produk tidak ditemukan" (halaman setelah hasil terakhir)
+    NO_RESULT_SELECTOR = "div[data-testid='divSRPNoResult']"
+    
+    def __init__(self, headless=False, pool=None, block_resources=None, base_url=BASE_URL, extraction="snapshot",
+                 engine="browser", api_url=GQL_URL):
+        """Initialize scraper dengan Chrome driver (atau pinjam dari BrowserPool)
+
+        block_resources: blokir gambar produk, font dan tracker via CDP,
+        JSON produk tetap dimuat (default: aktif saat headless)
+        base_url: homepage Tokopedia (diganti ke fixture server saat benchmark)
+        extraction: "snapshot" (ambil page_source sekali setelah scroll lalu
+        parse semua card lokal dengan lxml, fallback ke "dom" jika lxml tidak
+        ada) atau "dom" (find_element Selenium per field per card)
+        engine: "browser" (render halaman search) atau "api" (request GraphQL
+        pencarian langsung lewat HTTP, tanpa membuka browser sama sekali)
+        api_url: endpoint GraphQL (diganti ke mock fixture server saat benchmark)
+        """
+        self.headless = headless
+        self.base_url = base_url
+        self.pool = pool
+        self.block_resources = block_resources
+        self.extraction = extraction
+        self.engine = engine
+        self.api_url = api_url
+        self.api = None
+        self._api_total = None
+        self.session = None
+        self.driver = None
+        if engine == "api":
+            self.api = TokopediaSearchApi(api_url, rows=self.PAGE_SIZE)
+            return
+        self.session = open_session(
+            headless, pool=pool,
+            block_profile=default_block_profile("tokopedia", headless, block_resources)
+        )
+        self.driver = self.session.driver
         self.wait = WebDriverWait(self.driver, 10)
         
-    def search_products(self, keyword, max_products=10):
-        """Scraping produk dari Tokopedia berdasarkan keyword"""
+    def _recycle_session(self):
+        """Ganti browser pinjaman pool yang sudah melewati max_pages (dipanggil antar halaman)"""
+        if not self.pool or not self.session:
+            return
+        session = self.pool.maybe_recycle(self.session)
+        if session is not self.session:
+            self.session = session
+            self.driver = session.driver
+            self.wait = WebDriverWait(self.driver, 10)
+    
+    def _search_url(self, keyword, page=1):
+        """URL halaman hasil pencarian produk ke-page"""
+        return urljoin(self.base_url, "search") + "?" + urlencode({"st": "product", "q": keyword, "page": page})
+    
+    def _worker_pool(self):
+        """Pool untuk worker halaman (None jika pool tidak cukup besar untuk dibagi)"""
+        return self.pool if self.pool and self.pool.size > 1 else None
+    
+    def _cap_workers(self, workers):
+        """Batasi worker supaya tidak menunggu browser pool yang sedang dipakai driver utama"""
+        if self.pool:
+            return max(1, min(workers, self.pool.size))
+        return workers
+    
+    def search_products(self, keyword, max_products=10, workers=1):
+        """Scraping produk dari Tokopedia berdasarkan keyword
+
+        Lebih dari satu halaman (max_products > PAGE_SIZE) atau workers > 1
+        memakai search_products_paged, engine "api" memakai search_products_api.
+        """
+        if self.engine == "api":
+            return self.search_products_api(keyword, max_products)
+        if workers > 1 or max_products > self.PAGE_SIZE:
+            return self.search_products_paged(keyword, max_products, workers)
         print(f"🔍 Mencari produk: {keyword}")
         
         try:
             # Buka Tokopedia
-            self.driver.get("https://www.tokopedia.com/")
-            time.sleep(5)
+            self.driver.get(self.base_url)
             
             # Screenshot untuk debugging
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -52,21 +122,16 @@ class TokopediaScraper:
             
             # Cari search box dengan multiple selectors
             search_box = None
-            selectors = [
-                "input[data-unify='Search']",
-                "input[type='search']",
-                "input[placeholder*='Cari']",
-                "input.css-3017qm"
-            ]
-            
-            for selector in selectors:
+            for selector in SEARCH_BOX_CHAIN:
                 try:
                     search_box = self.wait.until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, selector))
                     )
+                    SEARCH_BOX_CHAIN.hit(selector)
                     print(f"✅ Search box ditemukan dengan selector: {selector}")
                     break
                 except:
+                    SEARCH_BOX_CHAIN.miss(selector)
                     continue
             
             if not search_box:
@@ -80,7 +145,7 @@ class TokopediaScraper:
             search_box.send_keys(Keys.RETURN)
             
             print("⏳ Menunggu hasil pencarian...")
-            time.sleep(8)  # Wait lebih lama
+            self._wait_for_results()
             
             # Screenshot hasil pencarian
             self.driver.save_screenshot(f"debug_2_search_results_{timestamp}.png")
@@ -90,19 +155,9 @@ class TokopediaScraper:
             self._scroll_page()
             
             # Coba berbagai selector untuk product cards
-            product_cards = []
-            card_selectors = [
-                "div[data-testid='master-product-card']",
-                "div[data-testid='divProductWrapper']",
-                "div.css-1sn1xa2",
-                "div.pcv3__container"
-            ]
-            
-            for selector in card_selectors:
-                product_cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if product_cards:
-                    print(f"✅ Product cards ditemukan dengan selector: {selector}")
-                    break
+            selector, product_cards = self._get_product_cards()
+            if product_cards:
+                print(f"✅ Product cards ditemukan dengan selector: {selector}")
             
             print(f"📦 Menemukan {len(product_cards)} produk")
             
@@ -138,112 +193,228 @@ class TokopediaScraper:
             print(f"📸 Error screenshot saved: debug_error_{timestamp}.png")
             return []
     
-    def _extract_product_data(self, card, index):
-        """Extract data dari product card"""
-        try:
-            # Nama produk - coba berbagai selector
-            name = None
-            name_selectors = [
-                "span[class*='prd_link-product-name']",
-                "div.prd_link-product-name",
-                "span.css-20kt3o",
-                "div[data-testid='spnSRPProdName']"
-            ]
-            for selector in name_selectors:
-                try:
-                    name = card.find_element(By.CSS_SELECTOR, selector).text
-                    if name:
-                        break
-                except:
+    def search_products_api(self, keyword, max_products=100, max_pages=None):
+        """Scraping lewat API GraphQL pencarian: halaman demi halaman sampai cukup / habis
+
+        Produk di-dedup per link seperti mode paged, record sama dengan mode browser.
+        """
+        max_pages = max_pages or self.MAX_PAGES
+        print(f"🔍 Mencari produk via API: {keyword}")
+        products = []
+        seen = set()
+        for page in range(1, max_pages + 1):
+            page_products = self._search_api_page(keyword, page)
+            if not page_products:
+                break
+            for product in page_products:
+                key = tokopedia_product_key(product)
+                if key in seen:
                     continue
+                seen.add(key)
+                product["index"] = len(products) + 1
+                products.append(product)
+                if len(products) >= max_products:
+                    break
+            print(f"📄 Halaman {page}: {len(page_products)} produk (total unik {len(products)})")
+            if len(products) >= max_products or (self._api_total is not None and page * self.api.rows >= self._api_total):
+                break
+        print(f"📦 {len(products)} produk dari {self.api.requests} request API")
+        return products
+    
+    def _search_api_page(self, keyword, page):
+        """Satu halaman hasil API, dipetakan ke record (index sementara per halaman)"""
+        raw_products, self._api_total = self.api.search_page(keyword, page)
+        return [product_to_record(product, idx) for idx, product in enumerate(raw_products, 1)]
+    
+    def search_products_paged(self, keyword, max_products=100, workers=3, max_pages=None):
+        """Scraping beberapa halaman hasil pencarian (?page=N) secara paralel
+
+        Nomor halaman dibagikan ke beberapa browser (driver ini + worker dari
+        pool atau Chrome baru). Produk di-dedup per link (iklan yang muncul di
+        banyak halaman hanya dihitung sekali) dan scraping berhenti begitu
+        max_products produk unik terkumpul atau halaman kosong (akhir hasil).
+        Urutan hasil tetap urutan halaman.
+        """
+        max_pages = max_pages or self.MAX_PAGES
+        workers = self._cap_workers(max(1, min(workers, max_pages)))
+        print(f"🔍 Mencari produk: {keyword} ({workers} browser, maks {max_pages} halaman)")
+        
+        state = {"next_page": 1, "last_page": max_pages, "stop": False}
+        state_lock = threading.Lock()
+        result_queue = queue.Queue()
+        threads = []
+        for worker_id in range(1, workers + 1):
+            thread = threading.Thread(
+                target=self._page_worker,
+                args=(worker_id, keyword, state, state_lock, result_queue),
+                daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        
+        # Single writer: halaman yang selesai duluan ditahan sampai halaman sebelumnya masuk
+        finished_pages = {}
+        next_page = 1
+        products = []
+        seen = set()
+        duplicates = 0
+        while next_page <= state["last_page"] and not state["stop"]:
+            try:
+                page, page_products = result_queue.get(timeout=1)
+            except queue.Empty:
+                if not any(thread.is_alive() for thread in threads):
+                    print("⚠️  Semua worker berhenti sebelum semua halaman selesai")
+                    break
+                continue
             
-            if not name:
-                return None
+            finished_pages[page] = page_products
+            if page_products == []:
+                # Halaman kosong = akhir hasil pencarian, halaman berikutnya tidak perlu dibuka
+                with state_lock:
+                    state["last_page"] = min(state["last_page"], page - 1)
             
-            # Harga - coba berbagai selector
-            price = None
-            price_selectors = [
-                "span[class*='prd_link-product-price']",
-                "div.prd_link-product-price",
-                "span.css-o5uqvq",
-                "div[data-testid='spnSRPProdPrice']"
-            ]
-            for selector in price_selectors:
-                try:
-                    price = card.find_element(By.CSS_SELECTOR, selector).text
-                    if price:
+            while next_page in finished_pages and len(products) < max_products:
+                for product in finished_pages.pop(next_page) or []:
+                    key = tokopedia_product_key(product)
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                    product["index"] = len(products) + 1
+                    products.append(product)
+                    print(f"✅ [{product['index']}] {product['name'][:50]}... - {product['price']}")
+                    if len(products) >= max_products:
                         break
-                except:
-                    continue
-            
-            if not price:
-                price = "N/A"
-            
-            # Rating (optional)
-            rating = "N/A"
-            rating_selectors = [
-                "span[class*='rating']",
-                "span.css-t70v7i",
-                "div[data-testid='spnSRPProdRating']"
-            ]
-            for selector in rating_selectors:
-                try:
-                    rating = card.find_element(By.CSS_SELECTOR, selector).text
-                    if rating:
+                next_page += 1
+            if len(products) >= max_products:
+                print(f"🎯 {max_products} produk unik terkumpul, berhenti")
+                break
+        
+        with state_lock:
+            state["stop"] = True
+        for thread in threads:
+            thread.join()
+        
+        print(f"📦 {len(products)} produk unik dari {next_page - 1} halaman ({duplicates} duplikat dilewati)")
+        return products
+    
+    def _page_worker(self, worker_id, keyword, state, state_lock, result_queue):
+        """Worker: ambil nomor halaman berikutnya sampai akhir hasil / produk cukup
+
+        Worker 1 memakai driver scraper ini, worker lain membuka browser sendiri.
+        """
+        worker = self
+        if worker_id > 1:
+            try:
+                worker = TokopediaScraper(headless=self.headless, pool=self._worker_pool(),
+                                          block_resources=self.block_resources, base_url=self.base_url,
+                                          extraction=self.extraction)
+            except Exception as e:
+                print(f"❌ Worker {worker_id} gagal start browser: {str(e)}")
+                return
+        
+        try:
+            while True:
+                with state_lock:
+                    if state["stop"] or state["next_page"] > state["last_page"]:
                         break
-                except:
-                    continue
-            
-            # Toko
-            shop = "N/A"
-            shop_selectors = [
-                "span[class*='prd_link-shop-name']",
-                "span.css-1kr22w3",
-                "div[data-testid='spnSRPProdShop']"
-            ]
-            for selector in shop_selectors:
+                    page = state["next_page"]
+                    state["next_page"] += 1
+                
                 try:
-                    shop = card.find_element(By.CSS_SELECTOR, selector).text
-                    if shop:
-                        break
-                except:
-                    continue
-            
-            # Link produk
-            link = "N/A"
+                    worker._recycle_session()
+                    page_products = worker._scrape_search_page(keyword, page)
+                except BlockedError as e:
+                    # Domain sedang cooldown, halaman lain pasti ikut diblokir
+                    print(f"🛑 Worker {worker_id} berhenti: {str(e)}")
+                    with state_lock:
+                        state["stop"] = True
+                    page_products = None
+                except Exception as e:
+                    print(f"⚠️  Worker {worker_id} error pada halaman {page}: {str(e)}")
+                    page_products = None
+                result_queue.put((page, page_products))
+        finally:
+            if worker is not self:
+                worker.close()
+    
+    def _scrape_search_page(self, keyword, page):
+        """Buka satu halaman hasil pencarian lewat URL, return list produk ([] = halaman kosong)"""
+        self.driver.get(self._search_url(keyword, page))
+        self._wait_for_results()
+        self._scroll_page()
+        
+        _, product_cards = self._get_product_cards()
+        products = []
+        for idx, card in enumerate(product_cards, 1):
+            product_data = self._extract_product_data(card, idx)
+            if product_data:
+                products.append(product_data)
+        print(f"📄 Halaman {page}: {len(products)} produk")
+        return products
+    
+    def _wait_for_results(self, timeout=15):
+        """Tunggu product card (atau empty state) muncul; BlockedError langsung jika halaman blokir terdeteksi"""
+        def results_ready(driver):
+            # Navigasi lewat form search tidak lewat driver.get, jadi cek blokir manual
+            self.session.check_block()
+            # Urutan dari chain tanpa mencatat miss (card memang belum muncul saat polling)
+            cards = first_card_selector(driver, TOKOPEDIA_CARD_CHAIN.ordered())[1]
+            return cards or driver.find_elements(By.CSS_SELECTOR, self.NO_RESULT_SELECTOR)
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.5).until(results_ready)
+        except TimeoutException:
+            print("⚠️  Product card belum muncul setelah menunggu")
+    
+    def crawl_shop_catalogs(self, products, outputs=(), workers=4, full=False, store=None):
+        """Sync katalog lengkap toko-toko yang muncul di hasil search_products
+
+        Lewat API toko (tanpa browser), maks workers toko bersamaan. Hanya
+        produk baru / berubah sejak sync sebelumnya (high-water mark per toko
+        di CatalogStore) yang ditulis ke outputs, return statistik per toko.
+        """
+        shops = shops_from_products(products)
+        print(f"🏪 Sync katalog {len(shops)} toko ({workers} bersamaan)")
+        # Endpoint mock (benchmark / offline) dipakai juga untuk query toko
+        api = TokopediaShopApi(endpoint=None if self.api_url == GQL_URL else self.api_url, maxsize=workers)
+        own_store = store is None
+        store = store or CatalogStore()
+        writers = [open_writer(output, fieldnames=CATALOG_FIELDNAMES) for output in outputs]
+        crawler = ShopCatalogCrawler(store, api, workers=workers, writers=writers, full=full)
+        try:
+            results = crawler.run(shops)
+            crawler.print_stats(results)
+            return results
+        finally:
+            for writer in writers:
+                writer.close()
+            api.close()
+            if own_store:
+                store.close()
+    
+    def _get_product_cards(self):
+        """Product card di halaman saat ini, return (selector, cards)
+
+        Mode snapshot: satu page_source lalu card berupa StaticElement (lxml),
+        jadi extract per field tidak lagi round trip ke browser. Selector dan
+        fungsi extract sama dengan mode dom / replay.
+        """
+        if self.extraction == "snapshot":
             try:
-                link = card.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
-            except:
-                pass
-            
-            # Lokasi
-            location = "N/A"
-            location_selectors = [
-                "span[class*='prd_link-shop-loc']",
-                "span.css-1kdc32b",
-                "div[data-testid='spnSRPProdLoc']"
-            ]
-            for selector in location_selectors:
-                try:
-                    location = card.find_element(By.CSS_SELECTOR, selector).text
-                    if location:
-                        break
-                except:
-                    continue
-            
-            return {
-                "index": index,
-                "name": name,
-                "price": price,
-                "rating": rating,
-                "shop": shop,
-                "location": location,
-                "link": link,
-                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-        except Exception as e:
-            print(f"   Debug: Error extracting data - {str(e)}")
-            return None
+                page = StaticPage(self.driver.page_source, self.driver.current_url)
+            except ImportError as e:
+                print(f"⚠️  {str(e)}, pakai extraction dom")
+                self.extraction = "dom"
+            else:
+                selector, product_cards = first_card_selector(page, TOKOPEDIA_CARD_CHAIN)
+                if product_cards:
+                    return selector, product_cards
+        return first_card_selector(self.driver, TOKOPEDIA_CARD_CHAIN)
+    
+    def _extract_product_data(self, card, index):
+        """Extract data dari product card (logika di extractors, dipakai juga oleh replay)"""
+        return extract_tokopedia_card(card, index)
     
     def _scroll_page(self):
         """Scroll halaman untuk load lebih banyak produk"""
@@ -251,16 +422,22 @@ class TokopediaScraper:
             self.driver.execute_script("window.scrollBy(0, 1000);")
             time.sleep(1)
     
+    def save(self, data, filename):
+        """Simpan data, format dari ekstensi (.json, .jsonl, .csv, .parquet, + .gz / .zst)"""
+        return write_records(data, filename, fieldnames=self.FIELDNAMES)
+    
     def save_to_json(self, data, filename):
         """Simpan data ke file JSON"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"💾 Data disimpan ke {filename}")
+        return self.save(data, filename)
     
     def close(self):
-        """Tutup browser"""
-        self.driver.quit()
-        print("🔒 Browser ditutup")
+        """Tutup browser (atau kembalikan ke pool) / koneksi API, simpan statistik selector"""
+        if self.api:
+            self.api.close()
+            return
+        SELECTOR_STATS.save()
+        self.session.close()
+        print("🔁 Browser dikembalikan ke pool" if self.pool else "🔒 Browser ditutup")
 
 def main():
     """Main function"""
@@ -277,17 +454,27 @@ def main():
     max_products = input("📊 Berapa produk yang ingin di-scrape? (default: 10): ").strip()
     max_products = int(max_products) if max_products.isdigit() else 10
     
-    headless = input("👻 Jalankan headless mode? (y/n, default: n): ").strip().lower()
-    headless = headless == 'y'
+    workers = 1
+    if max_products > TokopediaScraper.PAGE_SIZE:
+        workers = input("⚡ Berapa browser paralel untuk multi-halaman? (default: 3): ").strip()
+        workers = int(workers) if workers.isdigit() else 3
+    
+    engine = input("🔌 Engine: browser / api (tanpa browser)? (default: browser): ").strip().lower()
+    engine = engine if engine == "api" else "browser"
+    
+    headless = False
+    if engine == "browser":
+        headless = input("👻 Jalankan headless mode? (y/n, default: n): ").strip().lower()
+        headless = headless == 'y'
     
     print("\n🚀 Memulai scraping...")
     
     # Inisialisasi scraper
-    scraper = TokopediaScraper(headless=headless)
+    scraper = TokopediaScraper(headless=headless, engine=engine)
     
     try:
         # Scraping produk
-        products = scraper.search_products(keyword, max_products)
+        products = scraper.search_products(keyword, max_products, workers)
         
         if products:
             # Simpan ke JSON
@@ -296,8 +483,18 @@ def main():
             
             print(f"\n✨ Berhasil scraping {len(products)} produk!")
             print(f"📁 File tersimpan: {filename}")
+            if scraper.session:
+                scraper.session.print_network_stats()
+            
+            sync = input("\n🏪 Sync katalog lengkap toko-toko di hasil ini? (y/n, default: n): ").strip().lower()
+            if sync == 'y':
+                catalog_file = filename.replace("tokopedia_", "tokopedia_katalog_", 1).replace(".json", ".jsonl")
+                scraper.crawl_shop_catalogs(products, outputs=[catalog_file])
+                print(f"📁 Produk baru / berubah: {catalog_file}")
         else:
             print("\n⚠️  Tidak ada produk yang berhasil di-scrape")
+        RATE_LIMITER.print_stats()
+        SELECTOR_STATS.print_stats()
     
     except KeyboardInterrupt:
         print("\n\n⏸️  Scraping dibatalkan oleh user")
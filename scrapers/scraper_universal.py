@@ -3,51 +3,130 @@ Web Scraper Template - Universal
 Template yang bisa disesuaikan untuk scraping website apapun
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from browser_session import open_session
+from http_session import HttpSession, needs_javascript
+from static_dom import By, lxml_available, require_lxml
+from list_schema import compile_schema, extract_list
+from crawler import Crawler, print_stats
+from output_writers import open_writer, write_records
+from scroll_harvester import ScrollHarvester
+from rate_limiter import domain_of
+from urllib.parse import urlparse
 import time
-import json
-import csv
 from datetime import datetime
 
+QUOTES_URL = "http://quotes.toscrape.com/"
+
+# Schema list quotes.toscrape.com: satu evaluasi per halaman untuk semua quote
+QUOTES_SCHEMA = compile_schema({
+    "container": "div.quote",
+    "fields": {
+        "quote": {"selector": "span.text", "required": True},
+        "author": "small.author",
+        "tags": {"selector": "a.tag", "mode": "list"},
+    },
+})
+
+# Mode per situs (host atau domain): "http" = HTML statis cukup, "browser" = butuh JavaScript
+SITE_MODES = {
+    "quotes.toscrape.com": "http",
+    "tokopedia.com": "browser",
+    "google.com": "browser",
+}
+
 class UniversalScraper:
-    def __init__(self, headless=False):
-        """Initialize scraper dengan Chrome driver"""
-        chrome_options = ChromeOptions()
-        
-        if headless:
-            chrome_options.add_argument('--headless')
-        
-        # Anti-detection settings
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        service = ChromeService(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
-        self.wait = WebDriverWait(self.driver, 15)
+    def __init__(self, headless=False, pool=None, block_profile=None, mode="browser", site_modes=None):
+        """Initialize scraper dengan Chrome driver (atau pinjam dari BrowserPool)
+
+        block_profile: nama profil blokir resource di BLOCK_PROFILES (opsional)
+        mode: "browser" (selalu Chrome), "http" (HTTP keep-alive + lxml, tanpa
+        browser) atau "auto" (HTTP dulu, pindah ke browser jika halaman butuh JS)
+        site_modes: override mode per host / domain, ditambahkan ke SITE_MODES
+        """
+        self.headless = headless
+        self.pool = pool
+        self.block_profile = block_profile
+        self.mode = mode
+        self.site_modes = dict(SITE_MODES, **(site_modes or {}))
+        if mode != "browser":
+            # Gagal di awal, bukan di halaman pertama, jika lxml belum terpasang
+            require_lxml()
+        self.http = HttpSession() if mode != "browser" else None
+        self.page = None  # StaticPage halaman saat ini jika dibuka lewat HTTP
+        self._session = None
         
-        print("✅ Browser initialized")
+        if mode == "browser":
+            self._start_browser()
+    
+    def _start_browser(self):
+        """Start Chrome saat pertama kali dibutuhkan"""
+        if self._session is None:
+            self._session = open_session(self.headless, pool=self.pool, block_profile=self.block_profile)
+            self.wait = WebDriverWait(self._session.driver, 15)
+            print("✅ Browser initialized")
+        return self._session
+    
+    @property
+    def session(self):
+        return self._start_browser()
+    
+    @property
+    def driver(self):
+        return self._start_browser().driver
+    
+    @property
+    def command_count(self):
+        """Jumlah WebDriver command (0 jika browser belum pernah dipakai)"""
+        return self._session.command_count if self._session else 0
     
-    def open_url(self, url):
-        """Buka URL"""
+    def _site_mode(self, url):
+        """Mode untuk URL: override per situs, lalu mode scraper"""
+        host = (urlparse(url).hostname or "").lower()
+        return self.site_modes.get(host) or self.site_modes.get(domain_of(url)) or self.mode
+    
+    def open_url(self, url, expect=None):
+        """Buka URL lewat HTTP atau browser sesuai mode
+
+        expect: locator (by, value) yang harus ada di halaman; di mode auto,
+        jika tidak ada di HTML statis halaman dibuka ulang dengan browser
+        """
         print(f"🌐 Membuka: {url}")
+        mode = self._site_mode(url)
+        if self.mode != "browser" and mode != "browser":
+            page = self.http.get(url)
+            reason = needs_javascript(page, expect) if self.mode == "auto" and mode != "http" else None
+            if not reason:
+                self.page = page
+                return
+            # Ingat per host supaya halaman berikutnya langsung pakai browser
+            print(f"🧭 Halaman butuh JavaScript ({reason}), pindah ke browser")
+            self.site_modes[(urlparse(page.current_url).hostname or "").lower()] = "browser"
+        
+        self.page = None
         self.driver.get(url)
-        time.sleep(3)
+        self.wait.until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    
+    def use_browser(self):
+        """Pastikan halaman saat ini terbuka di browser (untuk klik, scroll, screenshot)"""
+        if self.page is not None:
+            url = self.page.current_url
+            self.page = None
+            self.driver.get(url)
+        return self.driver
     
     def find_element(self, by, value, timeout=10):
         """Cari single element"""
+        if self.page is not None:
+            elements = self.page.find_elements(by, value)
+            if not elements:
+                print(f"⚠️  Element tidak ditemukan: {value}")
+            return elements[0] if elements else None
         try:
             wait = WebDriverWait(self.driver, timeout)
             element = wait.until(EC.presence_of_element_located((by, value)))
@@ -59,7 +138,7 @@ class UniversalScraper:
     def find_elements(self, by, value):
         """Cari multiple elements"""
         try:
-            elements = self.driver.find_elements(by, value)
+            elements = (self.page or self.driver).find_elements(by, value)
             print(f"📦 Menemukan {len(elements)} elements")
             return elements
         except Exception as e:
@@ -81,7 +160,7 @@ class UniversalScraper:
             return "N/A"
     
     def click_element(self, element):
-        """Klik element"""
+        """Klik element (hanya element dari browser, bukan dari halaman HTTP)"""
         try:
             element.click()
             time.sleep(2)
@@ -100,47 +179,96 @@ class UniversalScraper:
             print(f"⚠️  Tidak bisa input text: {str(e)}")
             return False
     
-    def scroll_to_bottom(self, pause_time=2):
-        """Scroll ke bawah halaman"""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        
-        while True:
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(pause_time)
-            
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+    def scroll_to_bottom(self, pause_time=2, schema=None, item_selector=None, key=None, target=None,
+                         container=None, end_selector=None, min_rate=0):
+        """Scroll ke bawah halaman (infinite scroll) dan kumpulkan item selama scroll
+
+        Tanpa sleep tetap: berhenti jika tidak ada konten / item baru selama
+        pause_time detik, target item tercapai, atau end_selector muncul.
+        schema / item_selector: item dikumpulkan MutationObserver saat dirender
+        (aman untuk list virtual yang membuang item lama dari DOM), dedup per key.
+        Return list record (format extract_list) jika schema diberikan,
+        list item mentah jika hanya item_selector, selain itu [].
+        """
+        self.use_browser()
+        harvester = ScrollHarvester(
+            self.driver, item_selector=item_selector, schema=schema, key=key, container=container,
+            end_selector=end_selector, target=target, idle_timeout=pause_time, min_rate=min_rate,
+        )
+        items = harvester.harvest()
+        print(f"📜 Scroll selesai: {len(items)} item, {harvester.polls} scroll ({harvester.stop_reason})")
+        if schema:
+            return harvester.records()
+        return items
     
     def scroll_by_pixels(self, pixels=1000):
         """Scroll sejumlah pixels"""
+        self.use_browser()
         self.driver.execute_script(f"window.scrollBy(0, {pixels});")
         time.sleep(1)
     
     def take_screenshot(self, filename):
         """Ambil screenshot"""
+        self.use_browser()
         self.driver.save_screenshot(filename)
         print(f"📸 Screenshot disimpan: {filename}")
     
+    def save(self, data, filename, fieldnames=None):
+        """Simpan data, format dari ekstensi (.json, .jsonl, .csv, .parquet, + .gz / .zst)"""
+        return write_records(data, filename, fieldnames=fieldnames)
+    
     def save_to_json(self, data, filename):
         """Simpan data ke JSON"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"💾 Data disimpan ke {filename}")
+        return self.save(data, filename)
     
-    def save_to_csv(self, data, filename):
-        """Simpan data ke CSV"""
+    def save_to_csv(self, data, filename, fieldnames=None):
+        """Simpan data ke CSV (kolom dari fieldnames atau record pertama)"""
         if not data:
             print("⚠️  Tidak ada data untuk disimpan")
-            return
+            return 0
+        return self.save(data, filename, fieldnames)
+    
+    def extract_list(self, schema, start_index=1):
+        """Semua item di halaman saat ini sesuai schema (lihat list_schema)
+
+        Browser: satu execute_script per halaman, halaman HTTP: parse lxml
+        """
+        try:
+            items = extract_list(self.page or self.driver, schema, start_index)
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            return []
+        print(f"📦 Menemukan {len(items)} item")
+        return items
+    
+    def crawl(self, start_urls, schema, outputs=(), **crawler_kwargs):
+        """Crawl banyak halaman (pagination / sitemap) lewat HTTP, record langsung ke file outputs
+
+        crawler_kwargs diteruskan ke Crawler (workers, max_pages, follow, delay, ...)
+        """
+        schema = schema if isinstance(schema.get("fields"), list) else compile_schema(schema)
+        fieldnames = ["index"] + [field["name"] for field in schema["fields"]] + ["scraped_at", "url"]
+        writers = [open_writer(filename, fieldnames=fieldnames) for filename in outputs]
+        crawler = Crawler(schema=schema, writers=writers, http=self.http, **crawler_kwargs)
+        try:
+            stats = crawler.run(start_urls)
+        finally:
+            for writer in writers:
+                writer.close()
+            if self.http is None:
+                crawler.http.close()
         
-        keys = data[0].keys()
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(data)
-        print(f"💾 Data disimpan ke {filename}")
+        print_stats(stats)
+        for filename in outputs:
+            print(f"💾 Data disimpan ke {filename}")
+        return stats
+    
+    def scrape_quotes(self):
+        """Extract semua quote di halaman yang sedang terbuka (quotes.toscrape.com)"""
+        quotes_data = self.extract_list(QUOTES_SCHEMA)
+        for quote_data in quotes_data:
+            print(f"✅ [{quote_data['index']}] {quote_data['author']}: {quote_data['quote'][:50]}...")
+        return quotes_data
     
     def wait_for_seconds(self, seconds):
         """Tunggu beberapa detik"""
@@ -148,9 +276,13 @@ class UniversalScraper:
         time.sleep(seconds)
     
     def close(self):
-        """Tutup browser"""
-        self.driver.quit()
-        print("🔒 Browser ditutup")
+        """Tutup browser (atau kembalikan ke pool) dan koneksi HTTP"""
+        if self.http:
+            self.http.close()
+        if self._session is None:
+            return
+        self._session.close()
+        print("🔁 Browser dikembalikan ke pool" if self.pool else "🔒 Browser ditutup")
 
 # ============================================================================
 # CONTOH PENGGUNAAN
@@ -162,49 +294,53 @@ def example_scrape_quotes():
     print("📚 CONTOH: SCRAPING QUOTES")
     print("=" * 60)
     
-    scraper = UniversalScraper(headless=False)
+    if not lxml_available():
+        # Tanpa lxml / cssselect: buka halaman satu per satu lewat browser
+        print("⚠️  lxml / cssselect belum terpasang (pip3 install lxml cssselect), pakai browser")
+        example_scrape_quotes_browser()
+        return
+    
+    # Halaman statis: cukup HTTP, tanpa browser
+    scraper = UniversalScraper(headless=False, mode="http")
     
     try:
-        # 1. Buka website
-        scraper.open_url("http://quotes.toscrape.com/")
+        # Ikuti link "Next" dari halaman 1 sampai halaman terakhir, record langsung ditulis ke file
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        stats = scraper.crawl(
+            QUOTES_URL, QUOTES_SCHEMA,
+            outputs=[f"quotes_{timestamp}.json", f"quotes_{timestamp}.csv"],
+            workers=2, max_pages=20,
+        )
         
-        # 2. Cari semua quotes
-        quote_elements = scraper.find_elements(By.CLASS_NAME, "quote")
+        if stats["records"]:
+            print(f"\n✨ Berhasil scraping {stats['records']} quotes dari {stats['pages']} halaman!")
         
-        # 3. Extract data
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+    
+    finally:
+        scraper.close()
+        print("\n✅ Selesai!")
+
+def example_scrape_quotes_browser(max_pages=20):
+    """Contoh quotes lewat Selenium saja (tanpa lxml): ikuti link "Next" di browser"""
+    scraper = UniversalScraper(headless=False, mode="browser")
+    
+    try:
         quotes_data = []
-        for idx, quote_elem in enumerate(quote_elements, 1):
-            try:
-                # Ambil text quote
-                text = quote_elem.find_element(By.CLASS_NAME, "text").text
-                
-                # Ambil author
-                author = quote_elem.find_element(By.CLASS_NAME, "author").text
-                
-                # Ambil tags
-                tag_elements = quote_elem.find_elements(By.CLASS_NAME, "tag")
-                tags = [tag.text for tag in tag_elements]
-                
-                quote_data = {
-                    "index": idx,
-                    "quote": text,
-                    "author": author,
-                    "tags": tags,
-                    "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                quotes_data.append(quote_data)
-                print(f"✅ [{idx}] {author}: {text[:50]}...")
-                
-            except Exception as e:
-                print(f"⚠️  Error pada quote {idx}: {str(e)}")
-                continue
+        url = QUOTES_URL
+        for _ in range(max_pages):
+            scraper.open_url(url)
+            quotes_data.extend(scraper.extract_list(QUOTES_SCHEMA, start_index=len(quotes_data) + 1))
+            next_links = scraper.driver.find_elements(By.CSS_SELECTOR, "li.next a")
+            if not next_links:
+                break
+            url = next_links[0].get_attribute("href")
         
-        # 4. Simpan data
         if quotes_data:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            scraper.save_to_json(quotes_data, f"quotes_{timestamp}.json")
-            scraper.save_to_csv(quotes_data, f"quotes_{timestamp}.csv")
+            scraper.save(quotes_data, f"quotes_{timestamp}.json")
+            scraper.save(quotes_data, f"quotes_{timestamp}.csv")
             print(f"\n✨ Berhasil scraping {len(quotes_data)} quotes!")
         
     except Exception as e:
@@ -244,6 +380,7 @@ def custom_scraper():
         print("\n💡 Tips:")
         print("   - Inspect element di browser untuk cari CSS selector")
         print("   - Gunakan scraper.find_elements(By.CSS_SELECTOR, 'your-selector')")
+        print("   - Atau scraper.extract_list(schema) untuk semua item sekaligus (lihat QUOTES_SCHEMA)")
         print("   - Modifikasi function ini sesuai kebutuhan Anda")
         
     except Exception as e:
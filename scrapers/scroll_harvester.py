@@ -0,0 +1,198 @@
+"""
+Scroll Harvester (infinite scroll)
+Pasang MutationObserver di halaman, kumpulkan item yang cocok dengan selector
+begitu dirender (sebelum list virtual membuangnya dari DOM), dedup per key,
+lalu scroll terus sampai target tercapai, penanda akhir muncul, atau tidak ada
+item baru dalam idle_timeout detik. Tidak ada sleep tetap: setiap poll
+menunggu di browser sampai ada item / perubahan baru (atau batas wait_ms).
+"""
+
+from list_schema import READ_ITEM_JS, compile_schema, finish_records
+import time
+
+# Dipasang sekali per harvest. arguments: config, container scroll (atau null = window)
+INSTALL_JS = READ_ITEM_JS + """
+const cfg = arguments[0];
+const root = arguments[1] || document.body;
+if (window.__scrollHarvest) window.__scrollHarvest.observer.disconnect();
+const state = window.__scrollHarvest = {items: [], keys: new Set(), cursor: 0, end: false,
+                                        mutations: 0, waiters: []};
+const endPattern = cfg.end_text ? new RegExp(cfg.end_text, 'i') : null;
+const keyOf = (item, record) => {
+    if (cfg.key && record[cfg.key]) return record[cfg.key];
+    if (cfg.key && item.getAttribute(cfg.key)) return item[cfg.key] || item.getAttribute(cfg.key);
+    const anchor = item.matches('a[href]') ? item : item.querySelector('a[href]');
+    return anchor ? anchor.href : (item.innerText || item.textContent || '').trim().slice(0, 200);
+};
+const collect = (item) => {
+    const record = cfg.fields.length ? readItem(item, cfg.fields) : {};
+    const key = keyOf(item, record);
+    if (!key || state.keys.has(key)) return;
+    state.keys.add(key);
+    record.__key = key;
+    state.items.push(record);
+};
+const scan = (node) => {
+    if (!cfg.selector || node.nodeType !== 1) return;
+    if (node.matches(cfg.selector)) collect(node);
+    node.querySelectorAll(cfg.selector).forEach(collect);
+};
+const checkEnd = () => {
+    if (state.end) return;
+    if (cfg.end_selector && document.querySelector(cfg.end_selector)) state.end = true;
+    else if (endPattern && root.lastElementChild && endPattern.test(root.lastElementChild.innerText || '')) state.end = true;
+    // Item yang mutasinya belum diproses tetap ikut sebelum harvest berhenti
+    if (state.end) scan(root);
+};
+state.observer = new MutationObserver((mutations) => {
+    state.mutations += mutations.length;
+    for (const mutation of mutations) mutation.addedNodes.forEach(scan);
+    checkEnd();
+    const waiters = state.waiters;
+    state.waiters = [];
+    waiters.forEach((wake) => wake());
+});
+state.observer.observe(root, {childList: true, subtree: true});
+scan(root);
+checkEnd();
+return state.items.length;
+"""
+
+# Satu poll: scroll ke bawah lalu tunggu di browser sampai ada item baru / mutasi
+# (maks wait_ms), return item baru sejak poll sebelumnya
+POLL_JS = """
+const container = arguments[0];
+const waitMs = arguments[1];
+const needItems = arguments[2];
+const done = arguments[arguments.length - 1];
+const state = window.__scrollHarvest;
+if (!state) return done(null);
+const scroller = container || document.scrollingElement;
+const mutationsBefore = state.mutations;
+scroller.scrollTop = scroller.scrollHeight;
+let finished = false;
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    const items = state.items.slice(state.cursor);
+    state.cursor = state.items.length;
+    done({items: items, total: state.items.length, end: state.end,
+          changed: state.mutations > mutationsBefore, height: scroller.scrollHeight});
+};
+if (state.items.length > state.cursor || state.end) return finish();
+setTimeout(finish, waitMs);
+// Tanpa selector item: cukup ada mutasi; dengan selector: tunggu item baru
+const wake = () => {
+    if (!needItems || state.items.length > state.cursor || state.end) finish();
+    else state.waiters.push(wake);
+};
+state.waiters.push(wake);
+"""
+
+STOP_JS = """
+const state = window.__scrollHarvest;
+if (state) { state.observer.disconnect(); delete window.__scrollHarvest; }
+"""
+
+class ScrollHarvester:
+    """Kumpulkan item infinite scroll secara incremental lewat MutationObserver
+
+    item_selector: selector CSS item (None = hanya scroll sampai konten berhenti bertambah)
+    schema: field per item (format list_schema), dibaca saat item dirender
+    key: nama field / atribut untuk dedup (default href link pertama, lalu teks)
+    container: WebElement yang di-scroll (None = window)
+    end_selector / end_text: penanda akhir daftar (selector, atau regex teks child terakhir container)
+    target: berhenti setelah sekian item unik
+    idle_timeout: berhenti jika tidak ada item baru (atau konten baru) selama sekian detik
+    min_rate: berhenti jika item baru per detik (rata-rata idle_timeout terakhir) di bawah ini
+    """
+
+    def __init__(self, driver, item_selector=None, schema=None, key=None, container=None,
+                 end_selector=None, end_text=None, target=None, idle_timeout=3.0, min_rate=0,
+                 wait_ms=1000, max_seconds=300):
+        self.driver = driver
+        self.item_selector = item_selector
+        self.fields = []
+        if schema:
+            compiled = schema if isinstance(schema.get("fields"), list) else compile_schema(schema)
+            self.item_selector = item_selector or compiled["container"]
+            self.fields = compiled["fields"]
+        self.schema = {"fields": self.fields}
+        self.key = key
+        self.container = container
+        self.end_selector = end_selector
+        self.end_text = end_text
+        self.target = target
+        self.idle_timeout = idle_timeout
+        self.min_rate = min_rate
+        self.wait_ms = wait_ms
+        self.max_seconds = max_seconds
+        self.items = []
+        self.polls = 0
+        self.stop_reason = None
+
+    def harvest(self):
+        """Scroll + kumpulkan sampai berhenti, return list item (urutan render)"""
+        config = {
+            "selector": self.item_selector,
+            "fields": self.fields,
+            "key": self.key,
+            "end_selector": self.end_selector,
+            "end_text": self.end_text,
+        }
+        self.driver.execute_script(INSTALL_JS, config, self.container)
+        started = time.monotonic()
+        last_progress = started
+        history = [(started, 0)]
+        try:
+            while True:
+                state = self.driver.execute_async_script(POLL_JS, self.container, self.wait_ms,
+                                                         bool(self.item_selector))
+                self.polls += 1
+                if state is None:
+                    self.stop_reason = "halaman berganti"
+                    break
+                now = time.monotonic()
+                self.items.extend(state["items"])
+                if state["items"] or (not self.item_selector and state["changed"]):
+                    last_progress = now
+                history.append((now, len(self.items)))
+                while len(history) > 2 and history[1][0] <= now - self.idle_timeout:
+                    history.pop(0)
+
+                if self.target and len(self.items) >= self.target:
+                    self.stop_reason = "target tercapai"
+                    break
+                if state["end"]:
+                    self.stop_reason = "akhir daftar"
+                    break
+                if now - last_progress >= self.idle_timeout:
+                    self.stop_reason = "tidak ada item baru"
+                    break
+                if self.min_rate and self._rate(history, now) < self.min_rate:
+                    self.stop_reason = "item baru terlalu lambat"
+                    break
+                if now - started >= self.max_seconds:
+                    self.stop_reason = "batas waktu"
+                    break
+        finally:
+            try:
+                self.driver.execute_script(STOP_JS)
+            except Exception:
+                pass
+        return self.items[:self.target] if self.target else self.items
+
+    def _rate(self, history, now):
+        """Item baru per detik dalam jendela idle_timeout terakhir (inf jika jendela belum penuh)"""
+        if now - history[0][0] < self.idle_timeout:
+            return float("inf")
+        window_start = now - self.idle_timeout
+        baseline = next(count for at, count in reversed(history) if at <= window_start)
+        return (len(self.items) - baseline) / self.idle_timeout
+
+    def records(self, start_index=1):
+        """Item hasil harvest dalam format record list_schema (index, default, scraped_at)"""
+        return finish_records(self.items[:self.target] if self.target else self.items, self.schema, start_index)
+
+    def keys(self):
+        return [item["__key"] for item in (self.items[:self.target] if self.target else self.items)]
@@ -0,0 +1,203 @@
+"""
+Selector Chain (fallback selector dengan urutan belajar)
+Daftar selector fallback untuk satu field. Hanya selector primary (sama
+spesifiknya, mis. varian layout) yang diurutkan ulang: yang terakhir cocok di
+sesi ini dicoba duluan, seri diputus dengan jumlah hit lintas run (disimpan ke
+JSON). Fallback umum selalu dicoba terakhir dengan urutan asli, supaya hit
+sesekali tidak membuatnya menutupi selector yang spesifik (nilai bisa beda).
+Pencarian memakai find_elements (list kosong saat tidak cocok), bukan
+find_element yang raise.
+
+Statistik hit/miss juga dipakai untuk melaporkan selector yang tidak pernah
+cocok lagi (kandidat dihapus / diganti).
+"""
+
+from static_dom import By
+import os
+import json
+import threading
+
+DEFAULT_STATS_FILE = os.path.join(os.path.expanduser("~"), ".cache", "scraping_project", "selector_stats.json")
+
+class SelectorStats:
+    """Hit / miss per (chain, selector), digabung ke file JSON saat save()
+
+    path None = hanya di memori (mis. benchmark).
+    """
+
+    def __init__(self, path=DEFAULT_STATS_FILE):
+        self.path = path
+        self.stats = {}
+        self._pending = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Baca file statistik sekali (lazy), file rusak / tidak ada = mulai kosong"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for chain, selectors in saved.items():
+            for selector, counts in selectors.items():
+                self._add(self.stats, chain, selector, counts.get("hits", 0), counts.get("misses", 0))
+
+    def _add(self, target, chain, selector, hits, misses):
+        counts = target.setdefault(chain, {}).setdefault(selector, {"hits": 0, "misses": 0})
+        counts["hits"] += hits
+        counts["misses"] += misses
+
+    def record(self, chain, selector, hit):
+        with self._lock:
+            self._load()
+            for target in (self.stats, self._pending):
+                self._add(target, chain, selector, int(hit), int(not hit))
+
+    def hits(self, chain, selector):
+        with self._lock:
+            self._load()
+            return self.stats.get(chain, {}).get(selector, {}).get("hits", 0)
+
+    def save(self):
+        """Tambahkan hit / miss sejak save terakhir ke file (aman dipakai beberapa proses bergantian)"""
+        with self._lock:
+            if not self.path or not self._pending:
+                return
+            merged = {}
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    merged = json.load(f)
+            except (OSError, ValueError):
+                pass
+            for chain, selectors in self._pending.items():
+                for selector, counts in selectors.items():
+                    self._add(merged, chain, selector, counts["hits"], counts["misses"])
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+            self._pending = {}
+
+    def never_matched(self, min_attempts=20):
+        """Selector tanpa hit sama sekali setelah minimal min_attempts percobaan"""
+        with self._lock:
+            self._load()
+            return [(chain, selector, counts["misses"])
+                    for chain, selectors in sorted(self.stats.items())
+                    for selector, counts in selectors.items()
+                    if not counts["hits"] and counts["misses"] >= min_attempts]
+
+    def print_stats(self, min_attempts=20):
+        """Tampilkan hit rate setiap chain dan selector yang tidak pernah cocok"""
+        with self._lock:
+            self._load()
+            chains = {chain: dict(selectors) for chain, selectors in sorted(self.stats.items())}
+        if not chains:
+            return
+        print("\n🎯 SELECTOR CHAIN:")
+        for chain, selectors in chains.items():
+            parts = []
+            for selector, counts in sorted(selectors.items(), key=lambda item: -item[1]["hits"]):
+                parts.append(f"{selector} {counts['hits']}/{counts['hits'] + counts['misses']}")
+            print(f"   {chain:<22} " + " | ".join(parts))
+        dead = self.never_matched(min_attempts)
+        if dead:
+            print(f"⚠️  Selector tidak pernah cocok (>= {min_attempts} percobaan):")
+            for chain, selector, misses in dead:
+                print(f"   {chain}: {selector} ({misses} miss)")
+
+# Statistik bersama untuk semua scraper di proses ini
+SELECTOR_STATS = SelectorStats()
+
+class SelectorChain:
+    """Selector fallback satu field dengan urutan yang dipelajari
+
+    Iterasi chain memberi selector sesuai urutan saat ini; pemanggil yang
+    memakai loop sendiri (mis. wait per selector) cukup memanggil hit / miss.
+    primary: jumlah selector awal yang boleh diurutkan ulang (None = semua),
+    sisanya fallback umum dengan urutan tetap.
+    """
+
+    def __init__(self, name, selectors, stats=SELECTOR_STATS, by=By.CSS_SELECTOR, primary=None):
+        self.name = name
+        self.selectors = list(selectors)
+        self.stats = stats
+        self.by = by
+        self.primary = len(self.selectors) if primary is None else primary
+        self.last_hit = None
+
+    def ordered(self):
+        """Primary: terakhir cocok di sesi ini dulu, lalu hit lintas run, seri = urutan asli; lalu fallback"""
+        primary, fallbacks = self.selectors[:self.primary], self.selectors[self.primary:]
+        hits = {selector: self.stats.hits(self.name, selector) for selector in primary} if self.stats else {}
+        return sorted(primary, key=lambda selector: (selector != self.last_hit, -hits.get(selector, 0))) + fallbacks
+
+    def __iter__(self):
+        return iter(self.ordered())
+
+    def hit(self, selector):
+        if selector in self.selectors[:self.primary]:
+            self.last_hit = selector
+        if self.stats:
+            self.stats.record(self.name, selector, True)
+
+    def miss(self, selector):
+        if self.stats:
+            self.stats.record(self.name, selector, False)
+
+    def record(self, tried, matched):
+        """Catat hasil pencarian di luar Python (mis. JS): selector sebelum matched di tried = miss"""
+        for selector in tried:
+            if selector == matched:
+                self.hit(selector)
+                return
+            self.miss(selector)
+
+    def find_all(self, root):
+        """(selector, elements) dari selector pertama yang menghasilkan element"""
+        for selector in self:
+            try:
+                elements = root.find_elements(self.by, selector)
+            except Exception:
+                elements = []
+            if elements:
+                self.hit(selector)
+                return selector, elements
+            self.miss(selector)
+        return None, []
+
+    def first(self, root, pick=None, default="N/A"):
+        """Nilai pick(element) pertama yang tidak kosong (default: teks element)
+
+        pick boleh raise / return kosong: selector dianggap miss dan lanjut ke berikutnya.
+        """
+        for selector in self:
+            try:
+                elements = root.find_elements(self.by, selector)
+                value = (pick(elements[0]) if pick else elements[0].text) if elements else None
+            except Exception:
+                value = None
+            if value:
+                self.hit(selector)
+                return value
+            self.miss(selector)
+        return default
+
+def main():
+    """Tampilkan statistik selector dari file (python3 scrapers/selector_chain.py [path])"""
+    import sys
+    stats = SelectorStats(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATS_FILE)
+    if not os.path.exists(stats.path):
+        print(f"⚠️  Belum ada statistik selector: {stats.path}")
+        return
+    stats.print_stats()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Shop Catalog Crawler (Tokopedia)
+Crawl katalog lengkap toko-toko yang muncul di hasil search_products, lewat API
+GraphQL toko (tanpa browser), beberapa toko bersamaan dengan jumlah worker
+terbatas. Setiap toko menyimpan high-water mark (product id terbesar yang sudah
+dilihat) plus fingerprint produk di SQLite, jadi sync berikutnya (mis. nightly)
+hanya menulis produk baru / berubah dan berhenti membuka halaman katalog begitu
+sudah melewati produk lama.
+
+Pemakaian:
+    python3 scrapers/shop_catalog.py laptop --search-max 120 --workers 4 --output katalog.jsonl
+    python3 scrapers/shop_catalog.py --shops advan-store-cirebon,hp-store-barat --full
+"""
+
+from tokopedia_api import TokopediaShopApi, shop_product_to_record
+from extractors import tokopedia_shop_domain
+from output_writers import check_writer, open_writer
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import os
+import time
+import sqlite3
+import argparse
+import threading
+
+DEFAULT_STORE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "scraping_project", "shop_catalog.sqlite3")
+
+# Kolom output katalog: kolom produk Tokopedia + id produk, stok dan status sync
+CATALOG_FIELDNAMES = ["index", "product_id", "name", "price", "rating", "shop", "location", "link",
+                      "stock", "sync", "scraped_at"]
+
+def shops_from_products(products):
+    """Toko unik (urutan kemunculan) dari record search_products: [{"domain", "name", "location"}]"""
+    shops = {}
+    for product in products:
+        domain = tokopedia_shop_domain(product)
+        if domain and domain not in shops:
+            shops[domain] = {"domain": domain, "name": product.get("shop"), "location": product.get("location")}
+    return list(shops.values())
+
+def _product_id(record):
+    """product_id record sebagai int, atau None jika kosong / bukan angka"""
+    try:
+        return int(record.get("product_id"))
+    except (TypeError, ValueError):
+        return None
+
+def _fingerprint(record):
+    """Bagian listing yang dianggap "berubah" saat berbeda (rating / ulasan diabaikan)"""
+    return f"{record['name']}|{record['price']}|{record['stock']}"
+
+class CatalogStore:
+    """High-water mark per toko + fingerprint per produk (SQLite, aman dipakai banyak thread)"""
+
+    def __init__(self, path=DEFAULT_STORE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS shops (
+                domain TEXT PRIMARY KEY,
+                shop_id TEXT,
+                name TEXT,
+                location TEXT,
+                high_water INTEGER,
+                products INTEGER DEFAULT 0,
+                last_sync REAL
+            );
+            CREATE TABLE IF NOT EXISTS products (
+                domain TEXT NOT NULL,
+                product_id INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (domain, product_id)
+            );
+        """)
+        self._conn.commit()
+
+    def shop(self, domain):
+        """Status sync toko: {"shop_id", "name", "location", "high_water", "products", "last_sync"} atau None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT shop_id, name, location, high_water, products, last_sync FROM shops WHERE domain = ?", (domain,)
+            ).fetchone()
+        if not row:
+            return None
+        return dict(zip(("shop_id", "name", "location", "high_water", "products", "last_sync"), row))
+
+    def diff(self, domain, records):
+        """Bandingkan satu halaman dengan fingerprint tersimpan, return [(record, "new" | "changed")]
+
+        Record tanpa product_id valid dilewati (saring dulu dengan _product_id).
+        """
+        records = [record for record in records if _product_id(record) is not None]
+        ids = [_product_id(record) for record in records]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT product_id, fingerprint FROM products WHERE domain = ? AND product_id IN ({','.join('?' * len(ids))})",
+                [domain, *ids]
+            ).fetchall() if ids else []
+        known = dict(rows)
+        changes = []
+        for record in records:
+            old = known.get(_product_id(record))
+            if old is None:
+                changes.append((record, "new"))
+            elif old != _fingerprint(record):
+                changes.append((record, "changed"))
+        return changes
+
+    def put_products(self, domain, records):
+        """Simpan fingerprint produk yang baru / berubah"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO products (domain, product_id, fingerprint, updated_at) VALUES (?, ?, ?, ?)",
+                [(domain, _product_id(record), _fingerprint(record), now)
+                 for record in records if _product_id(record) is not None]
+            )
+            self._conn.commit()
+
+    def finish_shop(self, shop, shop_id, high_water):
+        """Catat high-water mark setelah sync toko selesai tanpa error"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM products WHERE domain = ?", (shop["domain"],)).fetchone()[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shops (domain, shop_id, name, location, high_water, products, last_sync) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (shop["domain"], shop_id, shop.get("name"), shop.get("location"), high_water, count, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class ShopCatalogCrawler:
+    """Sync katalog beberapa toko dengan maksimal workers toko bersamaan
+
+    full: abaikan high-water mark dan buka semua halaman (produk tetap di-diff,
+    jadi hanya yang baru / berubah yang ditulis).
+    max_pages: batas halaman katalog per toko.
+    """
+
+    def __init__(self, store=None, api=None, workers=4, writers=(), full=False, max_pages=100):
+        self.store = store or CatalogStore()
+        self.api = api or TokopediaShopApi()
+        self.workers = workers
+        self.writers = list(writers)
+        self.full = full
+        self.max_pages = max_pages
+        self.records = 0
+        self.elapsed = 0.0
+        self._write_lock = threading.Lock()
+
+    def _emit(self, changes):
+        """Tulis record baru / berubah ke semua writer (index global, urutan selesai)"""
+        with self._write_lock:
+            for record, status in changes:
+                self.records += 1
+                record = dict(record, index=self.records, sync=status)
+                for writer in self.writers:
+                    writer.write(record)
+
+    def sync_shop(self, shop):
+        """Sync satu toko, return statistik {"domain", "pages", "new", "changed", "stopped"}"""
+        domain = shop["domain"]
+        state = self.store.shop(domain) or {}
+        shop = dict(shop, name=shop.get("name") or state.get("name"), location=shop.get("location") or state.get("location"))
+        shop_id = state.get("shop_id")
+        if not shop_id:
+            info = self.api.shop_info(domain)
+            if not info:
+                return {"domain": domain, "pages": 0, "new": 0, "changed": 0, "stopped": "toko tidak ditemukan"}
+            shop_id = info["shop_id"]
+            shop = dict(shop, name=shop.get("name") or info["name"], location=shop.get("location") or info["location"])
+        high_water = None if self.full else state.get("high_water")
+
+        stats = {"domain": domain, "pages": 0, "new": 0, "changed": 0, "invalid": 0, "stopped": "katalog habis"}
+        newest = high_water or 0
+        for page in range(1, self.max_pages + 1):
+            raw_products, has_next = self.api.shop_products(shop_id, page, domain)
+            stats["pages"] += 1
+            if not raw_products:
+                break
+            records = [shop_product_to_record(product, idx, shop) for idx, product in enumerate(raw_products, 1)]
+            # Produk tanpa id angka tidak bisa di-diff / dipakai untuk high-water mark, lewati saja
+            valid = [record for record in records if _product_id(record) is not None]
+            if len(valid) < len(records):
+                stats["invalid"] += len(records) - len(valid)
+                print(f"⚠️  {domain} halaman {page}: {len(records) - len(valid)} produk tanpa product_id valid dilewati")
+            changes = self.store.diff(domain, valid)
+            if changes:
+                self.store.put_products(domain, [record for record, _ in changes])
+                self._emit(changes)
+            for _, status in changes:
+                stats[status] += 1
+            ids = [_product_id(record) for record in valid]
+            newest = max([newest] + ids)
+            # Katalog terbaru dulu: halaman tanpa perubahan yang sudah melewati high-water mark = sisa katalog sudah dikenal
+            if high_water is not None and ids and not changes and min(ids) <= high_water:
+                stats["stopped"] = "sampai high-water mark"
+                break
+            if not has_next:
+                break
+        else:
+            stats["stopped"] = "batas halaman"
+
+        self.store.finish_shop(shop, shop_id, newest)
+        return stats
+
+    def run(self, shops):
+        """Sync semua toko, return list statistik per toko"""
+        started = time.monotonic()
+        results = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shop-sync") as executor:
+            futures = {executor.submit(self.sync_shop, shop): shop for shop in shops}
+            for future in as_completed(futures):
+                domain = futures[future]["domain"]
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    print(f"⚠️  Toko {domain} gagal: {str(e)}")
+                    results.append({"domain": domain, "pages": 0, "new": 0, "changed": 0, "invalid": 0,
+                                    "stopped": f"error: {e}"})
+                    continue
+                results.append(stats)
+                invalid = f", {stats['invalid']} tanpa id dilewati" if stats["invalid"] else ""
+                print(f"🏪 {domain}: {stats['new']} baru, {stats['changed']} berubah{invalid}, "
+                      f"{stats['pages']} halaman ({stats['stopped']})")
+        self.elapsed = time.monotonic() - started
+        return results
+
+    def print_stats(self, results):
+        """Ringkasan sync semua toko"""
+        new = sum(stats["new"] for stats in results)
+        changed = sum(stats["changed"] for stats in results)
+        pages = sum(stats["pages"] for stats in results)
+        print(f"\n🏪 SHOP SYNC: {len(results)} toko, {pages} halaman, {new} produk baru, {changed} berubah, "
+              f"{self.api.requests} request API dalam {self.elapsed:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync katalog toko Tokopedia (incremental, tanpa browser)")
+    parser.add_argument("keyword", nargs="?", help="keyword search_products untuk mencari toko")
+    parser.add_argument("--shops", help="domain toko dipisah koma (tanpa search)")
+    parser.add_argument("--search-max", type=int, default=60, help="jumlah produk search untuk mengumpulkan toko")
+    parser.add_argument("--workers", type=int, default=4, help="jumlah toko yang di-sync bersamaan")
+    parser.add_argument("--max-pages", type=int, default=100, help="batas halaman katalog per toko")
+    parser.add_argument("--full", action="store_true", help="abaikan high-water mark, buka semua halaman")
+    parser.add_argument("--store", default=DEFAULT_STORE_FILE, help="file SQLite high-water mark")
+    parser.add_argument("--endpoint", help="endpoint GraphQL (mis. mock fixture server)")
+    parser.add_argument("--output", help="file hasil produk baru / berubah (default: katalog_<timestamp>.jsonl)")
+    args = parser.parse_args()
+    output = args.output or f"katalog_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    try:
+        check_writer(output)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+
+    if args.shops:
+        shops = [{"domain": domain.strip()} for domain in args.shops.split(",") if domain.strip()]
+    elif args.keyword:
+        from scraper_tokopedia import TokopediaScraper
+        searcher = TokopediaScraper(engine="api", **({"api_url": args.endpoint} if args.endpoint else {}))
+        try:
+            shops = shops_from_products(searcher.search_products(args.keyword, args.search_max))
+        finally:
+            searcher.close()
+    else:
+        parser.error("butuh keyword atau --shops")
+    print(f"🏪 {len(shops)} toko akan di-sync ({args.workers} bersamaan)")
+
+    store = CatalogStore(args.store)
+    api = TokopediaShopApi(endpoint=args.endpoint, maxsize=args.workers)
+    writer = open_writer(output, fieldnames=CATALOG_FIELDNAMES)
+    crawler = ShopCatalogCrawler(store, api, workers=args.workers, writers=[writer],
+                                 full=args.full, max_pages=args.max_pages)
+    try:
+        results = crawler.run(shops)
+        crawler.print_stats(results)
+        print(f"💾 {crawler.records} produk baru / berubah disimpan ke {output}")
+    finally:
+        writer.close()
+        api.close()
+        store.close()
+
+if __name__ == "__main__":
+    main()
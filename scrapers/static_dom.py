@@ -0,0 +1,141 @@
+"""
+Static DOM (lxml)
+Pembungkus HTML tersimpan dengan interface mirip Selenium WebElement
+(find_element, find_elements, text, get_attribute), supaya fungsi extract
+yang sama bisa dijalankan tanpa WebDriver
+"""
+
+from urllib.parse import urljoin
+import re
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    from cssselect import HTMLTranslator
+except ImportError:
+    lxml_html = None
+
+class By:
+    """Konstanta locator, nilainya sama dengan selenium.webdriver.common.by.By"""
+    ID = "id"
+    XPATH = "xpath"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
+
+class NoSuchElementException(Exception):
+    """Element tidak ditemukan (padanan exception Selenium)"""
+
+# Element yang isinya tidak pernah tampil di layar (tidak ikut .text)
+_HIDDEN_TAGS = {"script", "style", "noscript", "template", "head"}
+
+# Cache XPath hasil kompilasi per (by, value), dipakai ulang untuk semua halaman
+_compiled = {}
+
+def lxml_available():
+    """True jika lxml + cssselect terpasang (mode replay / HTTP bisa dipakai)"""
+    return lxml_html is not None
+
+def require_lxml():
+    """Pastikan lxml + cssselect terpasang"""
+    if lxml_html is None:
+        raise ImportError("Mode replay / HTTP butuh lxml dan cssselect: pip install lxml cssselect")
+
+def _compile(by, value):
+    """Ubah locator Selenium menjadi XPath terkompilasi (relatif ke element)"""
+    key = (by, value)
+    if key not in _compiled:
+        if by == By.CSS_SELECTOR:
+            # descendant:: supaya element itu sendiri tidak ikut, sama seperti querySelector
+            xpath = HTMLTranslator().css_to_xpath(value, prefix="descendant::")
+        elif by == By.XPATH:
+            xpath = value
+        elif by == By.ID:
+            xpath = f"descendant::*[@id='{value}']"
+        elif by == By.NAME:
+            xpath = f"descendant::*[@name='{value}']"
+        elif by == By.TAG_NAME:
+            xpath = f"descendant::{value}"
+        elif by == By.CLASS_NAME:
+            xpath = f"descendant::*[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]"
+        else:
+            raise ValueError(f"Locator tidak didukung: {by}")
+        _compiled[key] = etree.XPath(xpath)
+    return _compiled[key]
+
+def _visible_text(node):
+    """Kira-kira sama dengan .text Selenium: teks terlihat, spasi dirapikan per baris"""
+    parts = []
+
+    def walk(el):
+        if not isinstance(el.tag, str) or el.tag in _HIDDEN_TAGS:
+            return
+        if el.tag == "br":
+            parts.append("\n")
+        if el.text:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if el.tag in ("div", "p", "li", "tr", "h1", "h2", "h3", "h4"):
+            parts.append("\n")
+
+    walk(node)
+    lines = (re.sub(r"\s+", " ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+class StaticElement:
+    """Element HTML statis dengan method yang dipakai fungsi extract"""
+
+    def __init__(self, node, base_url=None):
+        self.node = node
+        self.base_url = base_url
+
+    @property
+    def tag_name(self):
+        return self.node.tag
+
+    @property
+    def text(self):
+        return _visible_text(self.node)
+
+    def get_attribute(self, name):
+        """Ambil atribut; href/src di-resolve jadi URL absolut seperti di browser"""
+        if name == "outerHTML":
+            return lxml_html.tostring(self.node, encoding="unicode")
+        if name in ("innerText", "textContent"):
+            return self.text
+        value = self.node.get(name)
+        if value is not None and name in ("href", "src") and self.base_url:
+            return urljoin(self.base_url, value)
+        return value
+
+    def find_elements(self, by=By.ID, value=None):
+        return [StaticElement(node, self.base_url) for node in _compile(by, value)(self.node)]
+
+    def find_element(self, by=By.ID, value=None):
+        matches = _compile(by, value)(self.node)
+        if not matches:
+            raise NoSuchElementException(f"{by}: {value}")
+        return StaticElement(matches[0], self.base_url)
+
+class StaticPage(StaticElement):
+    """Halaman HTML tersimpan, dipakai seperti driver (find_element, current_url)"""
+
+    def __init__(self, source, url=None):
+        require_lxml()
+        self.page_source = source
+        self.current_url = url or ""
+        super().__init__(lxml_html.document_fromstring(source), url)
+
+    @property
+    def title(self):
+        titles = self.node.xpath("//title")
+        return titles[0].text_content().strip() if titles else ""
+
+def load_page(path, url=None):
+    """Baca file HTML tersimpan menjadi StaticPage"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return StaticPage(f.read(), url)
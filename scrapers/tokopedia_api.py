@@ -0,0 +1,227 @@
+"""
+Tokopedia Search API Engine
+Ambil hasil pencarian produk langsung dari request GraphQL yang dipakai halaman
+search Tokopedia (SearchProductQueryV4), lewat HttpSession keep-alive tanpa
+browser. Setiap produk dipetakan ke schema record yang sama dengan scraper DOM.
+
+Juga query toko (ShopInfoCore, ShopProducts) untuk crawl katalog toko, lihat
+shop_catalog.py.
+
+Bisa diarahkan ke mock lokal (fixture server benchmark) untuk dicoba offline:
+    python3 scrapers/tokopedia_api.py laptop --max 100
+    python3 scrapers/tokopedia_api.py laptop --endpoint http://127.0.0.1:8765/tokopedia/graphql
+"""
+
+from http_session import HttpSession
+from urllib.parse import urlencode, quote_plus
+from datetime import datetime
+import argparse
+import threading
+
+GQL_BASE_URL = "https://gql.tokopedia.com/graphql/"
+GQL_URL = GQL_BASE_URL + "SearchProductQueryV4"
+
+SEARCH_QUERY = """query SearchProductQueryV4($params: String!) {
+  ace_search_product_v4(params: $params) {
+    header { totalData totalDataText responseCode keywordProcess }
+    data {
+      products {
+        id name url imageUrl price priceInt discountPercentage ratingAverage countReview
+        shop { id name city url isOfficial }
+      }
+    }
+  }
+}"""
+
+# Header yang dikirim halaman search Tokopedia ke gateway GraphQL
+API_HEADERS = {
+    "Origin": "https://www.tokopedia.com",
+    "X-Source": "tokopedia-lite",
+    "X-Tkpd-Lite-Service": "zeus",
+    "X-Device": "desktop",
+}
+
+def search_params(keyword, page=1, rows=60):
+    """String params GraphQL, sama formatnya dengan query string halaman search"""
+    return urlencode({
+        "device": "desktop",
+        "ob": 23,
+        "page": page,
+        "q": keyword,
+        "rows": rows,
+        "safe_search": "false",
+        "source": "search",
+        "st": "product",
+        "start": (page - 1) * rows,
+    })
+
+def product_to_record(product, index):
+    """Produk dari response API -> record dengan kolom TokopediaScraper.FIELDNAMES"""
+    shop = product.get("shop") or {}
+    price = product.get("price")
+    if isinstance(price, dict):
+        # Versi response lain membungkus harga: {"text": "Rp...", "number": ...}
+        price = price.get("text")
+    rating = product.get("ratingAverage") or product.get("rating")
+    return {
+        "index": index,
+        "name": product.get("name") or "N/A",
+        "price": price or "N/A",
+        "rating": str(rating) if rating not in (None, "", 0, "0") else "N/A",
+        "shop": shop.get("name") or "N/A",
+        "location": shop.get("city") or "N/A",
+        "link": product.get("url") or "N/A",
+        "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def _first_response(data):
+    """Response pertama dari batch GraphQL, raise jika ada errors"""
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    errors = data.get("errors")
+    if errors:
+        raise ValueError(f"GraphQL error: {errors[0].get('message', errors[0])}")
+    return data.get("data") or {}
+
+def parse_search_response(data):
+    """Ambil (products, total) dari response (batch list atau objek tunggal)"""
+    search = _first_response(data).get("ace_search_product_v4") or {}
+    products = (search.get("data") or {}).get("products") or []
+    total = (search.get("header") or {}).get("totalData")
+    return products, total
+
+SHOP_INFO_QUERY = """query ShopInfoCore($id: Int!, $domain: String) {
+  shopInfoByID(input: {shopIDs: [$id], fields: ["core", "location"], domain: $domain, source: "shoppage"}) {
+    result { shopCore { shopID domain name url } location }
+    error { message }
+  }
+}"""
+
+SHOP_PRODUCTS_QUERY = """query ShopProducts($sid: String!, $page: Int, $perPage: Int, $etalaseId: String, $sort: Int) {
+  GetShopProduct(shopID: $sid, filter: {page: $page, perPage: $perPage, fmenu: $etalaseId, sort: $sort}) {
+    status errors
+    links { next }
+    data {
+      product_id name product_url stock
+      price { text_idr }
+      stats { averageRating reviewCount }
+    }
+  }
+}"""
+
+# Urutan katalog toko: produk terbaru dulu (dipakai untuk high-water mark sync)
+SHOP_SORT_NEWEST = 1
+
+def shop_product_to_record(product, index, shop):
+    """Produk katalog toko -> record kolom FIELDNAMES + product_id
+
+    shop: dict toko {"name", "location"} (response ShopProducts tidak membawa data toko).
+    """
+    stats = product.get("stats") or {}
+    rating = stats.get("averageRating") or stats.get("rating")
+    return {
+        "index": index,
+        "product_id": str(product.get("product_id")),
+        "name": product.get("name") or "N/A",
+        "price": (product.get("price") or {}).get("text_idr") or "N/A",
+        "rating": str(rating) if rating not in (None, "", 0, "0") else "N/A",
+        "shop": shop.get("name") or "N/A",
+        "location": shop.get("location") or "N/A",
+        "link": product.get("product_url") or "N/A",
+        "stock": product.get("stock"),
+        "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+class TokopediaSearchApi:
+    """Client GraphQL pencarian produk dengan koneksi HTTP yang dipakai ulang"""
+
+    def __init__(self, endpoint=GQL_URL, rows=60, http=None):
+        self.endpoint = endpoint
+        self.rows = rows
+        self.http = http or HttpSession(headers=API_HEADERS)
+        self.requests = 0
+
+    def search_page(self, keyword, page=1):
+        """Satu halaman hasil, return (products mentah, totalData)"""
+        payload = [{
+            "operationName": "SearchProductQueryV4",
+            "variables": {"params": search_params(keyword, page, self.rows)},
+            "query": SEARCH_QUERY,
+        }]
+        referer = f"https://www.tokopedia.com/search?st=product&q={quote_plus(keyword)}&page={page}"
+        data = self.http.post_json(self.endpoint, payload, headers={"Referer": referer})
+        self.requests += 1
+        return parse_search_response(data)
+
+    def close(self):
+        self.http.close()
+
+class TokopediaShopApi:
+    """Client GraphQL toko: info toko dari domain dan halaman katalog produk
+
+    endpoint None = URL per operation di gql.tokopedia.com, selain itu semua
+    operation dikirim ke endpoint itu (mock fixture server).
+    """
+
+    def __init__(self, endpoint=None, per_page=80, http=None, maxsize=4):
+        self.endpoint = endpoint
+        self.per_page = per_page
+        self.http = http or HttpSession(headers=API_HEADERS, maxsize=maxsize)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _post(self, operation, query, variables, referer):
+        payload = [{"operationName": operation, "variables": variables, "query": query}]
+        data = self.http.post_json(self.endpoint or GQL_BASE_URL + operation, payload, headers={"Referer": referer})
+        with self._lock:
+            self.requests += 1
+        return _first_response(data)
+
+    def shop_info(self, domain):
+        """Info toko dari domain, return {"shop_id", "domain", "name", "location"} atau None"""
+        data = self._post("ShopInfoCore", SHOP_INFO_QUERY, {"id": 0, "domain": domain},
+                          f"https://www.tokopedia.com/{domain}")
+        results = (data.get("shopInfoByID") or {}).get("result") or []
+        if not results:
+            return None
+        core = results[0].get("shopCore") or {}
+        return {
+            "shop_id": str(core.get("shopID")),
+            "domain": core.get("domain") or domain,
+            "name": core.get("name"),
+            "location": results[0].get("location"),
+        }
+
+    def shop_products(self, shop_id, page=1, domain="", sort=SHOP_SORT_NEWEST):
+        """Satu halaman katalog toko (terbaru dulu), return (products mentah, ada halaman berikutnya)"""
+        variables = {"sid": str(shop_id), "page": page, "perPage": self.per_page, "etalaseId": "etalase", "sort": sort}
+        data = self._post("ShopProducts", SHOP_PRODUCTS_QUERY, variables,
+                          f"https://www.tokopedia.com/{domain}/product/page/{page}")
+        result = data.get("GetShopProduct") or {}
+        if result.get("errors"):
+            raise ValueError(f"GetShopProduct error: {result['errors']}")
+        products = result.get("data") or []
+        return products, bool((result.get("links") or {}).get("next"))
+
+    def close(self):
+        self.http.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Cari produk Tokopedia lewat API GraphQL (tanpa browser)")
+    parser.add_argument("keyword", help="keyword pencarian")
+    parser.add_argument("--max", type=int, default=60, help="jumlah produk maksimal")
+    parser.add_argument("--endpoint", default=GQL_URL, help="URL GraphQL (mis. mock fixture server)")
+    parser.add_argument("--output", help="file hasil (.json, .jsonl, .csv, ...)")
+    args = parser.parse_args()
+
+    from scraper_tokopedia import TokopediaScraper
+    scraper = TokopediaScraper(engine="api", api_url=args.endpoint)
+    try:
+        products = scraper.search_products(args.keyword, args.max)
+        if args.output and products:
+            scraper.save(products, args.output)
+    finally:
+        scraper.close()
+
+if __name__ == "__main__":
+    main()
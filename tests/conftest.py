@@ -0,0 +1,16 @@
+"""
+Konfigurasi pytest: modul di scrapers/ dan benchmark/ diimport langsung
+(tanpa package), sama seperti saat script dijalankan dari folder tersebut.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("scrapers", "benchmark"):
+    sys.path.insert(0, os.path.join(ROOT, folder))
+
+from selector_chain import SELECTOR_STATS
+
+# Statistik selector dari test tidak ikut ditulis ke ~/.cache
+SELECTOR_STATS.path = None
@@ -0,0 +1,56 @@
+"""Extractor DOM bersama (live & replay) terhadap halaman fixture benchmark, lewat replay offline"""
+
+import pytest
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+from replay import replay_file
+from fixture_server import (
+    load_fixture, _page, maps_panel, maps_search_page, place_href, tokopedia_search_page,
+    google_search_page
+)
+
+def _replay(tmp_path, html, site="auto"):
+    path = tmp_path / "page.html"
+    path.write_text(html, encoding='utf-8')
+    return replay_file(str(path), site)
+
+def test_tokopedia_cards(tmp_path):
+    products = load_fixture("tokopedia_products.json")
+    site, records = _replay(tmp_path, tokopedia_search_page(products, "laptop"), "tokopedia")
+    assert site == "tokopedia"
+    assert len(records) == 20
+    for record, product in zip(records, products):
+        for field in ("name", "price", "rating", "shop", "location"):
+            assert record[field] == product[field]
+        assert record["link"].startswith("https://www.tokopedia.com/")
+    assert [record["index"] for record in records] == list(range(1, 21))
+
+def test_maps_place_panel(tmp_path):
+    place = load_fixture("maps_places.json")[0]
+    html = _page("Google Maps", maps_panel(place), head=f"<link rel='canonical' href='{place_href(1, place)}'>")
+    site, records = _replay(tmp_path, html)
+    assert site == "maps"
+    record = records[0]
+    for field in ("name", "category", "rating", "total_reviews", "address", "phone", "website"):
+        assert record[field] == place[field]
+    assert record["hours"] == f"Hours: {place['hours']}"
+    assert record["coordinates"] == f"{place['lat']},{place['lng']}"
+
+def test_maps_result_cards(tmp_path):
+    places = load_fixture("maps_places.json")
+    site, records = _replay(tmp_path, maps_search_page(places))
+    assert site == "maps"
+    assert len(records) == 20
+    for record, place in zip(records, places):
+        assert record["name"] == place["name"]
+        assert record["place_id"] == place["place_id"]
+        assert record["coordinates"] == f"{place['lat']},{place['lng']}"
+
+def test_google_results(tmp_path):
+    results = load_fixture("google_results.json")
+    site, records = _replay(tmp_path, google_search_page(results, "web scraping"))
+    assert site == "google"
+    assert [record["title"] for record in records] == [result["title"] for result in results[:len(records)]]
+    assert records and records[0]["link"] == results[0]["link"]
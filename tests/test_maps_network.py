@@ -0,0 +1,59 @@
+"""Parser payload Maps (engine network) terhadap payload rekaman di debug/network_payloads/"""
+
+import os
+import glob
+import pytest
+from maps_network import parse_payload_file, parse_search_payload, place_identity, load_payload
+
+PAYLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "debug", "network_payloads")
+
+def _read(name):
+    with open(os.path.join(PAYLOAD_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+def dom_record():
+    """Record engine DOM dari panel fixture yang sama dengan benchmark"""
+    pytest.importorskip("lxml")
+    pytest.importorskip("cssselect")
+    from static_dom import StaticPage
+    from extractors import read_place_panel
+    from fixture_server import load_fixture, maps_panel
+    place = load_fixture("maps_places.json")[0]
+    return read_place_panel(StaticPage(maps_panel(place)), 1, f"{place['lat']},{place['lng']}")
+
+def test_search_payload_records():
+    results = parse_search_payload(_read("maps_search_sample.txt"))
+    assert len(results) >= 2
+    identity, record = results[0]
+    assert identity == "ChIJsample0000cirebon"
+    assert record["name"] == "PAPER & SIP | Coffee, Croissant & Roastery"
+    assert record["address"] == "Jl. Aria Jipang No.22, Pekiringan, Kec. Kesambi, Kota Cirebon, Jawa Barat 45131"
+    assert record["rating"] == "4,8"
+    assert record["total_reviews"] == "100"
+    assert record["coordinates"] == "-6.7295044,108.4773185"
+    assert record["phone"] == "0822-1939-2789"
+    # Identitas unik per tempat (dipakai sebagai key journal)
+    assert len({identity for identity, _ in results}) == len(results)
+
+def test_place_payload_record():
+    results = parse_payload_file(os.path.join(PAYLOAD_DIR, "maps_place_sample.txt"))
+    assert len(results) == 1
+    identity, record = results[0]
+    assert identity and record["name"] != "N/A"
+    assert record["coordinates"].count(",") == 1
+
+def test_xssi_prefix_stripped():
+    assert load_payload(")]}'\n[[1,2]]/*\"\"*/") == [[1, 2]]
+    assert place_identity([None] * 11 + ["Nama"]) == "Nama"
+
+def test_schema_matches_dom_engine():
+    dom = dom_record()
+    # Semua payload di folder, termasuk rekaman baru (save_payloads_dir)
+    for payload in sorted(glob.glob(os.path.join(PAYLOAD_DIR, "*.txt"))):
+        for _, record in parse_payload_file(payload):
+            assert list(record) == list(dom)
+            # Format nilai sama dengan DOM: rating koma desimal, koordinat "lat,lng"
+            assert "," in record["rating"] or record["rating"] == "N/A"
+            lat, lng = record["coordinates"].split(",")
+            float(lat), float(lng)
+    assert dom["rating"] == "4,8"
@@ -0,0 +1,18 @@
+"""Deteksi halaman blokir dari URL / title (tanpa scan isi halaman)"""
+
+from rate_limiter import detect_block
+
+def test_interstitial_pages_detected():
+    assert detect_block("https://www.google.com/sorry/index?continue=x") == "unusual_traffic"
+    assert detect_block("https://consent.google.com/ml?continue=x") == "consent_wall"
+    assert detect_block("https://www.google.com/", "Before you continue to Google") == "consent_wall"
+    assert detect_block("https://geo.captcha-delivery.com/captcha/?initialCid=x") == "captcha"
+    assert detect_block("https://shop.example.com/", "Just a moment...") == "captcha"
+    assert detect_block("https://www.tokopedia.com/", "Access Denied") == "access_denied"
+
+def test_ordinary_pages_not_blocked():
+    assert detect_block("https://www.google.com/search?q=too+many+requests",
+                        "too many requests - Google Search") is None
+    assert detect_block("https://blog.example.com/http-429-blocked", "Access denied errors explained") is None
+    assert detect_block("https://example.com/denied/verify-you-are-human", "Saya bukan robot") is None
+    assert detect_block("", "") is None
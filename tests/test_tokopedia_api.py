@@ -0,0 +1,84 @@
+"""Parsing response GraphQL Tokopedia (engine API) terhadap mock fixture server, tanpa jaringan"""
+
+import pytest
+
+pytest.importorskip("urllib3")
+
+from tokopedia_api import (
+    SEARCH_QUERY, TokopediaSearchApi, TokopediaShopApi, parse_search_response, product_to_record,
+    search_params, shop_product_to_record
+)
+from fixture_server import load_fixture, tokopedia_cards, tokopedia_gql_response
+
+PRODUCTS = load_fixture("tokopedia_gql_products.json")
+
+class FixtureHttp:
+    """Pengganti HttpSession: POST dijawab langsung oleh mock GraphQL fixture server"""
+
+    def __init__(self):
+        self.payloads = []
+
+    def post_json(self, url, payload, headers=None):
+        self.payloads.append(payload)
+        return tokopedia_gql_response(PRODUCTS, payload)
+
+    def close(self):
+        pass
+
+def dom_records():
+    """Record engine browser dari card fixture yang sama (TokopediaScraper DOM / replay)"""
+    pytest.importorskip("lxml")
+    pytest.importorskip("cssselect")
+    from static_dom import StaticPage, By
+    from extractors import extract_tokopedia_card
+    page = StaticPage(tokopedia_cards(load_fixture("tokopedia_products.json"), 0, 20), "https://www.tokopedia.com/")
+    cards = page.find_elements(By.CSS_SELECTOR, "div[data-testid='master-product-card']")
+    return [extract_tokopedia_card(card, idx) for idx, card in enumerate(cards, 1)]
+
+def test_parse_search_response():
+    body = [{"operationName": "SearchProductQueryV4", "query": SEARCH_QUERY,
+             "variables": {"params": search_params("laptop", page=2, rows=30)}}]
+    products, total = parse_search_response(tokopedia_gql_response(PRODUCTS, body))
+    assert total == len(PRODUCTS)
+    assert [product["id"] for product in products] == [product["id"] for product in PRODUCTS[30:60]]
+
+def test_graphql_errors_raise():
+    with pytest.raises(ValueError, match="GraphQL error"):
+        parse_search_response([{"errors": [{"message": "rate limited"}]}])
+
+def test_search_api_pages():
+    api = TokopediaSearchApi("http://mock/graphql", rows=60, http=FixtureHttp())
+    first, total = api.search_page("laptop", 1)
+    second, _ = api.search_page("laptop", 2)
+    assert len(first) == 60 and len(second) == total - 60
+    assert api.requests == 2
+
+def test_record_matches_dom_engine():
+    dom = dom_records()
+    api = [product_to_record(product, idx) for idx, product in enumerate(PRODUCTS[:len(dom)], 1)]
+    for api_record, dom_record in zip(api, dom):
+        assert list(api_record) == list(dom_record)
+        for field in ("index", "name", "price", "rating", "shop", "location"):
+            assert api_record[field] == dom_record[field]
+        assert api_record["link"].startswith("https://www.tokopedia.com/")
+
+def test_product_to_record_defaults():
+    record = product_to_record({"name": "Produk", "price": {"text": "Rp1.000"}, "ratingAverage": 0}, 7)
+    assert record["index"] == 7
+    assert record["price"] == "Rp1.000"
+    assert record["rating"] == record["shop"] == record["location"] == record["link"] == "N/A"
+
+def test_shop_api_catalog():
+    api = TokopediaShopApi(endpoint="http://mock/graphql", per_page=5, http=FixtureHttp())
+    domain = PRODUCTS[0]["shop"]["url"].rstrip('/').rsplit('/', 1)[-1]
+    info = api.shop_info(domain)
+    assert info["shop_id"] == str(PRODUCTS[0]["shop"]["id"])
+    assert info["name"] == PRODUCTS[0]["shop"]["name"]
+
+    products, has_next = api.shop_products(info["shop_id"], 1, domain)
+    ids = [int(product["product_id"]) for product in products]
+    assert ids == sorted(ids, reverse=True)
+    record = shop_product_to_record(products[0], 1, info)
+    assert record["shop"] == info["name"] and record["location"] == info["location"]
+    assert record["product_id"] == str(ids[0])
+    assert api.shop_info("toko-tidak-ada") is None